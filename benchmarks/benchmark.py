@@ -0,0 +1,137 @@
+"""Module with the `Benchmark` class and functions to compare results against baselines."""
+from __future__ import annotations
+import json
+import platform
+import tracemalloc
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Optional
+
+import numpy as np
+
+
+@dataclass
+class Benchmark:
+    """A named benchmark. `setup` creates the state and returns the step function to measure.
+    A benchmark with `step_allocation_limit_kib` fails if a step after the warmup allocates
+    more memory at its peak, which catches temporaries that scale with the problem size."""
+
+    name: str
+    setup: Callable[[], Callable[[], None]]
+    num_steps: int
+    num_warmup_steps: int = 1
+    num_memory_steps: int = 2
+    step_allocation_limit_kib: Optional[float] = None
+
+    def run(self) -> dict[str, float]:
+        """Measures steps per second, the peak memory of setup and stepping, and the peak
+        memory which a step allocates in the steady state after the warmup."""
+        tracemalloc.start()
+        step = self.setup()
+        for _ in range(self.num_memory_steps):
+            step()
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        for _ in range(self.num_warmup_steps):
+            step()
+        tracemalloc.start()
+        step_allocation = 0
+        for _ in range(self.num_memory_steps):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            step()
+            step_allocation = max(step_allocation, tracemalloc.get_traced_memory()[1] - current)
+        tracemalloc.stop()
+        start = perf_counter()
+        for _ in range(self.num_steps):
+            step()
+        duration = perf_counter() - start
+        return {
+            "steps_per_second": self.num_steps / duration,
+            "peak_memory_kib": peak_memory / 1024,
+            "step_allocation_kib": step_allocation / 1024,
+        }
+
+
+def machine_info() -> dict[str, str]:
+    """Versions and machine description to store next to the results."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+    }
+
+
+def load_baseline(filename: str) -> Optional[dict]:
+    """Loads a baseline json file, returns None if it does not exist."""
+    try:
+        with open(filename) as json_file:
+            return json.load(json_file)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(filename: str, results: dict[str, dict[str, float]]) -> None:
+    """Writes the results together with the machine info as baseline json file."""
+    with open(filename, "w") as json_file:
+        json.dump({"machine": machine_info(), "results": results}, json_file, indent=2)
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]], baseline: dict, threshold: float
+) -> list[str]:
+    """Compares results with the baseline results.
+    A benchmark regressed if it is slower or needs more memory by more than `threshold`."""
+    regressions = []
+    baseline_results = baseline["results"]
+    for name, result in results.items():
+        if name not in baseline_results:
+            continue
+        reference = baseline_results[name]
+        speed_ratio = result["steps_per_second"] / reference["steps_per_second"]
+        if speed_ratio < 1 - threshold:
+            regressions.append(f"{name}: {speed_ratio:.0%} of baseline steps per second")
+        if reference["peak_memory_kib"] > 0:
+            memory_ratio = result["peak_memory_kib"] / reference["peak_memory_kib"]
+            if memory_ratio > 1 + threshold:
+                regressions.append(f"{name}: {memory_ratio:.0%} of baseline peak memory")
+    return regressions
+
+
+def find_allocation_violations(
+    benchmarks: list[Benchmark], results: dict[str, dict[str, float]]
+) -> list[str]:
+    """The benchmarks whose steps allocate more than their `step_allocation_limit_kib`."""
+    violations = []
+    for benchmark in benchmarks:
+        if benchmark.step_allocation_limit_kib is None or benchmark.name not in results:
+            continue
+        allocation = results[benchmark.name]["step_allocation_kib"]
+        if allocation > benchmark.step_allocation_limit_kib:
+            violations.append(
+                f"{benchmark.name}: a step allocates {allocation:.0f} KiB, "
+                f"limit {benchmark.step_allocation_limit_kib:.0f} KiB"
+            )
+    return violations
+
+
+def format_results(
+    results: dict[str, dict[str, float]], baseline: Optional[dict] = None
+) -> str:
+    """The results as text table. Adds the speed relative to the baseline if given."""
+    lines = [f"{'benchmark':<56}{'steps/s':>12}{'peak KiB':>12}{'step KiB':>10}{'vs base':>10}"]
+    baseline_results = {} if baseline is None else baseline["results"]
+    for name, result in results.items():
+        relative = ""
+        if name in baseline_results:
+            relative = (
+                f"{result['steps_per_second'] / baseline_results[name]['steps_per_second']:.0%}"
+            )
+        lines.append(
+            f"{name:<56}{result['steps_per_second']:>12.1f}"
+            f"{result['peak_memory_kib']:>12.0f}"
+            f"{result.get('step_allocation_kib', 0.0):>10.0f}{relative:>10}"
+        )
+    return "\n".join(lines)
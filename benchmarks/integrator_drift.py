@@ -0,0 +1,83 @@
+"""Compares the energy drift of the molecule integrators against their cost.
+
+Every integrator simulates the same time span with different step sizes from a lattice start
+without thermostat. The drift is the relative change of the total energy, the cost the CPU
+time and the number of force evaluations per simulated time unit.
+
+Usage from the repository root:
+    python -m benchmarks.integrator_drift [--time 0.25] [--steps 0.001 0.002 0.004 0.008]
+"""
+import argparse
+import os
+from time import process_time
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from model_and_simulate.molecular_dynamics.integrators import integrators
+from model_and_simulate.molecular_dynamics.molecule_simulation import MoleculeSimulation
+
+
+def lattice_simulation(
+    integrator: str, h: float, side: int = 8, spacing: float = 1.5, dtype: str = "float64"
+):
+    """A simulation of `side` ** 2 molecules on a square lattice near the potential minimum,
+    which start with random velocities."""
+    simulation = MoleculeSimulation(
+        side ** 2,
+        3,
+        3,
+        1,
+        "uniform",
+        h,
+        (-5, 5),
+        seed=1,
+        integrator=integrator,
+        dtype=dtype,
+        thermostat=False,
+    )
+    grid = (np.arange(side) + 0.5) * spacing
+    simulation.positions[...] = np.stack(np.meshgrid(grid, grid), axis=-1).reshape(-1, 2)
+    simulation.integrator.reset()
+    return simulation
+
+
+def measure_drift(integrator: str, h: float, time_span: float) -> dict[str, float]:
+    """Simulates `time_span` with step size `h` and returns drift and cost."""
+    simulation = lattice_simulation(integrator, h)
+    initial_energy = simulation.kinetic_energy + simulation.potential_energy()
+    num_steps = round(time_span / h)
+    start = process_time()
+    for _ in range(num_steps):
+        simulation.do_step()
+    duration = process_time() - start
+    energy = simulation.kinetic_energy + simulation.potential_energy()
+    return {
+        "drift": abs(energy - initial_energy) / abs(initial_energy),
+        "cpu_seconds_per_time": duration / time_span,
+        "force_evaluations_per_time": simulation.integrator.force_evaluations_per_step / h,
+    }
+
+
+def main() -> None:
+    """Prints drift and cost of every integrator and step size as table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--time", type=float, default=0.25, help="The simulated time span.")
+    parser.add_argument(
+        "--steps", type=float, nargs="+", default=[0.001, 0.002, 0.004, 0.008], help="Step sizes."
+    )
+    args = parser.parse_args()
+    print(f"{'integrator':<18}{'h':>8}{'drift':>12}{'cpu s/time':>12}{'forces/time':>13}")
+    for integrator in integrators:
+        for h in args.steps:
+            result = measure_drift(integrator, h, args.time)
+            print(
+                f"{integrator:<18}{h:>8.4f}{result['drift']:>12.2e}"
+                f"{result['cpu_seconds_per_time']:>12.2f}"
+                f"{result['force_evaluations_per_time']:>13.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
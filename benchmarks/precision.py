@@ -0,0 +1,74 @@
+"""Compares the speed and accuracy of the molecule simulation in float64 and float32.
+
+The accuracy is the relative error of the accelerations against float64 for the same
+positions, and the energy drift of a lattice start without thermostat. The speed is the
+number of steps per second of a large uniform run.
+
+Usage from the repository root:
+    python -m benchmarks.precision [--molecules 40000] [--grid 100] [--steps 20]
+"""
+import argparse
+import os
+from time import perf_counter
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from model_and_simulate.molecular_dynamics.molecule_simulation import MoleculeSimulation
+from .integrator_drift import lattice_simulation
+
+dtypes = ("float64", "float32")
+
+
+def steps_per_second(dtype: str, num_molecules: int, grid: int, num_steps: int) -> float:
+    """The step rate of a uniform start with thermostat."""
+    simulation = MoleculeSimulation(
+        num_molecules, grid, grid, 1, "uniform", 0.001, (-300, 300), seed=1, dtype=dtype
+    )
+    simulation.do_step()
+    start = perf_counter()
+    for _ in range(num_steps):
+        simulation.do_step()
+    return num_steps / (perf_counter() - start)
+
+
+def acceleration_error(dtype: str, num_molecules: int, grid: int) -> float:
+    """The largest error of the accelerations relative to the largest float64 acceleration."""
+    accelerations = {}
+    for key in ("float64", dtype):
+        simulation = MoleculeSimulation(
+            num_molecules, grid, grid, 1, "uniform", 0.001, (-300, 300), seed=1, dtype=key
+        )
+        simulation.integrator.step(simulation.positions, simulation.velocities, 0.0)
+        accelerations[key] = simulation.integrator.accelerations.astype(np.float64)
+    reference = accelerations["float64"]
+    return float(np.abs(accelerations[dtype] - reference).max() / np.abs(reference).max())
+
+
+def energy_drift(dtype: str, h: float = 0.001, time_span: float = 0.25) -> float:
+    """The relative change of the total energy of the lattice start of the drift benchmark."""
+    simulation = lattice_simulation("velocity_verlet", h, dtype=dtype)
+    initial_energy = simulation.kinetic_energy + simulation.potential_energy()
+    for _ in range(round(time_span / h)):
+        simulation.do_step()
+    energy = simulation.kinetic_energy + simulation.potential_energy()
+    return abs(energy - initial_energy) / abs(initial_energy)
+
+
+def main() -> None:
+    """Prints speed and accuracy of every floating point type as table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--molecules", type=int, default=40000, help="Molecules of the run.")
+    parser.add_argument("--grid", type=int, default=100, help="Rows and columns of the run.")
+    parser.add_argument("--steps", type=int, default=20, help="Measured steps of the run.")
+    args = parser.parse_args()
+    print(f"{'dtype':<10}{'steps/s':>10}{'accel error':>14}{'drift':>12}")
+    for dtype in dtypes:
+        rate = steps_per_second(dtype, args.molecules, args.grid, args.steps)
+        error = acceleration_error(dtype, args.molecules, args.grid)
+        print(f"{dtype:<10}{rate:>10.2f}{error:>14.2e}{energy_drift(dtype):>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Runs the benchmarks of all simulation engines headless and compares them to a baseline.
+
+Usage from the repository root:
+    python -m benchmarks.run_benchmarks [--save-baseline] [--threshold 0.2] [--filter molecule]
+"""
+import argparse
+import os
+import sys
+from itertools import product
+from typing import Callable
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from model_and_simulate.chaos.aizawa import aizawa_differential_equation
+from model_and_simulate.chaos.chaos_main import dense_ode_method
+from model_and_simulate.chaos.chaos_simulation import ChaosSimulation
+from model_and_simulate.chaos.lorenz import lorenz_differential_equation
+from model_and_simulate.chaos.lyapunov import lyapunov_spectrum
+from model_and_simulate.chaos.ode_systems import ode_systems
+from model_and_simulate.molecular_dynamics.integrators import integrators
+from model_and_simulate.molecular_dynamics.molecule_simulation import (
+    MoleculeParameters,
+    MoleculeSimulation,
+)
+from model_and_simulate.molecular_dynamics.molecule_visualization import MoleculeVisualization
+from model_and_simulate.road_traffic_microscopic.jam_tracker import JamTracker
+from model_and_simulate.road_traffic_microscopic.traffic_simulation import (
+    TrafficParameters,
+    TrafficSimulation,
+)
+from model_and_simulate.road_traffic_microscopic.traffic_visualization import (
+    TrafficVisualization,
+)
+from model_and_simulate.utilities.pygame_simple import get_simple_pygame
+from model_and_simulate.utilities.simulation import SimulationVisualization
+from .benchmark import (
+    Benchmark,
+    find_allocation_violations,
+    find_regressions,
+    format_results,
+    load_baseline,
+    save_baseline,
+)
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def molecule_benchmarks() -> list[Benchmark]:
+    """`MoleculeSimulation.do_step` for different numbers of molecules, grids and distributions."""
+    benchmarks = []
+    for num_molecules, grid, distribution in product(
+        (100, 400), (5, 20), ("uniform", "normal_center")
+    ):
+
+        def setup(n=num_molecules, g=grid, d=distribution) -> Callable[[], None]:
+            simulation = MoleculeSimulation(n, g, g, 1, d, 0.001, (-300, 300))
+            return simulation.do_step
+
+        name = f"molecule_step n={num_molecules} grid={grid}x{grid} {distribution}"
+        benchmarks.append(Benchmark(name, setup, num_steps=5))
+    for integrator in integrators:
+
+        def setup_integrator(i=integrator) -> Callable[[], None]:
+            simulation = MoleculeSimulation(
+                400, 20, 20, 1, "uniform", 0.001, (-300, 300), integrator=i
+            )
+            return simulation.do_step
+
+        name = f"molecule_step n=400 grid=20x20 uniform {integrator}"
+        benchmarks.append(Benchmark(name, setup_integrator, num_steps=5))
+    for integrator, dtype in product(integrators, ("float64", "float32")):
+
+        def setup_large(i=integrator, d=dtype) -> Callable[[], None]:
+            simulation = MoleculeSimulation(
+                20000, 70, 70, 1, "uniform", 0.001, (-300, 300), integrator=i, dtype=d
+            )
+            return simulation.do_step
+
+        # one float array of all molecules has 160 KiB, so the limit catches any temporary
+        name = f"molecule_step n=20000 grid=70x70 {integrator} {dtype}"
+        benchmarks.append(
+            Benchmark(
+                name, setup_large, num_steps=3, num_warmup_steps=5, step_allocation_limit_kib=64
+            )
+        )
+    return benchmarks
+
+
+def traffic_benchmarks() -> list[Benchmark]:
+    """`TrafficSimulation.do_step` for different road lengths, occupations and fill modes."""
+    benchmarks = []
+    for length, occupation, all_at_once in product((1000, 3500), (0.1, 0.5), (True, False)):
+
+        def setup(l=length, o=occupation, a=all_at_once) -> Callable[[], None]:
+            simulation = TrafficSimulation(l, o, 0.2, a)
+            return simulation.do_step
+
+        mode = "all_at_once" if all_at_once else "gradual"
+        name = f"traffic_step length={length} occupation={occupation} {mode}"
+        benchmarks.append(Benchmark(name, setup, num_steps=200))
+
+    def setup_tracked() -> Callable[[], None]:
+        simulation = TrafficSimulation(3500, 0.5, 0.2, True)
+        tracker = JamTracker(simulation.section.max_cell_number + 1)
+        simulation.add_on_step_listener(tracker.track_simulation)
+        return simulation.do_step
+
+    name = "traffic_step length=3500 occupation=0.5 jam_tracker"
+    benchmarks.append(Benchmark(name, setup_tracked, num_steps=200))
+    return benchmarks
+
+
+def chaos_benchmarks() -> list[Benchmark]:
+    """`ChaosSimulation.get_chaotic_data` and `get_dense_data` for Lorenz and Aizawa.
+    One step integrates one `time_step`."""
+    benchmarks = []
+    systems = {
+        "lorenz": (lorenz_differential_equation, [1.0, 1.0, 1.0]),
+        "aizawa": (aizawa_differential_equation, [0.1, 0.0, 0.0]),
+    }
+    for key, (equation, start_point) in systems.items():
+
+        def setup(e=equation, p=start_point) -> Callable[[], None]:
+            simulation = ChaosSimulation(e, start_point=p)
+            chaotic_point, time_start = simulation.run_into_chaos(num_initial_steps=5)
+
+            def step() -> None:
+                simulation.get_chaotic_data(1, chaotic_point, time_start)
+
+            return step
+
+        benchmarks.append(Benchmark(f"chaos_data {key}", setup, num_steps=10))
+
+        def setup_dense(e=equation, p=start_point) -> Callable[[], None]:
+            simulation = ChaosSimulation(e, start_point=p, ode_method=dense_ode_method)
+            chaotic_point, time_start = simulation.run_into_chaos(num_initial_steps=5)
+
+            def step() -> None:
+                simulation.get_dense_data(1, chaotic_point=chaotic_point, time_start=time_start)
+
+            return step
+
+        benchmarks.append(Benchmark(f"chaos_dense {key}", setup_dense, num_steps=10))
+
+    def setup_lyapunov() -> Callable[[], None]:
+        lorenz = ode_systems["lorenz"].with_parameters(R=np.linspace(10, 200, 64))
+        start_points = np.ones((3, 64))
+
+        def step() -> None:
+            lyapunov_spectrum(lorenz, start_points, num_steps=100, num_transient_steps=0)
+
+        return step
+
+    benchmarks.append(Benchmark("lyapunov_spectrum lorenz 64 R values", setup_lyapunov, 5))
+    return benchmarks
+
+
+def _render_step(visualization: SimulationVisualization) -> Callable[[], None]:
+    """Initializes the visualization and returns one frame without the simulation step."""
+    visualization.threaded = False  # no runner steps the simulation beside the measurement
+    visualization.initialize()
+
+    def step() -> None:
+        visualization.update_visualization()
+        visualization.simple_pygame.draw()
+
+    return step
+
+
+def rendering_benchmarks() -> list[Benchmark]:
+    """Frames of the pygame visualizations under a dummy SDL video driver."""
+
+    def setup_molecules() -> Callable[[], None]:
+        visualization = MoleculeVisualization("Molecule Sim")
+        visualization.simulation_parameters = MoleculeParameters()
+        return _render_step(visualization)
+
+    def setup_traffic() -> Callable[[], None]:
+        visualization = TrafficVisualization("Traffic Road")
+        visualization.simulation_parameters = TrafficParameters()
+        return _render_step(visualization)
+
+    return [
+        Benchmark("render molecules defaults", setup_molecules, num_steps=50),
+        Benchmark("render traffic defaults", setup_traffic, num_steps=50),
+    ]
+
+
+def all_benchmarks() -> list[Benchmark]:
+    """All benchmarks of this suite."""
+    return (
+        molecule_benchmarks() + traffic_benchmarks() + chaos_benchmarks() + rendering_benchmarks()
+    )
+
+
+def main() -> int:
+    """Runs the benchmarks, prints a table, and returns 1 if a regression or a step allocation
+    above its limit was found."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="The baseline json file.")
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store the results as new baseline."
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Allowed relative slowdown. Defaults to 0.2"
+    )
+    parser.add_argument("--filter", default="", help="Run only benchmarks containing this text.")
+    args = parser.parse_args()
+
+    get_simple_pygame("Benchmarks")  # keep the engine initialization out of the measurements
+    results = {}
+    for benchmark in all_benchmarks():
+        if args.filter in benchmark.name:
+            results[benchmark.name] = benchmark.run()
+            print(f"finished {benchmark.name}", file=sys.stderr)
+
+    baseline = load_baseline(args.baseline)
+    print(format_results(results, baseline))
+    violations = find_allocation_violations(all_benchmarks(), results)
+    for violation in violations:
+        print(f"ALLOCATION {violation}")
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if baseline is None:
+        print("No baseline found. Run with --save-baseline to create one.")
+        return 1 if violations else 0
+    regressions = find_regressions(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions or violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,17 @@
 """Module with simple start screen for this repository."""
 from itertools import chain
 from typing import Optional
-from functools import partial
 import pygame
 
 from utilities.pygame_button import SwitchButton
-from utilities.pygame_simple import SimplePygame, check_for_quit, get_window_resolution
+from model_and_simulate.utilities.pygame_simple import (
+    check_for_quit,
+    get_simple_pygame,
+    get_window_resolution,
+)
 from utilities.start_screen import StartScreen
 
-import chaos.chaos_main as chaos_sim
+from chaos.ode_systems import ode_systems
 import model_and_simulate.molecular_dynamics.molecule_visualization as molecular_sim
 import road_traffic_microscopic.traffic_visualization as traffic_sim
 
@@ -17,9 +20,8 @@ pygame_simulations = {
     "Traffic Road": traffic_sim.TrafficVisualization,
 }
 
-matplotlib_simulations = {
-    "Lorenz Chaotic": partial(chaos_sim.chaos_main, "lorenz", "k"),
-    "Aizawa Chaotic": partial(chaos_sim.chaos_main, "aizawa", "c"),
+chaos_simulations = {
+    f"{ode_system.name} Chaotic": key for key, ode_system in ode_systems.items()
 }
 
 
@@ -27,7 +29,7 @@ class BaseStartScreen(StartScreen):
     """Start menu to select simulations."""
 
     def __init__(self):
-        self.simple_pygame = SimplePygame("Model and Simulate")
+        self.simple_pygame = get_simple_pygame("Model and Simulate")
         self.buttons = None  # type: Optional[list[SwitchButton]]
         self.selection = None  # type: Optional[str]
 
@@ -35,7 +37,7 @@ class BaseStartScreen(StartScreen):
         """Create one button per simulation."""
         menu_items = self.simple_pygame.all_sprites
         width, height = get_window_resolution()
-        col_w = round(width / max(len(pygame_simulations), len(matplotlib_simulations)))
+        col_w = round(width / max(len(pygame_simulations), len(chaos_simulations)))
         row_h = round(height / 2)
         buttons_simulations: dict[SwitchButton, str] = {
             SwitchButton(
@@ -44,9 +46,9 @@ class BaseStartScreen(StartScreen):
                 text=v,
             ): v
             for x, y, v in zip(
-                chain(range(len(pygame_simulations)), range(len(matplotlib_simulations))),
-                [0] * len(pygame_simulations) + [1] * len(matplotlib_simulations),
-                list(pygame_simulations.keys()) + list(matplotlib_simulations.keys()),
+                chain(range(len(pygame_simulations)), range(len(chaos_simulations))),
+                [0] * len(pygame_simulations) + [1] * len(chaos_simulations),
+                list(pygame_simulations.keys()) + list(chaos_simulations.keys()),
             )
         }
 
@@ -14,14 +14,41 @@ f = 0.1
 def aizawa_differential_equation(t, x: np.ndarray) -> np.ndarray:
     """Implements the coupled nonlinear systems of equations.
     Parameter t is not used but necessary for `scipy.integrate.solve_ivp`."""
-    dx = x[0] * (x[2] - b) - d * x[1]
-    dy = d * x[0] + x[1] * (x[2] - b)
-    dz = (
+    return aizawa_rhs(x, np.empty(np.shape(x)), a, b, c, d, e, f)
+
+
+def aizawa_rhs(
+    x: np.ndarray, out: np.ndarray, a: float, b: float, c: float, d: float, e: float, f: float
+) -> np.ndarray:
+    """Writes the derivatives of the states `x` with shape (3, ...) into `out`."""
+    x0, x1, x2 = x[0], x[1], x[2]
+    x0_squared = x0 * x0
+    out[0] = x0 * (x2 - b) - d * x1
+    out[1] = d * x0 + x1 * (x2 - b)
+    out[2] = (
         c
-        + a * x[2]
-        - (x[2] ** 3) / 3
-        - x[0] ** 2
-        + (1 + e * x[2]) * x[1] ** 2
-        + f * x[2] * x[0] ** 3
+        + a * x2
+        - (x2 * x2 * x2) / 3
+        - x0_squared
+        + (1 + e * x2) * x1 * x1
+        + f * x2 * x0_squared * x0
     )
-    return np.asarray([dx, dy, dz])
+    return out
+
+
+def aizawa_jacobian(
+    x: np.ndarray, a: float, b: float, c: float, d: float, e: float, f: float
+) -> np.ndarray:
+    """The Jacobian matrices of the states `x` with shape (3, ...) as (3, 3, ...) array."""
+    x0, x1, x2 = x[0], x[1], x[2]
+    jacobian = np.empty((3, 3, *np.shape(x0)))
+    jacobian[0, 0] = x2 - b
+    jacobian[0, 1] = -d
+    jacobian[0, 2] = x0
+    jacobian[1, 0] = d
+    jacobian[1, 1] = x2 - b
+    jacobian[1, 2] = x1
+    jacobian[2, 0] = -2 * x0 + 3 * f * x2 * x0 * x0
+    jacobian[2, 1] = 2 * (1 + e * x2) * x1
+    jacobian[2, 2] = a - x2 * x2 + e * x1 * x1 + f * x0 * x0 * x0
+    return jacobian
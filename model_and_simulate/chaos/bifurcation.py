@@ -0,0 +1,272 @@
+"""Module to compute bifurcation diagrams as density images with a parallel parameter scan."""
+from __future__ import annotations
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Optional
+import numpy as np
+from matplotlib import image
+
+from .integrators import RungeKutta4
+from .ode_systems import OdeSystem
+
+
+@dataclass
+class BifurcationDiagram:
+    """The density of observed values per parameter value. Column i of `density` is the
+    histogram of the values observed for `values[i]` over the bins `bin_edges`."""
+
+    parameter: str
+    values: np.ndarray
+    bin_edges: np.ndarray
+    density: np.ndarray  # shape (number of bins, number of parameter values)
+
+    def to_image(self) -> np.ndarray:
+        """The log-scaled density in [0, 1] with the smallest observed values in the last row."""
+        shaded = np.log1p(self.density.astype(float))
+        maximum = shaded.max()
+        if maximum > 0:
+            shaded /= maximum
+        return shaded[::-1]
+
+    def save_png(self, filename: str, cmap: str = "gray_r") -> None:
+        """Saves the log-scaled density as png image."""
+        image.imsave(filename, self.to_image(), cmap=cmap, vmin=0, vmax=1)
+
+    def save_numpy(self, filename: str) -> None:
+        """Saves all arrays of the diagram as npz file."""
+        np.savez_compressed(
+            filename, values=self.values, bin_edges=self.bin_edges, density=self.density
+        )
+
+
+def ode_bifurcation_diagram(
+    ode_system: OdeSystem,
+    parameter: str,
+    values: np.ndarray,
+    value_range: tuple[float, float],
+    coordinate: int = 2,
+    section: Optional[tuple[int, float]] = None,
+    num_bins: int = 400,
+    time_step: float = 0.01,
+    num_transient_steps: int = 5000,
+    num_steps: int = 20000,
+    num_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> BifurcationDiagram:
+    """
+    Sweeps `parameter` of an ode system and collects the local maxima of one coordinate or the
+        crossings of a Poincaré section into a density image.
+    Args:
+        ode_system (OdeSystem): The system to sweep.
+        parameter (str): The name of the swept parameter.
+        values (numpy.ndarray): The values of the parameter.
+        value_range (tuple[float, float]): The range of the observed values for the histogram.
+        coordinate (int): The index of the observed coordinate. Defaults to z.
+        section (Optional[tuple[int, float]]): The coordinate index and value of a section plane,
+            which is crossed in positive direction. Defaults to None, which uses local maxima.
+        num_bins (int): The number of histogram bins.
+        time_step (float): The step size of the fixed step Runge-Kutta method.
+        num_transient_steps (int): The number of steps which are not observed.
+        num_steps (int): The number of observed steps.
+        num_workers (Optional[int]): The number of processes. Defaults to the number of cores.
+        chunk_size (Optional[int]): The number of parameter values per task. By default the
+            values are split into four tasks per worker.
+
+    Returns:
+        BifurcationDiagram: The density of the observed values.
+    """
+    observe = _ObserveOde(
+        ode_system,
+        parameter,
+        value_range,
+        coordinate,
+        section,
+        num_bins,
+        time_step,
+        num_transient_steps,
+        num_steps,
+    )
+    return _scan(observe, parameter, values, value_range, num_bins, num_workers, chunk_size)
+
+
+def logistic_map_bifurcation_diagram(
+    values: np.ndarray,
+    num_bins: int = 400,
+    num_transient_iterations: int = 1000,
+    num_iterations: int = 1000,
+    num_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> BifurcationDiagram:
+    """The bifurcation diagram of the logistic map x -> r x (1 - x) for the values of r."""
+    observe = _ObserveLogisticMap(num_bins, num_transient_iterations, num_iterations)
+    return _scan(observe, "r", values, (0.0, 1.0), num_bins, num_workers, chunk_size)
+
+
+def _scan(
+    observe: Callable[[np.ndarray], np.ndarray],
+    parameter: str,
+    values: np.ndarray,
+    value_range: tuple[float, float],
+    num_bins: int,
+    num_workers: Optional[int],
+    chunk_size: Optional[int],
+) -> BifurcationDiagram:
+    """Distributes chunks of `values` to `observe` and streams the histogram columns into
+    the density image."""
+    values = np.asarray(values, dtype=float)
+    density = np.zeros((num_bins, len(values)), dtype=np.int64)
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(math.ceil(len(values) / (4 * num_workers)), 1)
+    starts = range(0, len(values), chunk_size)
+    if num_workers == 1:
+        for start in starts:
+            density[:, start : start + chunk_size] = observe(values[start : start + chunk_size])
+    else:
+        with ProcessPoolExecutor(num_workers) as executor:
+            futures = {
+                executor.submit(observe, values[start : start + chunk_size]): start
+                for start in starts
+            }
+            for future in as_completed(futures):
+                start = futures[future]
+                density[:, start : start + chunk_size] = future.result()
+    bin_edges = np.linspace(*value_range, num_bins + 1)
+    return BifurcationDiagram(parameter, values, bin_edges, density)
+
+
+class _Histogram:
+    """Collects observations per parameter value and bins them in batches."""
+
+    batch_size: int = 1 << 16
+
+    def __init__(self, value_range: tuple[float, float], num_bins: int, num_columns: int):
+        self._minimum = value_range[0]
+        self._scale = num_bins / (value_range[1] - value_range[0])
+        self._num_bins = num_bins
+        self._num_columns = num_columns
+        self._counts = np.zeros(num_bins * num_columns, dtype=np.int64)
+        self._pending = []  # type: list[np.ndarray]
+        self._num_pending = 0
+
+    def add(self, observed: np.ndarray, columns: np.ndarray) -> None:
+        """Adds the `observed` values of the parameter values with index `columns`."""
+        bins = ((observed - self._minimum) * self._scale).astype(np.int64)
+        inside = (bins >= 0) & (bins < self._num_bins)
+        self._pending.append(bins[inside] * self._num_columns + columns[inside])
+        self._num_pending += len(self._pending[-1])
+        if self._num_pending >= _Histogram.batch_size:
+            self._flush()
+
+    def counts(self) -> np.ndarray:
+        """The histograms as (bins, columns) array."""
+        self._flush()
+        return self._counts.reshape(self._num_bins, self._num_columns)
+
+    def _flush(self) -> None:
+        if self._pending:
+            indices = np.concatenate(self._pending)
+            self._counts += np.bincount(indices, minlength=len(self._counts))
+            self._pending = []
+            self._num_pending = 0
+
+
+class _ObserveOde:
+    """Integrates one chunk of parameter values at once and returns its histogram columns.
+    It is a picklable callable for the worker processes."""
+
+    def __init__(
+        self,
+        ode_system: OdeSystem,
+        parameter: str,
+        value_range: tuple[float, float],
+        coordinate: int,
+        section: Optional[tuple[int, float]],
+        num_bins: int,
+        time_step: float,
+        num_transient_steps: int,
+        num_steps: int,
+    ):
+        self.ode_system = ode_system
+        self.parameter = parameter
+        self.value_range = value_range
+        self.coordinate = coordinate
+        self.section = section
+        self.num_bins = num_bins
+        self.time_step = time_step
+        self.num_transient_steps = num_transient_steps
+        self.num_steps = num_steps
+
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        system = self.ode_system.with_parameters(**{self.parameter: values})
+        x = np.repeat(
+            np.asarray(system.start_point, dtype=float)[:, np.newaxis], len(values), axis=1
+        )
+        integrator = RungeKutta4(system.evaluate_into, x.shape)
+        integrator.integrate(x, self.time_step, self.num_transient_steps)
+        histogram = _Histogram(self.value_range, self.num_bins, len(values))
+        if self.section is None:
+            self._observe_maxima(x, integrator, histogram)
+        else:
+            self._observe_crossings(x, integrator, histogram)
+        return histogram.counts()
+
+    def _observe_maxima(
+        self, x: np.ndarray, integrator: RungeKutta4, histogram: _Histogram
+    ) -> None:
+        """Adds the local maxima of the observed coordinate refined by a parabola."""
+        observed = x[self.coordinate]
+        before_previous = observed.copy()
+        integrator.step(x, self.time_step)
+        previous = observed.copy()
+        for _ in range(self.num_steps):
+            integrator.step(x, self.time_step)
+            columns = np.nonzero((previous > before_previous) & (previous >= observed))[0]
+            if len(columns) > 0:
+                a, b, c = before_previous[columns], previous[columns], observed[columns]
+                curvature = a - 2 * b + c
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    peaks = np.where(curvature < 0, b - (c - a) ** 2 / (8 * curvature), b)
+                histogram.add(peaks, columns)
+            before_previous, previous = previous, before_previous
+            previous[:] = observed
+
+    def _observe_crossings(
+        self, x: np.ndarray, integrator: RungeKutta4, histogram: _Histogram
+    ) -> None:
+        """Adds the observed coordinate at crossings of the section, linearly interpolated."""
+        section_coordinate, section_value = self.section
+        previous = x.copy()
+        for _ in range(self.num_steps):
+            integrator.step(x, self.time_step)
+            before, after = previous[section_coordinate], x[section_coordinate]
+            columns = np.nonzero((before < section_value) & (after >= section_value))[0]
+            if len(columns) > 0:
+                fraction = (section_value - before[columns]) / (after[columns] - before[columns])
+                start = previous[self.coordinate, columns]
+                crossings = start + fraction * (x[self.coordinate, columns] - start)
+                histogram.add(crossings, columns)
+            previous[...] = x
+
+
+class _ObserveLogisticMap:
+    """Iterates the logistic map for one chunk of values of r and returns histogram columns."""
+
+    def __init__(self, num_bins: int, num_transient_iterations: int, num_iterations: int):
+        self.num_bins = num_bins
+        self.num_transient_iterations = num_transient_iterations
+        self.num_iterations = num_iterations
+
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        x = np.full(len(values), 0.5)
+        for _ in range(self.num_transient_iterations):
+            x *= values * (1 - x)
+        histogram = _Histogram((0.0, 1.0), self.num_bins, len(values))
+        columns = np.arange(len(values))
+        for _ in range(self.num_iterations):
+            x *= values * (1 - x)
+            histogram.add(x, columns)
+        return histogram.counts()
@@ -0,0 +1,242 @@
+"""Module to produce the attractors without GUI and write their plots and data to files."""
+from __future__ import annotations
+import argparse
+import multiprocessing
+import os
+import queue
+from time import perf_counter
+from typing import Callable, Optional
+import numpy as np
+from matplotlib.figure import Figure
+
+from .chaos_main import dense_ode_method
+from .chaos_simulation import ChaosSimulation
+from .density_renderer import DensityRenderer, fixed_views
+from .ode_systems import ode_systems
+from .trajectory_cache import TrajectoryCache
+
+
+def default_export_directory() -> str:
+    """The directory of exported files. It is set by the environment variable
+    MODEL_AND_SIMULATE_EXPORT and defaults to chaos_output in the working directory."""
+    return os.environ.get("MODEL_AND_SIMULATE_EXPORT", os.path.join(os.getcwd(), "chaos_output"))
+
+
+def export_attractor(
+    ode_system_key: str,
+    directory: Optional[str] = None,
+    use_cache: bool = True,
+    resolution: tuple[int, int] = (800, 800),
+    progress: Optional[Callable[[float], None]] = None,
+) -> list[str]:
+    """
+    Simulates a registered system and writes its data and images. Figures are drawn with the
+        Agg canvas of matplotlib, so no GUI backend is needed.
+    Args:
+        ode_system_key (str): The key of the system in `ode_systems`.
+        directory (Optional[str]): The output directory. Defaults to
+            `default_export_directory()`.
+        use_cache (bool): Whether the data is reused from the `TrajectoryCache`.
+        resolution (tuple[int, int]): The width and height of the density images in pixels.
+        progress (Optional[Callable[[float], None]]): Called with the fraction of simulated
+            iterations after every chunk of the integration.
+
+    Returns:
+        list[str]: The written files. For three dimensions the last one is the perspective
+            density image.
+    """
+    ode_system = ode_systems[ode_system_key]
+    if directory is None:
+        directory = default_export_directory()
+    os.makedirs(directory, exist_ok=True)
+    num_iter = ode_system.num_iterations
+    if use_cache:
+        data = TrajectoryCache().get_dense_data(
+            ode_system, num_iter, ode_method=dense_ode_method, progress=progress
+        )
+    else:
+        data = _simulate(ode_system_key, progress)
+    if data is None:
+        raise RuntimeError(f"Solver was not successful for the {ode_system.name} system.")
+    prefix = os.path.join(directory, ode_system_key)
+    files = [prefix + ".npy", prefix + "_3d.png"]
+    np.save(files[0], data)
+    save_attractor_figure(data, files[1], color=ode_system.color)
+    if ode_system.dimensions == 3:
+        for view, projection in fixed_views.items():
+            renderer = DensityRenderer.fit(projection, data, resolution)
+            renderer.add(data)
+            files.append(f"{prefix}_{view}.png")
+            renderer.save_png(files[-1])
+    return files
+
+
+def _simulate(
+    ode_system_key: str, progress: Optional[Callable[[float], None]]
+) -> Optional[np.ndarray]:
+    """The dense data integrated chunk by chunk without cache."""
+    ode_system = ode_systems[ode_system_key]
+    simulation = ChaosSimulation.from_ode_system(ode_system, ode_method=dense_ode_method)
+    num_iter = ode_system.num_iterations
+    steps_per_chunk = TrajectoryCache.steps_per_chunk
+    chunks = []
+    for chunk in simulation.generate_dense_data(
+        num_iter, ode_system.sampling_rate, steps_per_chunk=steps_per_chunk
+    ):
+        chunks.append(chunk)
+        if progress is not None:
+            progress(min(len(chunks) * steps_per_chunk / num_iter, 1.0))
+    if len(chunks) * steps_per_chunk < num_iter:
+        return None
+    return np.concatenate(chunks, axis=1)
+
+
+def save_attractor_figure(
+    data: np.ndarray, filename: str, marker: str = ",", color: str = "c", alpha: float = 0.5
+) -> None:
+    """Saves the data like `plot3D_bifurcation_diagram` of `chaos_main` as image file."""
+    figure = Figure(figsize=(9, 9))
+    if len(data) == 3:
+        ax = figure.add_subplot(projection="3d")
+        ax.set_zlabel("z")
+    else:
+        ax = figure.add_subplot()
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+    ax.plot(*data[:3], marker + color, alpha=alpha)
+    figure.savefig(filename)
+
+
+class ExportCancelled(Exception):
+    """Raised by the progress callback of a `ChaosExportWorker` after `request_cancel`."""
+
+
+class ChaosExportWorker:
+    """Runs `export_attractor` in a background process and reports its progress through
+    a queue, so a pygame loop can keep handling events while it polls the worker.
+    The process is spawned, because a forked child would inherit the signal handlers of
+    pygame and ignore `terminate`."""
+
+    _context = multiprocessing.get_context("spawn")
+    cancel_timeout: float = 10.0  # seconds to wait for the current chunk before terminating
+
+    def __init__(self, ode_system_key: str, directory: Optional[str] = None):
+        """
+        Args:
+            ode_system_key (str): The key of the system in `ode_systems`.
+            directory (Optional[str]): The output directory. Defaults to
+                `default_export_directory()`.
+        """
+        self._messages = ChaosExportWorker._context.Queue()
+        self._cancelled = ChaosExportWorker._context.Event()
+        self._process = ChaosExportWorker._context.Process(
+            target=_export_in_worker,
+            args=(ode_system_key, directory, self._messages, self._cancelled),
+            daemon=True,
+        )
+        self._progress = 0.0
+        self._cancel_deadline = None  # type: Optional[float]
+        self._files = None  # type: Optional[list[str]]
+        self._error = None  # type: Optional[str]
+
+    @property
+    def progress(self) -> float:
+        """The fraction of simulated iterations of the last `poll`."""
+        return self._progress
+
+    @property
+    def files(self) -> Optional[list[str]]:
+        """The written files, once the worker is done."""
+        return self._files
+
+    @property
+    def error(self) -> Optional[str]:
+        """The error message, if the worker failed."""
+        return self._error
+
+    @property
+    def running(self) -> bool:
+        """Whether the background process is alive."""
+        return self._process.is_alive()
+
+    @property
+    def done(self) -> bool:
+        """Whether the worker has finished with files or an error."""
+        return self._files is not None or self._error is not None
+
+    def start(self) -> None:
+        """Starts the background process."""
+        self._process.start()
+
+    def poll(self) -> None:
+        """Reads all pending messages of the worker without blocking. A worker which did not
+        stop within `cancel_timeout` seconds after `request_cancel` is terminated."""
+        while True:
+            try:
+                kind, value = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                self._progress = value
+            elif kind == "done":
+                self._progress, self._files = 1.0, value
+            else:
+                self._error = value
+        if not self.done and not self._process.is_alive() and self._messages.empty():
+            self._error = f"The worker stopped with exit code {self._process.exitcode}."
+        deadline = self._cancel_deadline
+        if deadline is not None and perf_counter() > deadline and self._process.is_alive():
+            self._process.terminate()
+
+    def request_cancel(self) -> None:
+        """Asks the worker to stop after the current chunk without blocking, so the trajectory
+        cache keeps every finished chunk. Keep calling `poll` until it is not `running`."""
+        if self._cancel_deadline is None:
+            self._cancelled.set()
+            self._cancel_deadline = perf_counter() + ChaosExportWorker.cancel_timeout
+
+    def join(self) -> None:
+        """Waits for the background process to exit."""
+        self._process.join()
+
+
+def _export_in_worker(
+    ode_system_key: str,
+    directory: Optional[str],
+    messages: multiprocessing.Queue,
+    cancelled: multiprocessing.Event,
+) -> None:
+    def report(fraction: float) -> None:
+        if cancelled.is_set():
+            raise ExportCancelled()
+        messages.put(("progress", fraction))
+
+    try:
+        messages.put(("done", export_attractor(ode_system_key, directory, progress=report)))
+    except ExportCancelled:
+        pass
+    except Exception as error:  # the main process shows every failure
+        messages.put(("error", str(error)))
+
+
+def main() -> None:
+    """Exports the attractors given on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("systems", nargs="*", default=list(ode_systems), choices=list(ode_systems))
+    parser.add_argument("--output", default=None, help="the output directory")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the trajectory cache")
+    args = parser.parse_args()
+    for key in args.systems:
+        name = ode_systems[key].name
+
+        def report(fraction: float) -> None:
+            print(f"\r{name}: {fraction:6.1%}", end="", flush=True)
+
+        files = export_attractor(key, args.output, not args.no_cache, progress=report)
+        print()
+        for filename in files:
+            print(f"  {filename}")
+
+
+if __name__ == "__main__":
+    main()
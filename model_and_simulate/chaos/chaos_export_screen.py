@@ -0,0 +1,84 @@
+"""Module with a pygame screen, which shows the progress of a `ChaosExportWorker`."""
+import pygame
+
+from model_and_simulate.utilities.pygame_simple import get_simple_pygame, get_window_resolution
+from .chaos_export import ChaosExportWorker, default_export_directory
+from .ode_systems import ode_systems
+
+
+class ChaosExportScreen:
+    """Exports an attractor in the background while the pygame loop keeps running.
+    The finished density image is shown until the user clicks or presses a key."""
+
+    def __init__(self, ode_system_key: str):
+        self._name = ode_systems[ode_system_key].name
+        self._directory = default_export_directory()
+        self._worker = ChaosExportWorker(ode_system_key, self._directory)
+        self.simple_pygame = get_simple_pygame(f"{self._name} Chaotic")
+
+    def show(self) -> bool:
+        """Runs the export and the pygame loop until the user returns.
+
+        Returns:
+            bool: False if the user closed the window.
+        """
+        width, height = get_window_resolution()
+        self.simple_pygame.add_text(f"Producing the {self._name} attractor", 20, 20, size=30)
+        self.simple_pygame.add_text("", 20, 70)
+        self.simple_pygame.add_text("Press ESC to cancel.", 20, height - 40, size=18)
+        self._worker.start()
+        while not self._worker.done:
+            self._worker.poll()
+            if self._worker.progress > 0:
+                self.simple_pygame.set_text(1, f"Integration {self._worker.progress:.0%}")
+            else:
+                self.simple_pygame.set_text(1, "Integration of the transient")
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return self._cancel(False)
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return self._cancel(True)
+            self.simple_pygame.loop()
+        self._worker.join()
+        if self._worker.error is None:
+            self._show_image(self._worker.files[-1], width, height)
+            self.simple_pygame.set_text(1, f"Saved to {self._directory}")
+        else:
+            self.simple_pygame.set_text(1, self._worker.error)
+        self.simple_pygame.set_text(2, "Click or press a key to return.")
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return False
+                if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                    return True
+            self.simple_pygame.loop()
+
+    def _cancel(self, running: bool) -> bool:
+        """Stops the worker while the window keeps responding.
+
+        Args:
+            running (bool): False if the user closed the window.
+
+        Returns:
+            bool: `running`, or False if the user closed the window while waiting.
+        """
+        self._worker.request_cancel()
+        self.simple_pygame.set_text(1, "Cancelling after the current chunk")
+        while self._worker.running:
+            self._worker.poll()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+            self.simple_pygame.loop()
+        self._worker.join()
+        return running
+
+    def _show_image(self, filename: str, width: int, height: int) -> None:
+        """Adds the image scaled to fit below the texts as sprite."""
+        sprite = pygame.sprite.Sprite()
+        image = pygame.image.load(filename)
+        size = min(width, height - 140)
+        sprite.image = pygame.transform.smoothscale(image, (size, size))
+        sprite.rect = sprite.image.get_rect(center=(width // 2, 100 + size // 2))
+        self.simple_pygame.all_sprites.add(sprite)
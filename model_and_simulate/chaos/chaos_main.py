@@ -1,38 +1,52 @@
 """Module with function to set parameters and run the chaos simulation."""
+from typing import Optional
 import numpy as np
 from .chaos_simulation import ChaosSimulation
 import matplotlib.pyplot as plt
 
-from .lorenz import lorenz_differential_equation
-from .aizawa import aizawa_differential_equation
+from .ode_systems import ode_systems
+from .trajectory_cache import TrajectoryCache
 
-ode_systems = {"lorenz": lorenz_differential_equation, "aizawa": aizawa_differential_equation}
-ode_dimensions = {"lorenz": 3, "aizawa": 3}
-start_points = {"lorenz": np.asarray([1, 1, 1]), "aizawa": np.asarray([0.1, 0, 0])}
-num_iterations = {"lorenz": 100, "aizawa": 5000}
 
+# high order method for dense integration, where the step size does not set the data density
+dense_ode_method = "DOP853"
 
-def chaos_main(ode_system_key: str, color: str) -> None:
-    """Performs the simulation of the system of differential equations."""
+
+def chaos_main(
+    ode_system_key: str, color: str, dense: bool = True, use_cache: bool = True
+) -> None:
+    """Performs the simulation of the system of differential equations.
+    In `dense` mode the transient and the data are integrated in a single solver call
+    and sampled uniformly with the system's sampling rate. Dense data is reused from the
+    `TrajectoryCache` if `use_cache` is set."""
     ode_system = ode_systems[ode_system_key]
-    dimensions = ode_dimensions[ode_system_key]
-    start_point = start_points.get(ode_system_key)
-    num_iter = num_iterations[ode_system_key]
-    simulation = ChaosSimulation(ode_system, dimensions=dimensions, start_point=start_point)
+    dimensions = ode_system.dimensions
+    num_iter = ode_system.num_iterations
+    if dense and use_cache:
+        data = TrajectoryCache().get_dense_data(ode_system, num_iter, ode_method=dense_ode_method)
+    elif dense:
+        simulation = ChaosSimulation.from_ode_system(ode_system, ode_method=dense_ode_method)
+        data = simulation.get_dense_data(num_iter, ode_system.sampling_rate)
+    else:
+        simulation = ChaosSimulation.from_ode_system(ode_system)
+        data = _get_iterated_data(simulation, num_iter)
+    if data is None:
+        print("Solver was not successful to produce chaotic data.")
+    else:
+        print("Got chaotic data.")
+        if dimensions == 3:
+            plot3D_bifurcation_diagram(data, color=color)
+
+
+def _get_iterated_data(simulation: ChaosSimulation, num_iter: int) -> Optional[np.ndarray]:
     interim_point, interim_time = simulation.run_into_chaos()
     if interim_point is None:
         print("Solver was not successful to get the ode into chaotic state.")
-    else:
-        print("Got system into chaotic state.")
-        data = simulation.get_chaotic_data(
-            chaotic_point=interim_point, time_start=interim_time, num_steps=num_iter
-        )
-        if data is None:
-            print("Solver was not successful to produce chaotic data.")
-        else:
-            print("Got chaotic data.")
-            if dimensions == 3:
-                plot3D_bifurcation_diagram(data, color=color)
+        return None
+    print("Got system into chaotic state.")
+    return simulation.get_chaotic_data(
+        chaotic_point=interim_point, time_start=interim_time, num_steps=num_iter
+    )
 
 
 def plot3D_bifurcation_diagram(
@@ -1,12 +1,15 @@
 """Module with chaos simulation class."""
-
-from typing import Optional, Callable
+from __future__ import annotations
+from typing import Callable, Iterator, Optional
 import numpy as np
 from numpy.random import default_rng
 from scipy.integrate import solve_ivp
 
-# SEED = 1234
-rng = default_rng()  # keyword seed=SEED
+from .ode_systems import OdeSystem
+from .poincare import PoincareSection
+
+# methods of `scipy.integrate.solve_ivp` which use the Jacobian
+implicit_ode_methods = ("Radau", "BDF", "LSODA")
 
 
 class ChaosSimulation:
@@ -19,6 +22,9 @@ class ChaosSimulation:
         dimensions: int = 0,
         start_point: Optional[np.ndarray] = None,
         ode_method: str = "RK23",
+        seed: Optional[int] = None,
+        jacobian: Optional[Callable[[float, np.ndarray], np.ndarray]] = None,
+        vectorized: bool = False,
     ):
         """
         Simulates a chaotic system of ordinary differential equations.
@@ -31,18 +37,44 @@ class ChaosSimulation:
             start_point (Union[None, None]): An initial data point.
             ode_method(str): Integration method to use in `scipy.integrate.solve_ivp`
                 Defaults to Explicit Runge-Kutta method of order 3(2).
+            seed (Optional[int]): Seed for drawing a random start_point. Defaults to None.
+            jacobian (Optional[function]): The Jacobian matrix of the odes. Implicit methods
+                use it instead of finite differences. Defaults to None.
+            vectorized (bool): Whether `equation` accepts blocks of states with shape
+                (dimensions, k). Implicit methods use it for finite differences.
+                Defaults to False.
         """
+        self._rng = default_rng(seed)
         self._equation = equation
         self._time_step = time_step
         if start_point is None:
             if dimensions == 0:
                 raise ValueError("An initial point or the dimensions must be set!")
             else:
-                start_point = rng.random(size=dimensions)
+                start_point = self._rng.random(size=dimensions)
         self._start_point = start_point
         self._dimension = len(self._start_point)
         assert self._dimension == len(equation(0, self._start_point))  # sanity check
         self._ode_method = ode_method
+        self._solver_options = {}
+        if ode_method in implicit_ode_methods:
+            self._solver_options["vectorized"] = vectorized
+            if jacobian is not None:
+                self._solver_options["jac"] = jacobian
+
+    @classmethod
+    def from_ode_system(cls, ode_system: OdeSystem, **kwargs) -> ChaosSimulation:
+        """Creates a simulation of a registered system with its start point and Jacobian.
+        Keyword arguments are passed to the constructor."""
+        kwargs.setdefault("start_point", np.asarray(ode_system.start_point))
+        if ode_system.jacobian is not None:
+            kwargs.setdefault("jacobian", ode_system.evaluate_jacobian)
+        return cls(ode_system.evaluate, vectorized=True, **kwargs)
+
+    @property
+    def time_step(self) -> float:
+        """The time span of one iteration."""
+        return self._time_step
 
     def run_into_chaos(self, num_initial_steps: int = 100) -> tuple[Optional[np.ndarray], int]:
         """
@@ -85,16 +117,176 @@ class ChaosSimulation:
         else:
             interim_point = chaotic_point
             time_span = (time_start, time_start + self._time_step)
-            data = chaotic_point.reshape((*chaotic_point.shape, 1))
+            data = [chaotic_point.reshape((*chaotic_point.shape, 1))]
             for n in range(num_steps):
                 ode_solution, success = self._solve_ode(interim_point, time_span)
                 if success is None:
                     return None
                 else:
-                    data = np.concatenate((data, ode_solution), axis=1)
+                    data.append(ode_solution)
                     interim_point = ode_solution.T[-1]
                     time_span = self._next_time_span(time_span)
-            return data
+            return np.concatenate(data, axis=1)
+
+    def get_dense_data(
+        self,
+        num_steps: int = 50,
+        sampling_rate: float = 10.0,
+        num_initial_steps: int = 100,
+        chaotic_point: Optional[np.ndarray] = None,
+        time_start: float = 0,
+    ) -> Optional[np.ndarray]:
+        """
+        Integrates the transient and `num_steps` iterations of `time_step` in a single solver call.
+            Only the uniformly sampled points after the transient are stored.
+        Args:
+            num_steps (int): Number of iterations to sample.
+            sampling_rate (float): Number of data points per unit of time.
+            num_initial_steps (int): Number of iterations of the transient. It is skipped if
+                `chaotic_point` is given.
+            chaotic_point (Optional[numpy.ndarray]): An initial data point after the transient.
+            time_start (float): The time of `chaotic_point`.
+
+        Returns:
+            numpy.ndarray: Array of chaotic data points sampled every 1 / `sampling_rate`.
+        """
+        if chaotic_point is None:
+            start_point, time_span_start = self._start_point, 0
+            time_start = num_initial_steps * self._time_step
+        else:
+            start_point, time_span_start = chaotic_point, time_start
+        num_samples = round(num_steps * self._time_step * sampling_rate) + 1
+        time_eval = time_start + np.arange(num_samples) / sampling_rate
+        result = solve_ivp(
+            self._equation,
+            (time_span_start, time_eval[-1]),
+            start_point,
+            method=self._ode_method,
+            t_eval=time_eval,
+            **self._solver_options,
+        )
+        return result.y if result.success else None
+
+    def get_transient_point(
+        self,
+        num_initial_steps: int = 100,
+        steps_per_chunk: int = 10,
+        on_chunk: Optional[Callable[[int], None]] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Integrates the transient in solver calls of `steps_per_chunk` iterations, so the caller
+            can report progress or stop between them.
+        Args:
+            num_initial_steps (int): Number of iterations of the transient.
+            steps_per_chunk (int): Number of iterations per solver call.
+            on_chunk (Optional[Callable[[int], None]]): Called with the number of finished
+                iterations after every chunk. An exception raised by it stops the integration.
+
+        Returns:
+            numpy.ndarray: The point at the end of the transient.
+        """
+        point = np.asarray(self._start_point, dtype=float)
+        for steps_done in range(0, num_initial_steps, steps_per_chunk):
+            chunk_steps = min(steps_per_chunk, num_initial_steps - steps_done)
+            time_span = (steps_done * self._time_step, (steps_done + chunk_steps) * self._time_step)
+            result = solve_ivp(
+                self._equation,
+                time_span,
+                point,
+                method=self._ode_method,
+                t_eval=[time_span[1]],
+                **self._solver_options,
+            )
+            if not result.success:
+                return None
+            point = result.y[:, -1]
+            if on_chunk is not None:
+                on_chunk(steps_done + chunk_steps)
+        return point
+
+    def generate_dense_data(
+        self,
+        num_steps: int = 50,
+        sampling_rate: float = 10.0,
+        steps_per_chunk: int = 10,
+        num_initial_steps: int = 100,
+        chaotic_point: Optional[np.ndarray] = None,
+        time_start: float = 0,
+    ) -> Iterator[np.ndarray]:
+        """
+        Yields the data of `get_dense_data` in chunks of `steps_per_chunk` iterations,
+            so arbitrary long trajectories can be processed in bounded memory.
+        Args:
+            num_steps (int): Number of iterations to sample.
+            sampling_rate (float): Number of data points per unit of time.
+            steps_per_chunk (int): Number of iterations per yielded chunk.
+            num_initial_steps (int): Number of iterations of the transient. It is skipped if
+                `chaotic_point` is given.
+            chaotic_point (Optional[numpy.ndarray]): An initial data point after the transient.
+            time_start (float): The time of `chaotic_point`.
+
+        Yields:
+            numpy.ndarray: Chunks of uniformly sampled data points.
+        """
+        if chaotic_point is None:
+            chaotic_point = self.get_transient_point(num_initial_steps, steps_per_chunk)
+            if chaotic_point is None:
+                return
+            time_start = num_initial_steps * self._time_step
+        for steps_done in range(0, num_steps, steps_per_chunk):
+            chunk_steps = min(steps_per_chunk, num_steps - steps_done)
+            data = self.get_dense_data(
+                chunk_steps, sampling_rate, chaotic_point=chaotic_point, time_start=time_start
+            )
+            if data is None:
+                return
+            yield data[:, :-1]  # the last point starts the next chunk
+            chaotic_point = data[:, -1]
+            time_start += chunk_steps * self._time_step
+
+    def get_section_crossings(
+        self,
+        section: PoincareSection,
+        num_steps: int = 50,
+        num_initial_steps: int = 100,
+        chaotic_point: Optional[np.ndarray] = None,
+        time_start: float = 0,
+    ) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        """
+        Integrates `num_steps` iterations of `time_step` in a single solver call and records only
+            the crossings with `section`. The trajectory itself is not stored.
+        Args:
+            section (PoincareSection): The hyperplane and crossing direction.
+            num_steps (int): Number of iterations to record crossings.
+            num_initial_steps (int): Number of iterations of the transient. It is skipped if
+                `chaotic_point` is given.
+            chaotic_point (Optional[numpy.ndarray]): An initial data point after the transient.
+            time_start (float): The time of `chaotic_point`.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: The crossing points with shape (dimensions, K)
+                and their times.
+        """
+        if chaotic_point is None:
+            start_point, time_span_start = self._start_point, 0
+            time_start = num_initial_steps * self._time_step
+        else:
+            start_point, time_span_start = chaotic_point, time_start
+        time_end = time_start + num_steps * self._time_step
+        result = solve_ivp(
+            self._equation,
+            (time_span_start, time_end),
+            start_point,
+            method=self._ode_method,
+            t_eval=[time_end],
+            events=section,
+            **self._solver_options,
+        )
+        if not result.success:
+            return None
+        times, points = result.t_events[0], result.y_events[0]
+        after_transient = times >= time_start
+        return points[after_transient].T, times[after_transient]
 
     def _next_time_span(self, time_span: tuple[int, int]) -> tuple[int, int]:
         return time_span[1], time_span[1] + self._time_step
@@ -102,5 +294,11 @@ class ChaosSimulation:
     def _solve_ode(
         self, start_point: np.ndarray, time_span: tuple[int, int]
     ) -> tuple[np.ndarray, bool]:
-        result = solve_ivp(self._equation, time_span, start_point, method=self._ode_method)
+        result = solve_ivp(
+            self._equation,
+            time_span,
+            start_point,
+            method=self._ode_method,
+            **self._solver_options,
+        )
         return result.y, result.success
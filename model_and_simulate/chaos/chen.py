@@ -0,0 +1,31 @@
+"""Contains Chen equations and parameters."""
+import numpy as np
+
+# parameters for chen equations
+a = 35
+b = 3
+c = 28
+
+
+def chen_rhs(x: np.ndarray, out: np.ndarray, a: float, b: float, c: float) -> np.ndarray:
+    """Writes the derivatives of the states `x` with shape (3, ...) into `out`."""
+    x0, x1, x2 = x[0], x[1], x[2]
+    out[0] = a * (x1 - x0)
+    out[1] = (c - a) * x0 - x0 * x2 + c * x1
+    out[2] = x0 * x1 - b * x2
+    return out
+
+
+def chen_jacobian(x: np.ndarray, a: float, b: float, c: float) -> np.ndarray:
+    """The Jacobian matrices of the states `x` with shape (3, ...) as (3, 3, ...) array."""
+    x0, x1, x2 = x[0], x[1], x[2]
+    jacobian = np.zeros((3, 3, *np.shape(x0)))
+    jacobian[0, 0] = -a
+    jacobian[0, 1] = a
+    jacobian[1, 0] = c - a - x2
+    jacobian[1, 1] = c
+    jacobian[1, 2] = -x0
+    jacobian[2, 0] = x1
+    jacobian[2, 1] = x0
+    jacobian[2, 2] = -b
+    return jacobian
@@ -0,0 +1,237 @@
+"""Module to render large attractor datasets as density images in bounded memory."""
+from __future__ import annotations
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable, Optional
+import numpy as np
+from matplotlib import image
+
+from .chaos_simulation import ChaosSimulation
+from .ode_systems import OdeSystem
+
+
+def view_projection(azimuth: float, elevation: float) -> np.ndarray:
+    """The (2, 3) projection onto the screen of a camera at `azimuth` and `elevation` in
+    degrees, like the view of a 3D axes in matplotlib."""
+    azimuth, elevation = math.radians(azimuth), math.radians(elevation)
+    return np.asarray(
+        [
+            [-math.sin(azimuth), math.cos(azimuth), 0.0],
+            [
+                -math.cos(azimuth) * math.sin(elevation),
+                -math.sin(azimuth) * math.sin(elevation),
+                math.cos(elevation),
+            ],
+        ]
+    )
+
+
+fixed_views = {
+    "xy": np.asarray([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]),
+    "xz": np.asarray([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]),
+    "yz": np.asarray([[0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]),
+    "perspective": view_projection(-60, 30),
+}
+
+
+class DensityRenderer:
+    """Accumulates the number of projected points per pixel.
+    Points are added in chunks, so memory does not grow with the number of points."""
+
+    def __init__(
+        self,
+        projection: np.ndarray,
+        bounds: tuple[tuple[float, float], tuple[float, float]],
+        resolution: tuple[int, int] = (800, 800),
+        chunk_size: int = 1 << 20,
+    ):
+        """
+        Args:
+            projection (numpy.ndarray): The (2, dimensions) matrix onto the image plane.
+            bounds (tuple): The (min, max) of the projected horizontal and vertical coordinate.
+            resolution (tuple[int, int]): The width and height of the image in pixels.
+            chunk_size (int): The maximum number of points projected at once.
+        """
+        self._projection = np.asarray(projection, dtype=float)
+        self._bounds = bounds
+        self._width, self._height = resolution
+        self._chunk_size = chunk_size
+        (x_min, x_max), (y_min, y_max) = bounds
+        self._origin = np.asarray([[x_min], [y_min]])
+        self._scale = np.asarray(
+            [[self._width / (x_max - x_min)], [self._height / (y_max - y_min)]]
+        )
+        self._counts = np.zeros(self._width * self._height, dtype=np.int64)
+        self._num_points = 0
+
+    @classmethod
+    def fit(
+        cls,
+        projection: np.ndarray,
+        points: np.ndarray,
+        resolution: tuple[int, int] = (800, 800),
+        margin: float = 0.05,
+    ) -> DensityRenderer:
+        """A renderer with bounds of the projected sample `points` widened by `margin`."""
+        projected = np.asarray(projection) @ points
+        lower, upper = projected.min(axis=1), projected.max(axis=1)
+        padding = (upper - lower) * margin + 1e-12
+        bounds = tuple(zip(lower - padding, upper + padding))
+        return cls(projection, bounds, resolution)
+
+    @property
+    def projection(self) -> np.ndarray:
+        """The (2, dimensions) matrix onto the image plane."""
+        return self._projection
+
+    @property
+    def bounds(self) -> tuple[tuple[float, float], tuple[float, float]]:
+        """The (min, max) of the projected horizontal and vertical coordinate."""
+        return self._bounds
+
+    @property
+    def resolution(self) -> tuple[int, int]:
+        """The width and height of the image in pixels."""
+        return self._width, self._height
+
+    @property
+    def counts(self) -> np.ndarray:
+        """The number of points per pixel with shape (height, width), bottom row first."""
+        return self._counts.reshape(self._height, self._width)
+
+    @property
+    def num_points(self) -> int:
+        """The number of added points including the points outside the bounds."""
+        return self._num_points
+
+    def add(self, points: np.ndarray) -> None:
+        """Projects and counts `points` with shape (dimensions, K)."""
+        for start in range(0, points.shape[1], self._chunk_size):
+            chunk = points[:, start : start + self._chunk_size]
+            pixels = ((self._projection @ chunk - self._origin) * self._scale).astype(np.int64)
+            columns, rows = pixels
+            inside = (columns >= 0) & (columns < self._width) & (rows >= 0) & (rows < self._height)
+            indices = rows[inside] * self._width + columns[inside]
+            self._counts += np.bincount(indices, minlength=len(self._counts))
+            self._num_points += chunk.shape[1]
+
+    def add_all(self, chunks: Iterable[np.ndarray]) -> None:
+        """Adds every chunk of an iterable like `ChaosSimulation.generate_dense_data`."""
+        for chunk in chunks:
+            self.add(chunk)
+
+    def merge(self, counts: np.ndarray, num_points: int = 0) -> None:
+        """Adds the `counts` of another renderer with the same bounds and resolution."""
+        self._counts += counts.reshape(-1)
+        self._num_points += num_points
+
+    def to_image(self) -> np.ndarray:
+        """The log-scaled density in [0, 1] with the top row first."""
+        shaded = np.log1p(self.counts.astype(float))
+        maximum = shaded.max()
+        if maximum > 0:
+            shaded /= maximum
+        return shaded[::-1]
+
+    def save_png(self, filename: str, cmap: str = "magma") -> None:
+        """Saves the log-scaled density as png image."""
+        image.imsave(filename, self.to_image(), cmap=cmap, vmin=0, vmax=1)
+
+
+def render_attractor(
+    ode_system: OdeSystem,
+    num_points: int,
+    views: Optional[dict[str, np.ndarray]] = None,
+    resolution: tuple[int, int] = (800, 800),
+    sampling_rate: float = 100.0,
+    ode_method: str = "DOP853",
+    num_workers: Optional[int] = None,
+) -> dict[str, DensityRenderer]:
+    """
+    Renders `num_points` points of an attractor into one density image per view.
+        A pilot run fixes the bounds of every view. Then every worker process integrates its own
+        part of the trajectory, starting at a different point of the pilot run, and accumulates
+        all views. The counts of the workers are summed.
+    Args:
+        ode_system (OdeSystem): The system to render.
+        num_points (int): The total number of points.
+        views (Optional[dict[str, numpy.ndarray]]): Projections by name. Defaults to
+            `fixed_views`.
+        resolution (tuple[int, int]): The width and height of the images in pixels.
+        sampling_rate (float): Number of data points per unit of time.
+        ode_method (str): The integration method of `scipy.integrate.solve_ivp`.
+        num_workers (Optional[int]): The number of processes. Defaults to the number of cores.
+
+    Returns:
+        dict[str, DensityRenderer]: The renderer of every view.
+    """
+    if views is None:
+        views = fixed_views
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    simulation = ChaosSimulation.from_ode_system(ode_system, ode_method=ode_method)
+    pilot = simulation.get_dense_data(10, ode_system.sampling_rate)
+    if pilot is None:
+        raise RuntimeError(f"Solver was not successful for the {ode_system.name} system.")
+    renderers = {
+        name: DensityRenderer.fit(projection, pilot, resolution)
+        for name, projection in views.items()
+    }
+    start_points = pilot[:, :: max(pilot.shape[1] // num_workers, 1)][:, :num_workers]
+    points_per_worker = [
+        num_points // num_workers + (worker < num_points % num_workers)
+        for worker in range(num_workers)
+    ]
+    view_bounds = {name: renderer.bounds for name, renderer in renderers.items()}
+    arguments = (
+        repeat(ode_system),
+        start_points.T,
+        points_per_worker,
+        repeat(views),
+        repeat(view_bounds),
+        repeat(resolution),
+        repeat(sampling_rate),
+        repeat(ode_method),
+    )
+    executor = ProcessPoolExecutor(num_workers) if num_workers > 1 else None
+    try:
+        results = (executor.map if executor else map)(_render_part, *arguments)
+        for counts, num_part_points in results:
+            for name, renderer in renderers.items():
+                renderer.merge(counts[name], num_part_points)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return renderers
+
+
+def _render_part(
+    ode_system: OdeSystem,
+    start_point: np.ndarray,
+    num_points: int,
+    views: dict[str, np.ndarray],
+    view_bounds: dict[str, tuple[tuple[float, float], tuple[float, float]]],
+    resolution: tuple[int, int],
+    sampling_rate: float,
+    ode_method: str,
+) -> tuple[dict[str, np.ndarray], int]:
+    """Integrates `num_points` points from `start_point` and returns the counts of all views."""
+    renderers = {
+        name: DensityRenderer(projection, view_bounds[name], resolution)
+        for name, projection in views.items()
+    }
+    simulation = ChaosSimulation.from_ode_system(
+        ode_system, start_point=start_point, ode_method=ode_method
+    )
+    num_steps = math.ceil(num_points / (simulation.time_step * sampling_rate))
+    num_added = 0
+    for chunk in simulation.generate_dense_data(
+        num_steps, sampling_rate, steps_per_chunk=1, chaotic_point=start_point
+    ):
+        chunk = chunk[:, : num_points - num_added]
+        for renderer in renderers.values():
+            renderer.add(chunk)
+        num_added += chunk.shape[1]
+    return {name: renderer.counts for name, renderer in renderers.items()}, num_added
@@ -0,0 +1,84 @@
+"""Module with fixed step integrators for blocks of states of an `OdeSystem`."""
+from typing import Callable
+import numpy as np
+
+from .ode_systems import OdeSystem
+
+
+class RungeKutta4:
+    """Classic Runge-Kutta method of order 4 with a fixed step size.
+    The stages are preallocated, and the states are updated in place."""
+
+    def __init__(self, rhs: Callable[[np.ndarray, np.ndarray], np.ndarray], shape: tuple):
+        """
+        Args:
+            rhs (function): Writes the derivatives of its first argument into the second.
+            shape (tuple): The shape of the integrated states.
+        """
+        self._rhs = rhs
+        self._stages = np.empty((4, *shape))
+        self._state = np.empty(shape)
+
+    def step(self, x: np.ndarray, time_step: float) -> None:
+        """Advances the states `x` by `time_step` in place."""
+        rhs, state = self._rhs, self._state
+        k1, k2, k3, k4 = self._stages
+        rhs(x, k1)
+        np.multiply(k1, time_step / 2, out=state)
+        state += x
+        rhs(state, k2)
+        np.multiply(k2, time_step / 2, out=state)
+        state += x
+        rhs(state, k3)
+        np.multiply(k3, time_step, out=state)
+        state += x
+        rhs(state, k4)
+        k2 += k3
+        k2 *= 2
+        k1 += k2
+        k1 += k4
+        k1 *= time_step / 6
+        x += k1
+
+    def integrate(self, x: np.ndarray, time_step: float, num_steps: int) -> None:
+        """Performs `num_steps` steps in place."""
+        for _ in range(num_steps):
+            self.step(x, time_step)
+
+
+class TangentSystem:
+    """The states of an `OdeSystem` together with `num_vectors` tangent vectors each.
+    The tangent vectors follow the linearized flow dq/dt = J(x) q.
+    A block of M states is packed into one array of shape (dimensions * (1 + num_vectors), M)."""
+
+    def __init__(self, ode_system: OdeSystem, num_vectors: int):
+        """
+        Args:
+            ode_system (OdeSystem): The system with analytic Jacobian.
+            num_vectors (int): The number of tangent vectors per state.
+        """
+        if ode_system.jacobian is None:
+            raise ValueError(f"The {ode_system.name} system has no analytic Jacobian.")
+        self._ode_system = ode_system
+        self._dimensions = ode_system.dimensions
+        self._num_vectors = num_vectors
+
+    def pack(self, x: np.ndarray, q: np.ndarray) -> np.ndarray:
+        """Packs states (dimensions, M) and tangent vectors (dimensions, num_vectors, M)."""
+        return np.concatenate((x, q.reshape(-1, x.shape[-1])))
+
+    def states(self, y: np.ndarray) -> np.ndarray:
+        """The view on the states in the packed array `y`."""
+        return y[: self._dimensions]
+
+    def tangents(self, y: np.ndarray) -> np.ndarray:
+        """The view on the tangent vectors in the packed array `y`."""
+        return y[self._dimensions :].reshape(self._dimensions, self._num_vectors, -1)
+
+    def rhs(self, y: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Writes the derivatives of states and tangent vectors in `y` into `out`."""
+        x = self.states(y)
+        self._ode_system.evaluate_into(x, self.states(out))
+        jacobian = self._ode_system.evaluate_jacobian(0, x)
+        np.einsum("ijm,jkm->ikm", jacobian, self.tangents(y), out=self.tangents(out))
+        return out
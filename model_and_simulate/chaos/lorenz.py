@@ -10,7 +10,28 @@ R = 28
 def lorenz_differential_equation(t, x: np.ndarray) -> np.ndarray:
     """Implements the coupled nonlinear systems of equations.
         Parameter t is not used but necessary for `scipy.integrate.solve_ivp`."""
-    dx = -sigma * x[0] + sigma * x[1]
-    dy = R * x[0] - x[1] - x[0] * x[2]
-    dz = -B * x[2] + x[0] * x[1]
-    return np.asarray([dx, dy, dz])
+    return lorenz_rhs(x, np.empty(np.shape(x)), sigma, B, R)
+
+
+def lorenz_rhs(x: np.ndarray, out: np.ndarray, sigma: float, B: float, R: float) -> np.ndarray:
+    """Writes the derivatives of the states `x` with shape (3, ...) into `out`."""
+    x0, x1, x2 = x[0], x[1], x[2]
+    out[0] = sigma * (x1 - x0)
+    out[1] = R * x0 - x1 - x0 * x2
+    out[2] = x0 * x1 - B * x2
+    return out
+
+
+def lorenz_jacobian(x: np.ndarray, sigma: float, B: float, R: float) -> np.ndarray:
+    """The Jacobian matrices of the states `x` with shape (3, ...) as (3, 3, ...) array."""
+    x0, x1, x2 = x[0], x[1], x[2]
+    jacobian = np.zeros((3, 3, *np.shape(x0)))
+    jacobian[0, 0] = -sigma
+    jacobian[0, 1] = sigma
+    jacobian[1, 0] = R - x2
+    jacobian[1, 1] = -1
+    jacobian[1, 2] = -x0
+    jacobian[2, 0] = x1
+    jacobian[2, 1] = x0
+    jacobian[2, 2] = -B
+    return jacobian
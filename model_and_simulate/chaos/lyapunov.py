@@ -0,0 +1,126 @@
+"""Module to estimate Lyapunov exponents of the systems in `ode_systems`."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Optional
+import numpy as np
+
+from .integrators import RungeKutta4, TangentSystem
+from .ode_systems import OdeSystem
+
+
+def lyapunov_spectrum(
+    ode_system: OdeSystem,
+    start_points: Optional[np.ndarray] = None,
+    num_exponents: Optional[int] = None,
+    time_step: float = 0.01,
+    num_steps: int = 20000,
+    num_transient_steps: int = 2000,
+    renormalization_interval: int = 10,
+) -> np.ndarray:
+    """
+    Estimates the largest Lyapunov exponents for many initial conditions at once.
+        States and tangent vectors are integrated with `RungeKutta4`. The tangent vectors are
+        re-orthonormalized by QR decompositions and the logarithms of the stretching factors on
+        the diagonal of R are averaged over time.
+    Args:
+        ode_system (OdeSystem): The system with analytic Jacobian. Parameters may be arrays of
+            shape (M,) to use different values per initial condition.
+        start_points (Optional[numpy.ndarray]): Initial conditions with shape (dimensions, M).
+            Defaults to the start point of the system.
+        num_exponents (Optional[int]): The number of exponents. Defaults to the dimensions.
+        time_step (float): The fixed step size.
+        num_steps (int): The number of steps to average over.
+        num_transient_steps (int): The number of steps to run into the attractor before.
+        renormalization_interval (int): The number of steps between QR decompositions.
+
+    Returns:
+        numpy.ndarray: The exponents in descending order with shape (M, num_exponents).
+    """
+    dimensions = ode_system.dimensions
+    if num_exponents is None:
+        num_exponents = dimensions
+    if start_points is None:
+        start_points = np.asarray(ode_system.start_point, dtype=float)
+    x = np.array(start_points, dtype=float).reshape(dimensions, -1)
+    num_points = x.shape[1]
+
+    RungeKutta4(ode_system.evaluate_into, x.shape).integrate(x, time_step, num_transient_steps)
+
+    tangent_system = TangentSystem(ode_system, num_exponents)
+    q = np.zeros((dimensions, num_exponents, num_points))
+    q[np.arange(num_exponents), np.arange(num_exponents)] = 1
+    y = tangent_system.pack(x, q)
+    tangents = tangent_system.tangents(y)
+    integrator = RungeKutta4(tangent_system.rhs, y.shape)
+    log_stretching = np.zeros((num_points, num_exponents))
+    steps_done = 0
+    while steps_done < num_steps:
+        num_interval_steps = min(renormalization_interval, num_steps - steps_done)
+        integrator.integrate(y, time_step, num_interval_steps)
+        steps_done += num_interval_steps
+        orthonormal, upper = np.linalg.qr(np.moveaxis(tangents, 2, 0))
+        log_stretching += np.log(np.abs(np.diagonal(upper, axis1=1, axis2=2)))
+        tangents[...] = np.moveaxis(orthonormal, 0, 2)
+    exponents = log_stretching / (num_steps * time_step)
+    # the diagonal of R is only ordered in the limit, finite averages may swap close exponents
+    return np.sort(exponents, axis=1)[:, ::-1]
+
+
+def maximal_lyapunov_exponent(
+    ode_system: OdeSystem, start_points: Optional[np.ndarray] = None, **kwargs
+) -> np.ndarray:
+    """The largest Lyapunov exponent per initial condition with shape (M,).
+    Keyword arguments are passed to `lyapunov_spectrum`."""
+    return lyapunov_spectrum(ode_system, start_points, num_exponents=1, **kwargs)[:, 0]
+
+
+def lyapunov_sweep(
+    ode_system: OdeSystem,
+    parameter: str,
+    values: np.ndarray,
+    num_exponents: int = 1,
+    num_workers: Optional[int] = None,
+    **kwargs,
+) -> np.ndarray:
+    """
+    Estimates the Lyapunov exponents for many values of one parameter.
+        The values are split into one block per worker process. Each block is integrated
+        at once with the parameter as array.
+    Args:
+        ode_system (OdeSystem): The system with analytic Jacobian.
+        parameter (str): The name of the swept parameter.
+        values (numpy.ndarray): The values of the parameter.
+        num_exponents (int): The number of exponents. Defaults to 1.
+        num_workers (Optional[int]): The number of processes. Defaults to the number of cores.
+        **kwargs: Passed to `lyapunov_spectrum`.
+
+    Returns:
+        numpy.ndarray: The exponents with shape (len(values), num_exponents).
+    """
+    values = np.asarray(values, dtype=float)
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    blocks = np.array_split(values, min(num_workers, len(values)))
+    if len(blocks) == 1:
+        return _lyapunov_of_values(ode_system, parameter, values, num_exponents, kwargs)
+    with ProcessPoolExecutor(len(blocks)) as executor:
+        results = executor.map(
+            _lyapunov_of_values,
+            repeat(ode_system),
+            repeat(parameter),
+            blocks,
+            repeat(num_exponents),
+            repeat(kwargs),
+        )
+        return np.concatenate(list(results))
+
+
+def _lyapunov_of_values(
+    ode_system: OdeSystem, parameter: str, values: np.ndarray, num_exponents: int, kwargs: dict
+) -> np.ndarray:
+    system = ode_system.with_parameters(**{parameter: values})
+    start_points = np.repeat(
+        np.asarray(ode_system.start_point, dtype=float)[:, np.newaxis], len(values), axis=1
+    )
+    return lyapunov_spectrum(system, start_points, num_exponents, **kwargs)
@@ -0,0 +1,118 @@
+"""Module with the registry of chaotic systems of ordinary differential equations."""
+from __future__ import annotations
+from dataclasses import dataclass, field, replace
+from typing import Callable, Optional
+import numpy as np
+
+from . import aizawa, chen, lorenz, rossler, thomas
+
+
+@dataclass(frozen=True)
+class OdeSystem:
+    """A system of autonomous odes with its parameters as data.
+    `rhs(x, out, **parameters)` writes the derivatives of states `x` with shape (dimensions, ...)
+    into `out`, so a whole block of states is evaluated in one call. The optional
+    `jacobian(x, **parameters)` returns the matrices with shape (dimensions, dimensions, ...)."""
+
+    name: str
+    rhs: Callable[..., np.ndarray]
+    parameters: dict[str, float]
+    start_point: tuple[float, ...]
+    num_iterations: int = 100  # iterations of `ChaosSimulation.get_chaotic_data`
+    sampling_rate: float = 10.0  # data points per unit of time for dense integration
+    jacobian: Optional[Callable[..., np.ndarray]] = None
+    color: str = "k"
+    parameter_ranges: dict[str, tuple[float, float]] = field(default_factory=dict)
+
+    @property
+    def dimensions(self) -> int:
+        """The number of state variables."""
+        return len(self.start_point)
+
+    def evaluate(self, t: float, x: np.ndarray) -> np.ndarray:
+        """The derivatives of `x` in a new array. The signature fits `scipy.integrate.solve_ivp`,
+        which keeps references to the returned arrays."""
+        return self.rhs(x, np.empty(np.shape(x)), **self.parameters)
+
+    def evaluate_into(self, x: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Writes the derivatives of `x` into the preallocated `out` and returns it."""
+        return self.rhs(x, out, **self.parameters)
+
+    def evaluate_jacobian(self, t: float, x: np.ndarray) -> np.ndarray:
+        """The Jacobian matrix at `x`. The signature fits `scipy.integrate.solve_ivp`."""
+        if self.jacobian is None:
+            raise ValueError(f"The {self.name} system has no analytic Jacobian.")
+        return self.jacobian(x, **self.parameters)
+
+    def with_parameters(self, **parameters: float) -> OdeSystem:
+        """A copy with some parameters replaced."""
+        unknown = parameters.keys() - self.parameters.keys()
+        if unknown:
+            raise ValueError(f"Unknown parameters {sorted(unknown)} for the {self.name} system.")
+        return replace(self, parameters={**self.parameters, **parameters})
+
+
+ode_systems = {
+    "lorenz": OdeSystem(
+        "Lorenz",
+        lorenz.lorenz_rhs,
+        {"sigma": lorenz.sigma, "B": lorenz.B, "R": lorenz.R},
+        start_point=(1.0, 1.0, 1.0),
+        num_iterations=100,
+        sampling_rate=20.0,
+        jacobian=lorenz.lorenz_jacobian,
+        color="k",
+        parameter_ranges={"R": (0.0, 200.0)},
+    ),
+    "aizawa": OdeSystem(
+        "Aizawa",
+        aizawa.aizawa_rhs,
+        {"a": aizawa.a, "b": aizawa.b, "c": aizawa.c, "d": aizawa.d, "e": aizawa.e, "f": aizawa.f},
+        start_point=(0.1, 0.0, 0.0),
+        num_iterations=5000,
+        sampling_rate=2.0,
+        jacobian=aizawa.aizawa_jacobian,
+        color="c",
+        parameter_ranges={"c": (0.0, 1.0)},
+    ),
+    "rossler": OdeSystem(
+        "Rossler",
+        rossler.rossler_rhs,
+        {"a": rossler.a, "b": rossler.b, "c": rossler.c},
+        start_point=(1.0, 1.0, 1.0),
+        num_iterations=300,
+        sampling_rate=5.0,
+        jacobian=rossler.rossler_jacobian,
+        color="r",
+        parameter_ranges={"c": (2.0, 18.0)},
+    ),
+    "chen": OdeSystem(
+        "Chen",
+        chen.chen_rhs,
+        {"a": chen.a, "b": chen.b, "c": chen.c},
+        start_point=(-0.1, 0.5, -0.6),
+        num_iterations=100,
+        sampling_rate=20.0,
+        jacobian=chen.chen_jacobian,
+        color="b",
+        parameter_ranges={"c": (17.0, 29.0)},
+    ),
+    "thomas": OdeSystem(
+        "Thomas",
+        thomas.thomas_rhs,
+        {"b": thomas.b},
+        start_point=(0.1, 0.0, 0.0),
+        num_iterations=1000,
+        sampling_rate=2.0,
+        jacobian=thomas.thomas_jacobian,
+        color="g",
+        parameter_ranges={"b": (0.1, 0.35)},
+    ),
+}
+
+
+def register_ode_system(key: str, system: OdeSystem) -> None:
+    """Adds `system` to the registry `ode_systems` under `key`."""
+    if key in ode_systems:
+        raise ValueError(f"An ode system with key {key} is already registered.")
+    ode_systems[key] = system
@@ -0,0 +1,39 @@
+"""Module with `PoincareSection` to record the crossings of a trajectory with a hyperplane."""
+from __future__ import annotations
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PoincareSection:
+    """The hyperplane normal . x = offset with a crossing direction.
+    Instances are event functions for `scipy.integrate.solve_ivp`, which locates the
+    crossings by root finding on the dense output of the solver."""
+
+    normal: tuple[float, ...]
+    offset: float = 0.0
+    direction: int = 1  # 1 along the normal, -1 against it, 0 both directions
+    terminal: bool = False  # read by solve_ivp, crossings never stop the integration
+
+    @classmethod
+    def plane(
+        cls, coordinate: int, value: float, dimensions: int = 3, direction: int = 1
+    ) -> PoincareSection:
+        """The section coordinate = value, crossed with increasing coordinate by default."""
+        normal = [0.0] * dimensions
+        normal[coordinate] = 1.0
+        return cls(tuple(normal), value, direction)
+
+    def __call__(self, t: float, x: np.ndarray) -> float:
+        """The signed distance of `x` to the plane in units of the normal's length."""
+        return float(np.dot(self.normal, x)) - self.offset
+
+    def in_plane_coordinates(self, points: np.ndarray) -> np.ndarray:
+        """Coordinates of `points` with shape (dimensions, K) in an orthonormal basis of the
+        plane. For planes of one coordinate the other coordinates are kept in order."""
+        normal = np.asarray(self.normal, dtype=float)
+        nonzero = np.flatnonzero(normal)
+        if len(nonzero) == 1:
+            return np.delete(points, nonzero[0], axis=0)
+        _, _, basis = np.linalg.svd(normal[np.newaxis])
+        return basis[1:] @ points
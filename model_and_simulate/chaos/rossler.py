@@ -0,0 +1,29 @@
+"""Contains Rössler equations and parameters."""
+import numpy as np
+
+# parameters for rössler equations
+a = 0.2
+b = 0.2
+c = 5.7
+
+
+def rossler_rhs(x: np.ndarray, out: np.ndarray, a: float, b: float, c: float) -> np.ndarray:
+    """Writes the derivatives of the states `x` with shape (3, ...) into `out`."""
+    x0, x1, x2 = x[0], x[1], x[2]
+    out[0] = -x1 - x2
+    out[1] = x0 + a * x1
+    out[2] = b + x2 * (x0 - c)
+    return out
+
+
+def rossler_jacobian(x: np.ndarray, a: float, b: float, c: float) -> np.ndarray:
+    """The Jacobian matrices of the states `x` with shape (3, ...) as (3, 3, ...) array."""
+    x0, x2 = x[0], x[2]
+    jacobian = np.zeros((3, 3, *np.shape(x0)))
+    jacobian[0, 1] = -1
+    jacobian[0, 2] = -1
+    jacobian[1, 0] = 1
+    jacobian[1, 1] = a
+    jacobian[2, 0] = x2
+    jacobian[2, 2] = x0 - c
+    return jacobian
@@ -0,0 +1,27 @@
+"""Contains Thomas' cyclically symmetric equations and parameters."""
+import numpy as np
+
+# parameter for thomas equations
+b = 0.208186
+
+
+def thomas_rhs(x: np.ndarray, out: np.ndarray, b: float) -> np.ndarray:
+    """Writes the derivatives of the states `x` with shape (3, ...) into `out`."""
+    x0, x1, x2 = x[0], x[1], x[2]
+    out[0] = np.sin(x1) - b * x0
+    out[1] = np.sin(x2) - b * x1
+    out[2] = np.sin(x0) - b * x2
+    return out
+
+
+def thomas_jacobian(x: np.ndarray, b: float) -> np.ndarray:
+    """The Jacobian matrices of the states `x` with shape (3, ...) as (3, 3, ...) array."""
+    x0, x1, x2 = x[0], x[1], x[2]
+    jacobian = np.zeros((3, 3, *np.shape(x0)))
+    jacobian[0, 0] = -b
+    jacobian[0, 1] = np.cos(x1)
+    jacobian[1, 1] = -b
+    jacobian[1, 2] = np.cos(x2)
+    jacobian[2, 0] = np.cos(x0)
+    jacobian[2, 2] = -b
+    return jacobian
@@ -0,0 +1,230 @@
+"""Module with an on-disk cache of dense chaos trajectories."""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Callable, Optional
+import numpy as np
+
+from .chaos_simulation import ChaosSimulation
+from .ode_systems import OdeSystem
+
+
+def default_cache_directory() -> str:
+    """The directory of the cache. It is set by the environment variable
+    MODEL_AND_SIMULATE_CACHE and defaults to ~/.cache/model_and_simulate/trajectories."""
+    default = os.path.join(os.path.expanduser("~"), ".cache", "model_and_simulate", "trajectories")
+    return os.environ.get("MODEL_AND_SIMULATE_CACHE", default)
+
+
+class TrajectoryCache:
+    """Stores the uniformly sampled trajectories of `ChaosSimulation.get_dense_data`.
+    An entry is keyed by a hash of the system, its parameters, the start point, the method,
+    the time step, the sampling rate and the transient. The number of iterations is not part of
+    the key: longer requests extend the stored trajectory from its last point.
+    Samples are appended to a raw file, which is loaded as memory map. The least recently used
+    entries are evicted when the cache exceeds `max_bytes`."""
+
+    index_file_name = "index.json"
+    steps_per_chunk: int = 10  # iterations simulated per solver call when extending
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 1 << 30):
+        """
+        Args:
+            directory (Optional[str]): The cache directory. Defaults to
+                `default_cache_directory()`.
+            max_bytes (int): The maximum size of all trajectories. Defaults to 1 GiB.
+        """
+        self._directory = default_cache_directory() if directory is None else directory
+        self._max_bytes = max_bytes
+        os.makedirs(self._directory, exist_ok=True)
+        self._index = self._load_index()  # type: dict[str, dict]
+
+    @property
+    def directory(self) -> str:
+        """The cache directory."""
+        return self._directory
+
+    @property
+    def size(self) -> int:
+        """The number of bytes of all stored trajectories."""
+        return sum(entry["bytes"] for entry in self._index.values())
+
+    @staticmethod
+    def make_key(
+        ode_system: OdeSystem,
+        ode_method: str,
+        time_step: float,
+        sampling_rate: float,
+        num_initial_steps: int,
+    ) -> str:
+        """The hash of everything that determines the trajectory of a dense simulation."""
+        description = {
+            "system": ode_system.name,
+            "rhs": f"{ode_system.rhs.__module__}.{ode_system.rhs.__qualname__}",
+            "parameters": {name: float(value) for name, value in ode_system.parameters.items()},
+            "start_point": [float(value) for value in ode_system.start_point],
+            "ode_method": ode_method,
+            "time_step": float(time_step),
+            "sampling_rate": float(sampling_rate),
+            "num_initial_steps": num_initial_steps,
+            "steps_per_chunk": TrajectoryCache.steps_per_chunk,  # the solver restarts per chunk
+        }
+        encoded = json.dumps(description, sort_keys=True).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get_dense_data(
+        self,
+        ode_system: OdeSystem,
+        num_steps: int,
+        sampling_rate: Optional[float] = None,
+        ode_method: str = "DOP853",
+        time_step: int = 30,
+        num_initial_steps: int = 100,
+        progress: Optional[Callable[[float], None]] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        The dense data of `num_steps` iterations after the transient from the cache.
+            Missing iterations are simulated and appended first. The first point is the end of the
+            transient, the last sampled point of the last iteration is not included.
+        Args:
+            ode_system (OdeSystem): The simulated system.
+            num_steps (int): Number of iterations.
+            sampling_rate (Optional[float]): Number of data points per unit of time.
+                Defaults to the sampling rate of the system.
+            ode_method (str): The integration method of `scipy.integrate.solve_ivp`.
+            time_step (int): The time span of one iteration.
+            num_initial_steps (int): Number of iterations of the transient.
+            progress (Optional[Callable[[float], None]]): Called with the fraction of stored
+                iterations after every simulated chunk and with 1.0 at the end. Chunks of the
+                transient report 0.0.
+
+        Returns:
+            numpy.ndarray: Read-only memory map of the data points with shape (dimensions, N).
+        """
+        if sampling_rate is None:
+            sampling_rate = ode_system.sampling_rate
+        key = self.make_key(ode_system, ode_method, time_step, sampling_rate, num_initial_steps)
+        entry = self._index.get(key)
+        if entry is None or entry["num_steps"] < num_steps:
+            simulation = ChaosSimulation.from_ode_system(
+                ode_system, ode_method=ode_method, time_step=time_step
+            )
+            entry = self._extend(
+                key, entry, simulation, num_steps, sampling_rate, num_initial_steps, progress
+            )
+            if entry is None:
+                return None
+        if progress is not None:
+            progress(1.0)
+        entry["last_used"] = time.time()
+        self._save_index()
+        num_samples = round(num_steps * time_step * sampling_rate)
+        data = np.memmap(
+            self._data_file(key),
+            dtype=np.float64,
+            mode="r",
+            shape=(entry["num_samples"], ode_system.dimensions),
+        )
+        return data[:num_samples].T
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        for key in list(self._index):
+            self._remove(key)
+        self._save_index()
+
+    def _extend(
+        self,
+        key: str,
+        entry: Optional[dict],
+        simulation: ChaosSimulation,
+        num_steps: int,
+        sampling_rate: float,
+        num_initial_steps: int,
+        progress: Optional[Callable[[float], None]] = None,
+    ) -> Optional[dict]:
+        """Simulates the iterations after the stored ones and appends their samples.
+        The index is saved after every chunk, so the progress is kept even if the solver fails
+        or the process is stopped on the way. Bytes after the indexed samples are left from
+        such an interruption and are cut off before appending."""
+        if entry is None:
+            chaotic_point = simulation.get_transient_point(
+                num_initial_steps,
+                TrajectoryCache.steps_per_chunk,
+                None if progress is None else lambda _: progress(0.0),
+            )
+            if chaotic_point is None:
+                return None
+            entry = {
+                "num_steps": 0,
+                "num_samples": 0,
+                "bytes": 0,
+                "last_point": chaotic_point.tolist(),
+                "last_time": num_initial_steps * simulation.time_step,
+            }
+        entry["last_used"] = time.time()
+        self._index[key] = entry
+        path = self._data_file(key)
+        num_bytes = entry["num_samples"] * len(entry["last_point"]) * np.float64().itemsize
+        with open(path, "r+b" if os.path.exists(path) else "wb") as data_file:
+            data_file.truncate(num_bytes)
+            data_file.seek(num_bytes)
+            while entry["num_steps"] < num_steps:
+                chunk_steps = min(TrajectoryCache.steps_per_chunk, num_steps - entry["num_steps"])
+                data = simulation.get_dense_data(
+                    chunk_steps,
+                    sampling_rate,
+                    chaotic_point=np.asarray(entry["last_point"]),
+                    time_start=entry["last_time"],
+                )
+                if data is None:
+                    break
+                data_file.write(np.ascontiguousarray(data[:, :-1].T).tobytes())
+                data_file.flush()
+                entry["num_steps"] += chunk_steps
+                entry["num_samples"] += data.shape[1] - 1
+                entry["bytes"] = data_file.tell()
+                entry["last_point"] = data[:, -1].tolist()
+                entry["last_time"] += chunk_steps * simulation.time_step
+                self._save_index()  # only after the samples are written
+                if progress is not None:
+                    progress(entry["num_steps"] / num_steps)
+        entry["bytes"] = os.path.getsize(path)
+        self._evict(keep=key)
+        self._save_index()
+        return entry if entry["num_steps"] >= num_steps else None
+
+    def _evict(self, keep: str) -> None:
+        """Removes the least recently used entries except `keep` until the size fits."""
+        by_last_use = sorted(self._index, key=lambda k: self._index[k].get("last_used", 0))
+        for key in by_last_use:
+            if self.size <= self._max_bytes:
+                break
+            if key != keep:
+                self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        del self._index[key]
+        shutil.rmtree(os.path.join(self._directory, key), ignore_errors=True)
+
+    def _data_file(self, key: str) -> str:
+        entry_directory = os.path.join(self._directory, key)
+        os.makedirs(entry_directory, exist_ok=True)
+        return os.path.join(entry_directory, "data.f64")
+
+    def _load_index(self) -> dict[str, dict]:
+        try:
+            with open(os.path.join(self._directory, TrajectoryCache.index_file_name)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self) -> None:
+        """Writes the index to a temporary file first, so it is never half written."""
+        path = os.path.join(self._directory, TrajectoryCache.index_file_name)
+        with open(path + ".tmp", "w") as file:
+            json.dump(self._index, file)
+        os.replace(path + ".tmp", path)
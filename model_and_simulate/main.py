@@ -1,7 +1,8 @@
 """Module to select which simulation to run."""
 import model_and_simulate.utilities.pygame_simple as pygame_simple
 
-from base_start_menu import pygame_simulations, matplotlib_simulations, BaseStartScreen
+from base_start_menu import pygame_simulations, chaos_simulations, BaseStartScreen
+from chaos.chaos_export_screen import ChaosExportScreen
 
 
 def run_pygame_main() -> bool:
@@ -25,7 +26,5 @@ if __name__ == "__main__":
             if simulation_key in pygame_simulations:
                 running = run_pygame_main()
             else:
-                print("Start producing the attractor. \n Please wait for matplotlib output.")
-                simulation_main = matplotlib_simulations[simulation_key]
-                simulation_main()
+                running = ChaosExportScreen(chaos_simulations[simulation_key]).show()
     pygame_simple.quit_pygame()
@@ -0,0 +1,262 @@
+"""Module with structure analyses of `MoleculeSimulation`, which average over many steps.
+
+All analyses are on step listeners: `simulation.add_on_step_listener(analysis)` samples
+every `interval` steps and keeps only accumulated sums instead of the trajectory.
+"""
+from __future__ import annotations
+import math
+import numpy as np
+from .molecule_simulation import MoleculeSimulation
+
+
+class RadialDistribution:
+    """The radial distribution function g(r) accumulated from the pairs of the cell list.
+    `Field.find_pairs` only gives pairs of neighboring cells, so `r_max` is at most the cell
+    size, which is the cut-off radius of the simulation."""
+
+    def __init__(self, simulation: MoleculeSimulation, num_bins: int = 200, interval: int = 10):
+        """
+        Args:
+            simulation (MoleculeSimulation): The simulation to analyse.
+            num_bins (int): The number of distance bins between 0 and the cut-off radius.
+            interval (int): The number of steps between two samples as step listener.
+        """
+        self.r_max = simulation.r_c
+        self.interval = interval
+        self._num_steps = 0
+        self._squared_edges = np.linspace(0, self.r_max, num_bins + 1) ** 2
+        self._counts = np.zeros(num_bins, dtype=np.int64)
+        self._num_samples = 0
+        self._ideal_pairs = 0.0  # expected pairs per unit area, summed over the samples
+
+    def __call__(self, simulation: MoleculeSimulation) -> None:
+        """Samples every `interval` calls, use as on step listener."""
+        self._num_steps += 1
+        if self._num_steps % self.interval == 0:
+            self.sample(simulation)
+
+    @property
+    def num_samples(self) -> int:
+        """The number of accumulated configurations."""
+        return self._num_samples
+
+    @property
+    def bin_edges(self) -> np.ndarray:
+        """The distances of the bin edges."""
+        return np.sqrt(self._squared_edges)
+
+    @property
+    def bin_centers(self) -> np.ndarray:
+        """The distances of the bin centers."""
+        edges = self.bin_edges
+        return (edges[:-1] + edges[1:]) / 2
+
+    def sample(self, simulation: MoleculeSimulation) -> None:
+        """Adds the pair distances of the current positions to the histogram."""
+        _, _, r_uv = simulation.field.find_pairs(simulation.positions)
+        squared_distances = np.einsum("ij,ij->i", r_uv, r_uv)
+        # the squared edges bin the squared distances without square roots
+        bins = np.searchsorted(self._squared_edges, squared_distances, side="right") - 1
+        bins = bins[bins < len(self._counts)]
+        self._counts += np.bincount(bins, minlength=len(self._counts))
+        num_molecules = len(simulation.positions)
+        (_, width), (_, height) = simulation.dim
+        self._ideal_pairs += num_molecules * (num_molecules - 1) / 2 / (width * height)
+        self._num_samples += 1
+
+    def result(self) -> tuple[np.ndarray, np.ndarray]:
+        """The bin centers and g(r), the pair counts relative to an ideal gas of equal density.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The distances and the values of g.
+        """
+        shell_areas = math.pi * np.diff(self._squared_edges)
+        expected = self._ideal_pairs * shell_areas
+        g = np.divide(self._counts, expected, out=np.zeros(len(expected)), where=expected > 0)
+        return self.bin_centers, g
+
+    def reset(self) -> None:
+        """Forgets all samples."""
+        self._counts[:] = 0
+        self._num_samples = 0
+        self._ideal_pairs = 0.0
+
+
+class StructureFactor:
+    """The static structure factor S(k) = <|rho_k|^2> / N of the periodic field. The positions
+    are binned into a density grid, whose 2D FFT approximates the Fourier components rho_k
+    for wave vectors below the Nyquist limit of the grid."""
+
+    def __init__(self, simulation: MoleculeSimulation, grid_size: int = 128, interval: int = 10):
+        """
+        Args:
+            simulation (MoleculeSimulation): The simulation to analyse.
+            grid_size (int): The number of density grid points along each axis.
+            interval (int): The number of steps between two samples as step listener.
+        """
+        (_, self._width), (_, self._height) = simulation.dim
+        self.grid_size = grid_size
+        self.interval = interval
+        self._num_steps = 0
+        self._power = np.zeros((grid_size, grid_size // 2 + 1))
+        self._num_samples = 0
+
+    def __call__(self, simulation: MoleculeSimulation) -> None:
+        """Samples every `interval` calls, use as on step listener."""
+        self._num_steps += 1
+        if self._num_steps % self.interval == 0:
+            self.sample(simulation)
+
+    @property
+    def num_samples(self) -> int:
+        """The number of accumulated configurations."""
+        return self._num_samples
+
+    @property
+    def wave_vectors(self) -> tuple[np.ndarray, np.ndarray]:
+        """The x and y components of the wave vectors of `result`."""
+        k_x = 2 * math.pi * np.fft.rfftfreq(self.grid_size, self._width / self.grid_size)
+        k_y = 2 * math.pi * np.fft.fftfreq(self.grid_size, self._height / self.grid_size)
+        return np.meshgrid(k_x, k_y)
+
+    def sample(self, simulation: MoleculeSimulation) -> None:
+        """Adds the power spectrum of the current density grid."""
+        positions = simulation.positions
+        scale = np.asarray([self.grid_size / self._width, self.grid_size / self._height])
+        cells = (positions * scale).astype(np.intp)
+        np.minimum(cells, self.grid_size - 1, out=cells)
+        density = np.bincount(
+            cells[:, 1] * self.grid_size + cells[:, 0], minlength=self.grid_size ** 2
+        ).reshape(self.grid_size, self.grid_size)
+        rho_k = np.fft.rfft2(density)
+        self._power += (rho_k.real ** 2 + rho_k.imag ** 2) / len(positions)
+        self._num_samples += 1
+
+    def result(self) -> np.ndarray:
+        """S(k) on the grid of `wave_vectors`, rows along k_y and columns along k_x."""
+        return self._power / max(self._num_samples, 1)
+
+    def radial_average(self, num_bins: int = 100) -> tuple[np.ndarray, np.ndarray]:
+        """S averaged over shells of equal |k|, without k = 0.
+
+        Args:
+            num_bins (int): The number of shells up to the largest |k|.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The shell centers and the mean S of each shell.
+        """
+        k_x, k_y = self.wave_vectors
+        k = np.hypot(k_x, k_y).ravel()
+        values = self.result().ravel()
+        edges = np.linspace(0, k.max(), num_bins + 1)
+        bins = np.minimum(np.searchsorted(edges, k, side="right") - 1, num_bins - 1)
+        inside = k > 0
+        sums = np.bincount(bins[inside], values[inside], minlength=num_bins)
+        counts = np.bincount(bins[inside], minlength=num_bins)
+        means = np.divide(sums, counts, out=np.zeros(num_bins), where=counts > 0)
+        return (edges[:-1] + edges[1:]) / 2, means
+
+    def reset(self) -> None:
+        """Forgets all samples."""
+        self._power[:] = 0
+        self._num_samples = 0
+
+
+class MeanSquaredDisplacement:
+    """The mean squared displacement of the unwrapped positions with the order-n algorithm of
+    multiple time origins. Level l keeps the last `block_length` samples, which are taken
+    every `block_length` ** l samples, so lags up to `block_length` ** `num_levels` samples
+    need O(`num_levels` * `block_length` * N) memory and O(N log T) work for T samples."""
+
+    def __init__(
+        self,
+        simulation: MoleculeSimulation,
+        block_length: int = 16,
+        num_levels: int = 4,
+        interval: int = 10,
+        remove_drift: bool = True,
+    ):
+        """
+        Args:
+            simulation (MoleculeSimulation): The simulation to analyse.
+            block_length (int): The number of samples per level and the ratio of the sampling
+                intervals of two consecutive levels.
+            num_levels (int): The number of levels.
+            interval (int): The number of steps between two samples as step listener.
+            remove_drift (bool): Whether the motion of the center of mass is subtracted.
+        """
+        self.block_length = block_length
+        self.num_levels = num_levels
+        self.interval = interval
+        self.remove_drift = remove_drift
+        self._sample_time = interval * simulation.time_step
+        self._num_steps = 0
+        self._num_samples = 0
+        shape = (num_levels, block_length, len(simulation.positions), 2)
+        self._blocks = np.zeros(shape)  # ring buffers of the samples of every level
+        self._sums = np.zeros((num_levels, block_length))
+        self._counts = np.zeros((num_levels, block_length), dtype=np.int64)
+
+    def __call__(self, simulation: MoleculeSimulation) -> None:
+        """Samples every `interval` calls, use as on step listener."""
+        self._num_steps += 1
+        if self._num_steps % self.interval == 0:
+            self.sample(simulation)
+
+    @property
+    def num_samples(self) -> int:
+        """The number of accumulated configurations."""
+        return self._num_samples
+
+    def sample(self, simulation: MoleculeSimulation) -> None:
+        """Adds the displacements from the stored time origins to the current positions."""
+        positions = simulation.unwrapped_positions[simulation.identity_indices]
+        if self.remove_drift:
+            positions -= positions.mean(axis=0)
+        block_length = self.block_length
+        for level in range(self.num_levels):
+            spacing = block_length ** level
+            if self._num_samples % spacing != 0:
+                break
+            index = self._num_samples // spacing  # the number of earlier samples of the level
+            num_origins = min(index, block_length)
+            blocks = self._blocks[level]
+            origins = (index - np.arange(1, num_origins + 1)) % block_length
+            displacements = positions - blocks[origins]
+            self._sums[level, :num_origins] += np.einsum("lij,lij->l", displacements, displacements)
+            self._counts[level, :num_origins] += len(positions)
+            blocks[index % block_length] = positions
+        self._num_samples += 1
+
+    def result(self) -> tuple[np.ndarray, np.ndarray]:
+        """The lag times and the mean squared displacements.
+        Lags of a level, which a finer level covers as well, are taken from the finer one.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The lag times and the MSD at these times.
+        """
+        lags = np.arange(1, self.block_length + 1)
+        times, values = [], []
+        for level in range(self.num_levels):
+            # the first lag of a level is the last lag of the level below
+            use = (lags > 1 if level > 0 else lags > 0) & (self._counts[level] > 0)
+            times.append(lags[use] * self.block_length ** level * self._sample_time)
+            values.append(self._sums[level, use] / self._counts[level, use])
+        return np.concatenate(times), np.concatenate(values)
+
+    def diffusion_coefficient(self, fit_fraction: float = 0.5) -> float:
+        """The diffusion coefficient D from MSD = 4 D t in two dimensions, fitted to the longer
+        lags, where the motion is diffusive instead of ballistic.
+
+        Args:
+            fit_fraction (float): The fraction of the longest lags to fit the slope to.
+
+        Returns:
+            float: The diffusion coefficient, nan if less than two lags are known.
+        """
+        times, values = self.result()
+        start = int(len(times) * (1 - fit_fraction))
+        if len(times) - start < 2:
+            return math.nan
+        slope = np.polyfit(times[start:], values[start:], 1)[0]
+        return slope / 4
@@ -3,17 +3,22 @@ from typing import Optional
 
 import numpy as np
 
+from model_and_simulate.utilities.workspace import Workspace
+
 
 class Field:
     """A 2-D area of cells to use as simulation field."""
 
-    def __init__(self, num_rows: int, num_columns: int, cell_size: int) -> None:
+    def __init__(
+        self, num_rows: int, num_columns: int, cell_size: int, dtype: np.dtype = np.float64
+    ) -> None:
         """
         Create a field with `num_rows` * `num_columns` fields of size `cell_size`.
         Args:
             num_rows (int): Number of rows in the grid structure.
             num_columns (int): Number of columns in the grid structure.
             cell_size (int): Length of the quadratic cells.
+            dtype (np.dtype): The floating point type of the positions. Defaults to float64.
         """
         self.width = cell_size * num_columns
         self.height = cell_size * num_rows
@@ -22,7 +27,14 @@ class Field:
         self._displacements = self._init_displacements(num_rows, num_columns)
         self._bins_x = np.linspace(0, self.width, num_columns + 1)
         self._bins_y = np.linspace(0, self.height, num_rows + 1)
-        self._border_max = np.asarray([self.width, self.height])
+        self._border_max = np.asarray([self.width, self.height], dtype=dtype)
+        self._num_rows, self._num_columns = num_rows, num_columns
+        self._inverse_cell_size = 1 / cell_size
+        self._neighbors, self._shifts = self._init_neighbor_stencil(num_rows, num_columns, dtype)
+        self._counts = np.zeros(num_rows * num_columns, dtype=np.intp)
+        self._starts = np.zeros(num_rows * num_columns, dtype=np.intp)
+        self._ends = np.zeros(num_rows * num_columns, dtype=np.intp)
+        self._workspace = Workspace()
 
     def clear_cells(self) -> None:
         """Make all cells empty."""
@@ -50,13 +62,140 @@ class Field:
         )
         return relevant_cells, displacements
 
+    def cell_indices(self, positions: np.ndarray) -> np.ndarray:
+        """The flat index row * num_columns + column of the cell of every position.
+        The result is a scratch array, which the next call overwrites."""
+        workspace = self._workspace
+        scaled = workspace.get("scaled", len(positions), positions.dtype, 2)
+        np.multiply(positions, self._inverse_cell_size, out=scaled)
+        columns_rows = workspace.get("columns_rows", len(positions), np.intp, 2)
+        np.copyto(columns_rows, scaled, casting="unsafe")
+        # column by column, numpy buffers operations which broadcast a vector over rows
+        for dimension, last in enumerate((self._num_columns - 1, self._num_rows - 1)):
+            np.minimum(columns_rows[:, dimension], last, out=columns_rows[:, dimension])
+        cells = workspace.get("cells", len(positions), np.intp)
+        np.multiply(columns_rows[:, 1], self._num_columns, out=cells)
+        np.add(cells, columns_rows[:, 0], out=cells)
+        return cells
+
+    def cell_order(self, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """The indices which sort the positions by their cells and the sorted cell indices.
+        The order within a cell is ascending. The results are scratch arrays.
+
+        Args:
+            positions (np.ndarray): The positions inside the field with shape (N, 2).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The sorting indices and the sorted cells.
+        """
+        workspace = self._workspace
+        num_positions = len(positions)
+        cells = self.cell_indices(positions)
+        # the unique keys cell * N + index sort in place, unlike a stable argsort
+        keys = workspace.get("keys", num_positions, np.intp)
+        np.multiply(cells, num_positions, out=keys)
+        np.add(keys, workspace.arange(num_positions), out=keys)
+        keys.sort()
+        order = workspace.get("order", num_positions, np.intp)
+        np.remainder(keys, num_positions, out=order)
+        sorted_cells = workspace.get("sorted_cells", num_positions, np.intp)
+        np.floor_divide(keys, num_positions, out=sorted_cells)
+        return order, sorted_cells
+
+    def find_pairs(self, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Finds every pair of positions in the same or neighboring cells once, like
+        `get_relevant_cells`, but for all cells at once without Python loops.
+        All arrays are scratch arrays, so after the first steps no memory is allocated.
+
+        Args:
+            positions (np.ndarray): The positions inside the field with shape (N, 2).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The indices u and v of the pairs and
+                the distance vectors from u to the nearest periodic image of v. The next call
+                overwrites them.
+        """
+        workspace = self._workspace
+        num_positions = len(positions)
+        indices = workspace.arange(num_positions)
+        order, sorted_cells = self.cell_order(positions)
+        counts, starts, ends = self._counts, self._starts, self._ends
+        counts[...] = 0
+        np.add.at(counts, sorted_cells, 1)
+        np.cumsum(counts, out=ends)
+        np.subtract(ends, counts, out=starts)
+        # every sorted position has one segment of partners per neighbor cell offset
+        num_segments = len(self._neighbors) * num_positions
+        lengths = workspace.get("segment_lengths", num_segments, np.intp)
+        partners = workspace.get("segment_partners", num_segments, np.intp)
+        shifts = workspace.get("segment_shifts", num_segments, positions.dtype, 2)
+        neighbor_cells = workspace.get("neighbor_cells", num_positions, np.intp)
+        for offset, neighbors in enumerate(self._neighbors):
+            segments = slice(offset * num_positions, (offset + 1) * num_positions)
+            if offset == 0:  # pairs within a cell only once, with the later positions
+                np.take(ends, sorted_cells, out=lengths[segments], mode="clip")
+                np.subtract(lengths[segments], indices, out=lengths[segments])
+                np.subtract(lengths[segments], 1, out=lengths[segments])
+                np.add(indices, 1, out=partners[segments])
+            else:
+                np.take(neighbors, sorted_cells, out=neighbor_cells, mode="clip")
+                np.take(counts, neighbor_cells, out=lengths[segments], mode="clip")
+                np.take(starts, neighbor_cells, out=partners[segments], mode="clip")
+            np.take(self._shifts[offset], sorted_cells, axis=0, out=shifts[segments], mode="clip")
+        num_pairs = int(lengths.sum())
+        segment_starts = workspace.get("segment_starts", num_segments, np.intp)
+        np.cumsum(lengths, out=segment_starts)
+        np.subtract(segment_starts, lengths, out=segment_starts)
+        # the segment of every pair from marks at the segment starts
+        pair_segments = workspace.get("pair_segments", num_pairs + 1, np.intp)
+        pair_segments[...] = 0
+        np.add.at(pair_segments, segment_starts, 1)
+        np.cumsum(pair_segments, out=pair_segments)
+        pair_segments = pair_segments[:num_pairs]
+        np.subtract(pair_segments, 1, out=pair_segments)
+        # sorted v is the first partner of the segment plus the rank of the pair within it
+        np.subtract(partners, segment_starts, out=partners)
+        sorted_v = workspace.get("sorted_v", num_pairs, np.intp)
+        np.take(partners, pair_segments, out=sorted_v, mode="clip")
+        np.add(sorted_v, workspace.arange(num_pairs), out=sorted_v)
+        sorted_u = workspace.get("sorted_u", num_pairs, np.intp)
+        np.remainder(pair_segments, num_positions, out=sorted_u)
+        u = workspace.get("pairs_u", num_pairs, np.intp)
+        np.take(order, sorted_u, out=u, mode="clip")
+        v = workspace.get("pairs_v", num_pairs, np.intp)
+        np.take(order, sorted_v, out=v, mode="clip")
+        r_uv = workspace.get("pairs_r_uv", num_pairs, positions.dtype, 2)
+        pair_shifts = workspace.get("pair_shifts", num_pairs, positions.dtype, 2)
+        np.take(positions, v, axis=0, out=r_uv, mode="clip")
+        np.take(positions, u, axis=0, out=pair_shifts, mode="clip")
+        np.subtract(r_uv, pair_shifts, out=r_uv)
+        np.take(shifts, pair_segments, axis=0, out=pair_shifts, mode="clip")
+        np.add(r_uv, pair_shifts, out=r_uv)
+        return u, v, r_uv
+
     def get_cell(self, i: int, j: int) -> list[int]:
         """Gives the cell with the specified indices."""
         return self._cells[i][j]
 
-    def correct_positions(self, positions: np.ndarray) -> None:
-        """Move objects outside the field to the opposite position inside the field."""
-        positions %= self._border_max
+    def correct_positions(self, positions: np.ndarray, images: Optional[np.ndarray] = None) -> None:
+        """Move objects outside the field to the opposite position inside the field.
+
+        Args:
+            positions (np.ndarray): The positions with shape (N, 2), corrected in place.
+            images (Optional[np.ndarray]): Integer counts with shape (N, 2) of how often each
+                position crossed the borders. The crossings of this correction are added.
+        """
+        if images is not None:
+            crossings = self._workspace.get("crossings", len(positions), positions.dtype, 2)
+            image_crossings = self._workspace.get("image_crossings", len(images), images.dtype, 2)
+        for dimension, border in enumerate(self._border_max):
+            coordinates = positions[:, dimension]  # column by column to avoid numpy buffers
+            if images is not None:
+                np.floor_divide(coordinates, border, out=crossings[:, dimension])
+            np.remainder(coordinates, border, out=coordinates)
+        if images is not None:
+            np.copyto(image_crossings, crossings, casting="unsafe")
+            np.add(images, image_crossings, out=images)
 
     def _init_displacements(
         self, num_rows: int, num_columns: int
@@ -96,6 +235,23 @@ class Field:
 
         return displacement
 
+    def _init_neighbor_stencil(
+        self, num_rows: int, num_columns: int, dtype: np.dtype
+    ) -> tuple[list[np.ndarray], list[np.ndarray]]:
+        """The flat neighbor cell index and periodic shift vector of every cell for the offsets
+        of `get_relevant_cells`: the cell itself, right, and the three cells below."""
+        rows, columns = np.divmod(np.arange(num_rows * num_columns), num_columns)
+        neighbors, shifts = [], []
+        for d_row, d_column in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+            row, column = rows + d_row, columns + d_column
+            shift = np.zeros((len(rows), 2), dtype=dtype)
+            shift[:, 0] = np.where(column == num_columns, self.width, 0)
+            shift[:, 0] -= np.where(column == -1, self.width, 0)
+            shift[:, 1] = np.where(row == num_rows, self.height, 0)
+            neighbors.append((row % num_rows) * num_columns + column % num_columns)
+            shifts.append(shift)
+        return neighbors, shifts
+
     @staticmethod
     def init_cells(num_rows: int, num_columns: int) -> list[list[list[int]]]:
         """Init cells of the field as 2D list structure of lists.
@@ -0,0 +1,146 @@
+"""Module with fixed step integrators for the molecules of `MoleculeSimulation`."""
+from abc import ABC, abstractmethod
+from typing import Callable
+import numpy as np
+
+# writes the accelerations of the positions into the output array, the force part is "all",
+# "short" below or "long" beyond the split distance of the pair potential
+Accelerations = Callable[[np.ndarray, np.ndarray, str], None]
+
+
+class Integrator(ABC):
+    """Advances positions and velocities by one step in place.
+    Accelerations which are carried over to the next step are kept by the integrator."""
+
+    force_evaluations_per_step: float = 1  # number of pair traversals per step
+
+    def __init__(
+        self,
+        accelerations: Accelerations,
+        wrap: Callable[[np.ndarray], None],
+        shape: tuple,
+        dtype: np.dtype = np.float64,
+    ):
+        """
+        Args:
+            accelerations (function): Writes the accelerations of a force part of the positions
+                into the output array.
+            wrap (function): Moves positions outside the field back into the field in place.
+            shape (tuple): The shape of positions and velocities.
+            dtype (np.dtype): The floating point type of positions and velocities.
+                Defaults to float64.
+        """
+        self._calc_accelerations = accelerations
+        self._wrap = wrap
+        self._accelerations = np.zeros(shape, dtype=dtype)
+        self._scratch = np.zeros(shape, dtype=dtype)  # for the updates without temporaries
+        self._stale = True
+
+    @property
+    def accelerations(self) -> np.ndarray:
+        """The accelerations of the last force evaluation."""
+        return self._accelerations
+
+    def reset(self) -> None:
+        """Forgets the carried accelerations, e.g. after the positions were changed outside."""
+        self._stale = True
+
+    def permute(self, order: np.ndarray) -> None:
+        """Reorders the carried accelerations like positions and velocities were reordered
+        with `positions[...] = positions[order]`."""
+        self._permute(self._accelerations, order)
+
+    def _permute(self, array: np.ndarray, order: np.ndarray) -> None:
+        np.take(array, order, axis=0, out=self._scratch, mode="clip")
+        array[...] = self._scratch
+
+    def _add_scaled(self, array: np.ndarray, factor: float, rates: np.ndarray) -> None:
+        """array += factor * rates in place without a temporary array."""
+        np.multiply(rates, factor, out=self._scratch)
+        np.add(array, self._scratch, out=array)
+
+    def _drift(self, positions: np.ndarray, velocities: np.ndarray, h: float) -> None:
+        self._add_scaled(positions, h, velocities)
+        self._wrap(positions)
+
+    @abstractmethod
+    def step(self, positions: np.ndarray, velocities: np.ndarray, h: float) -> None:
+        """Advances `positions` and `velocities` by the step size `h` in place."""
+
+
+class VelocityVerlet(Integrator):
+    """Velocity Störmer-Verlet as kick-drift-kick. The accelerations at the end of a step
+    start the next one, so one force evaluation per step is needed."""
+
+    def step(self, positions: np.ndarray, velocities: np.ndarray, h: float) -> None:
+        """Advances `positions` and `velocities` by the step size `h` in place."""
+        if self._stale:
+            self._calc_accelerations(positions, self._accelerations, "all")
+            self._stale = False
+        self._add_scaled(velocities, h / 2, self._accelerations)
+        self._drift(positions, velocities, h)
+        self._calc_accelerations(positions, self._accelerations, "all")
+        self._add_scaled(velocities, h / 2, self._accelerations)
+
+
+class PositionVerlet(Integrator):
+    """Position Störmer-Verlet as drift-kick-drift. It evaluates the forces once per step in
+    the middle and carries no accelerations over, so it never needs an extra evaluation."""
+
+    def step(self, positions: np.ndarray, velocities: np.ndarray, h: float) -> None:
+        """Advances `positions` and `velocities` by the step size `h` in place."""
+        self._drift(positions, velocities, h / 2)
+        self._calc_accelerations(positions, self._accelerations, "all")
+        self._add_scaled(velocities, h, self._accelerations)
+        self._drift(positions, velocities, h / 2)
+
+
+class Respa(Integrator):
+    """Reversible multiple time stepping (r-RESPA). The long-range part of the forces kicks
+    with the outer step `h`, the short-range part with `num_substeps` inner velocity Verlet
+    steps. The steep short-range forces limit the inner step only, so `h` may be larger."""
+
+    num_substeps: int = 4
+
+    def __init__(
+        self,
+        accelerations: Accelerations,
+        wrap: Callable[[np.ndarray], None],
+        shape: tuple,
+        dtype: np.dtype = np.float64,
+    ):
+        super().__init__(accelerations, wrap, shape, dtype)
+        self.force_evaluations_per_step = Respa.num_substeps + 1
+        self._short_accelerations = np.zeros(shape, dtype=dtype)
+        self._long_accelerations = np.zeros(shape, dtype=dtype)
+
+    def permute(self, order: np.ndarray) -> None:
+        """Reorders the carried accelerations like positions and velocities were reordered
+        with `positions[...] = positions[order]`."""
+        super().permute(order)
+        self._permute(self._short_accelerations, order)
+        self._permute(self._long_accelerations, order)
+
+    def step(self, positions: np.ndarray, velocities: np.ndarray, h: float) -> None:
+        """Advances `positions` and `velocities` by the step size `h` in place."""
+        if self._stale:
+            self._calc_accelerations(positions, self._short_accelerations, "short")
+            self._calc_accelerations(positions, self._long_accelerations, "long")
+            self._stale = False
+        inner_h = h / self.num_substeps
+        self._add_scaled(velocities, h / 2, self._long_accelerations)
+        for _ in range(self.num_substeps):
+            self._add_scaled(velocities, inner_h / 2, self._short_accelerations)
+            self._drift(positions, velocities, inner_h)
+            self._calc_accelerations(positions, self._short_accelerations, "short")
+            self._add_scaled(velocities, inner_h / 2, self._short_accelerations)
+        self._calc_accelerations(positions, self._long_accelerations, "long")
+        self._add_scaled(velocities, h / 2, self._long_accelerations)
+        np.add(self._short_accelerations, self._long_accelerations, out=self._accelerations)
+
+
+integrators = {
+    "velocity_verlet": VelocityVerlet,
+    "position_verlet": PositionVerlet,
+    "respa": Respa,
+}  # type: dict[str, type[Integrator]]
@@ -1,24 +1,25 @@
 """Module with molecule simulation class and additional features."""
+import math
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Optional, Tuple
 import numpy as np
-from numpy.random import default_rng
 from .field import Field
+from .integrators import Integrator, integrators
+from .pair_potentials import PotentialTable, pair_potentials
 from model_and_simulate.utilities.coordinate_mapper import CoordinateMapper2D
 from model_and_simulate.utilities.simulation import Simulation, SimulationParameters
-
-rng = default_rng()
+from model_and_simulate.utilities.workspace import Workspace
 
 distributions = {
-    "uniform": rng.uniform,
-    "cauchy_center": rng.standard_cauchy,
-    "exponential_zero": rng.exponential,
-    "gumbel": rng.gumbel,
-    "normal_zero": rng.normal,
-    "normal_center": rng.normal,
-    # "logistic_center": rng.logistic,
-    # "exponential_center": rng.exponential,
-}  # type str[callable]
+    "uniform": "uniform",
+    "cauchy_center": "standard_cauchy",
+    "exponential_zero": "exponential",
+    "gumbel": "gumbel",
+    "normal_zero": "normal",
+    "normal_center": "normal",
+    # "logistic_center": "logistic",
+    # "exponential_center": "exponential",
+}  # type dict[str, str] with names of `numpy.random.Generator` methods
 
 
 class MoleculeSimulation(Simulation):
@@ -36,6 +37,12 @@ class MoleculeSimulation(Simulation):
         distribution: str,
         h: float,
         init_vel_range: Tuple[float, float],
+        seed: Optional[int] = None,
+        integrator: str = "velocity_verlet",
+        potential: str = "lennard_jones",
+        dtype: str = "float64",
+        thermostat: bool = True,
+        sort_interval: int = 100,
     ) -> None:
         """
         Args:
@@ -47,44 +54,69 @@ class MoleculeSimulation(Simulation):
             h (float): Step size parameter delta_t.
             init_vel_range (Tuple[float, float]): Uniform distribution params
              to draw velocities initially from.
+            seed (Optional[int]): Seed for the random number generator. Defaults to None.
+            integrator (str): Key of the integrator in `integrators`.
+                Defaults to velocity Störmer-Verlet.
+            potential (str): Key of the pair potential in `pair_potentials`.
+                Defaults to Lennard-Jones.
+            dtype (str): The floating point type of positions, velocities and forces.
+                "float32" halves the memory traffic, energies are summed in float64 anyway.
+                Defaults to "float64".
+            thermostat (bool): Whether the velocities are rescaled to the initial kinetic
+                energy after every step. Defaults to True.
+            sort_interval (int): Number of steps between sorting the molecule arrays by cell,
+                see `sort_molecules`. Zero never sorts. Defaults to 100.
         """
+        super().__init__(seed)
         self._molecules = list(range(num_molecules))
         self._sigma = sigma
         self._min_distance = MoleculeSimulation.min_distance_factor * sigma
         self.r_c = MoleculeSimulation.cut_off_factor * sigma
-        self._field = Field(num_rows, num_columns, self.r_c)
+        self._dtype = np.dtype(dtype)
+        self._field = Field(num_rows, num_columns, self.r_c, dtype=self._dtype)
+        self._potential_table = PotentialTable(
+            pair_potentials[potential], self._min_distance, self.r_c, dtype=self._dtype
+        )
         self._num_rows = num_rows
         self._num_columns = num_columns
         self._h = h
-        rng_gen = distributions[distribution]
+        self._workspace = Workspace()  # scratch arrays of the step temporaries
+        rng_gen = getattr(self.rng, distributions[distribution])
         centralize = "center" in distribution
         self._positions = self._init_positions(rng_gen, centralize)
-        velocities_x = rng.uniform(
-            low=init_vel_range[0], high=init_vel_range[1], size=num_molecules
-        )
-        velocities_y = rng.uniform(
-            low=init_vel_range[0], high=init_vel_range[1], size=num_molecules
-        )
-        self._velocities = np.column_stack((velocities_x, velocities_y))
+        self._velocities = self.rng.uniform(
+            low=init_vel_range[0], high=init_vel_range[1], size=(num_molecules, 2)
+        ).astype(self._dtype)
         self._total_energy = self._calculate_energy()
-        self._accelerations = np.zeros_like(self._velocities)
+        self._thermostat = thermostat
+        self._images = np.zeros((num_molecules, 2), dtype=np.int64)
+        self._integrator = integrators[integrator](
+            self._calc_accelerations, self._wrap_positions, self._positions.shape, self._dtype
+        )  # type: Integrator
+        self._sort_interval = sort_interval
+        self._num_steps = 0
+        self._num_sorts = 0
+        self._identities = np.arange(num_molecules)
+        self._identity_indices = np.arange(num_molecules)
+        if sort_interval > 0:
+            self.sort_molecules()
 
     def _calculate_energy(self) -> float:
         """Sum of squares of velocities gives kinetic energy of the system."""
-        return np.linalg.norm(self._velocities) ** 2
+        velocities = self._velocities
+        if velocities.dtype != np.float64:  # a copy, since a cast in einsum allocates buffers
+            velocities = self._workspace.get("velocities_float64", len(velocities), np.float64, 2)
+            np.copyto(velocities, self._velocities)
+        return float(np.einsum("ij,ij->", velocities, velocities))
 
     def _init_positions(self, rng_gen: callable, centralize: bool) -> np.ndarray:
-        positions_x = rng_gen(size=len(self._molecules))
-        positions_y = rng_gen(size=len(self._molecules))
-        pos_range_x = min(positions_x), max(positions_x)
-        pos_range_y = min(positions_y), max(positions_y)
-        coord_mapper = CoordinateMapper2D(pos_range_x, pos_range_y, *self.dim)
-        positions = np.column_stack((positions_x, positions_y))
-        center = np.asarray([self._field.width / 2, self._field.height / 2])
-        for m in self._molecules:
-            positions[m] = coord_mapper.map_coordinates(positions[m])
-            if centralize:
-                positions[m] += center
+        positions = rng_gen(size=(len(self._molecules), 2))
+        pos_range_x = positions[:, 0].min(), positions[:, 0].max()
+        pos_range_y = positions[:, 1].min(), positions[:, 1].max()
+        coord_mapper = CoordinateMapper2D(pos_range_x, pos_range_y, *self.dim, dtype=self._dtype)
+        positions = coord_mapper.map_coordinates(positions.astype(self._dtype))
+        if centralize:
+            positions += np.asarray([self._field.width / 2, self._field.height / 2], self._dtype)
         return positions
 
     @property
@@ -92,67 +124,174 @@ class MoleculeSimulation(Simulation):
         """Coordinate ranges of simulated field."""
         return (0, self._field.width), (0, self._field.height)
 
+    @property
+    def dtype(self) -> np.dtype:
+        """The floating point type of positions, velocities and forces."""
+        return self._dtype
+
+    @property
+    def field(self) -> Field:
+        """The cell grid of the simulated area."""
+        return self._field
+
     @property
     def molecules(self) -> list[int]:
         """List of molecules."""
         return self._molecules
 
+    @property
+    def identities(self) -> np.ndarray:
+        """The molecule of every row of `positions` and `velocities`."""
+        return self._identities
+
+    @property
+    def identity_indices(self) -> np.ndarray:
+        """The row in `positions` and `velocities` of every molecule."""
+        return self._identity_indices
+
+    @property
+    def num_sorts(self) -> int:
+        """How often the molecule arrays were reordered. Views on rows are stale after a sort."""
+        return self._num_sorts
+
     @property
     def positions(self) -> np.ndarray:
-        """Numpy array with x-y-positions."""
+        """Numpy array with x-y-positions, use `identity_indices` to find a molecule."""
         return self._positions
 
+    @property
+    def images(self) -> np.ndarray:
+        """How often each molecule crossed the periodic borders along x and y."""
+        return self._images
+
+    @property
+    def unwrapped_positions(self) -> np.ndarray:
+        """The positions without the periodic corrections, which give the true displacements."""
+        (_, width), (_, height) = self.dim
+        return self._positions + self._images * np.asarray([width, height])
+
     @property
     def velocities(self) -> np.ndarray:
-        """Numpy array with x-y-velocities."""
+        """Numpy array with x-y-velocities, use `identity_indices` to find a molecule."""
         return self._velocities
 
-    def _calc_velocities(self) -> None:
-        self._velocities += self._h / 2 * self._accelerations
+    @property
+    def time_step(self) -> float:
+        """The step size delta_t."""
+        return self._h
+
+    @property
+    def integrator(self) -> Integrator:
+        """The integrator, which advances positions and velocities."""
+        return self._integrator
+
+    @property
+    def kinetic_energy(self) -> float:
+        """The kinetic energy of all molecules with unit mass."""
+        return 0.5 * self._calculate_energy()
+
+    @property
+    def potential_table(self) -> PotentialTable:
+        """The lookup table of the pair potential."""
+        return self._potential_table
+
+    def potential_energy(self) -> float:
+        """The potential energy of all pairs within the cut-off radius."""
+        _, _, r_uv = self._field.find_pairs(self._positions)
+        squared_distances = np.einsum("ij,ij->i", r_uv, r_uv)
+        return float(self._potential_table.energies(squared_distances).sum(dtype=np.float64))
+
+    def _wrap_positions(self, positions: np.ndarray) -> None:
+        """Moves positions back into the field and counts the border crossings."""
+        self._field.correct_positions(positions, self._images)
 
     def _norm_velocities(self) -> None:
         current_energy = self._calculate_energy()
         if current_energy > 0:
-            norm_factor = np.sqrt(self._total_energy / current_energy)
-            self._velocities = norm_factor * self._velocities
-
-    def _calc_positions(self) -> None:
-        self._positions += self._h * self._velocities + self._h ** 2 / 2 * self._accelerations
-        self._field.correct_positions(self._positions)
-
-    def _calc_forces(self) -> None:
-        for i in self._field.cell_ranges[0]:
-            for j in self._field.cell_ranges[1]:
-                current_cell = self._field.get_cell(i, j)
-                other_cells, displacements = self._field.get_relevant_cells(i, j)
-                for u in current_cell:
-                    for cell, displacement in zip(other_cells, displacements):
-                        if displacement is None:
-                            for v in cell:
-                                self._calc_force(u, v, self._positions[v])
-                        else:
-                            for v in cell:
-                                pos_v = self._positions[v] + displacement
-                                self._calc_force(u, v, pos_v)
-
-    def _calc_force(self, u: int, v: int, pos_v: np.ndarray) -> None:
-        r_uv = pos_v - self._positions[u]
-        r = max(np.linalg.norm(r_uv), self._min_distance)
-        if r <= self.r_c:
-            force = 24 * (2 * r ** (-13) - r ** (-7)) * r_uv
-            self._accelerations[u] += force
-            self._accelerations[v] -= force
+            norm_factor = math.sqrt(self._total_energy / current_energy)
+            np.multiply(self._velocities, norm_factor, out=self._velocities)
+
+    def _calc_accelerations(
+        self, positions: np.ndarray, accelerations: np.ndarray, part: str = "all"
+    ) -> None:
+        """Writes the accelerations of a force part of the pair potential into `accelerations`.
+        The parts are split at `PairPotential.split_distance` for multiple time stepping."""
+        timers = self.timers
+        with timers.phase("binning"):
+            u, v, r_uv = self._field.find_pairs(positions)
+        with timers.phase("forces"):
+            workspace = self._workspace
+            squared_distances = workspace.get("squared_distances", len(u), positions.dtype)
+            np.einsum("ij,ij->i", r_uv, r_uv, out=squared_distances)
+            inside = workspace.get("inside", len(u), np.bool_)
+            np.less_equal(squared_distances, self._potential_table.s_c, out=inside)
+            # gather the pairs inside the cut-off radius, about a third of all
+            pairs = workspace.nonzero("pairs_inside", inside)
+            num_pairs = len(pairs)
+            u_inside = workspace.get("u_inside", num_pairs, np.intp)
+            v_inside = workspace.get("v_inside", num_pairs, np.intp)
+            r_inside = workspace.get("r_inside", num_pairs, positions.dtype, 2)
+            np.take(u, pairs, out=u_inside, mode="clip")
+            np.take(v, pairs, out=v_inside, mode="clip")
+            np.take(r_uv, pairs, axis=0, out=r_inside, mode="clip")
+            squared_inside = workspace.get("squared_inside", num_pairs, positions.dtype)
+            np.take(squared_distances, pairs, out=squared_inside, mode="clip")
+            force_factors = self._potential_table.force_factors(squared_inside, part)
+            forces = workspace.get("forces", num_pairs, positions.dtype)
+            for dimension in range(positions.shape[1]):
+                np.multiply(force_factors, r_inside[:, dimension], out=forces)
+                component = accelerations[:, dimension]
+                component[...] = 0
+                np.add.at(component, v_inside, forces)
+                np.subtract.at(component, u_inside, forces)
+
+    def _state_arrays(self) -> dict[str, np.ndarray]:
+        """The positions in the order of the molecules."""
+        return {"positions": self._positions[self._identity_indices]}
+
+    def _write_state(self, state: dict[str, np.ndarray]) -> None:
+        """Gathers the positions into the order of the molecules, which does not change
+        with `sort_molecules`."""
+        np.take(
+            self._positions, self._identity_indices, axis=0, out=state["positions"], mode="clip"
+        )
+
+    def sort_molecules(self) -> None:
+        """Reorders the molecule arrays in place by the flat index of their cells.
+        Molecules move and their rows scatter over the cells, so the gathers of the force
+        kernel jump through memory. In cell order, the pairs of `Field.find_pairs` read
+        neighboring rows and its sort of the cell indices gets almost presorted input."""
+        order, _ = self._field.cell_order(self._positions)
+        workspace = self._workspace
+        num_molecules = len(order)
+        for name, array in (
+            ("sorted_rows", self._positions),
+            ("sorted_rows", self._velocities),
+            ("sorted_images", self._images),
+        ):
+            scratch = workspace.get(name, num_molecules, array.dtype, 2)
+            np.take(array, order, axis=0, out=scratch, mode="clip")
+            array[...] = scratch
+        self._integrator.permute(order)
+        identities = workspace.get("sorted_identities", num_molecules, np.intp)
+        np.take(self._identities, order, out=identities, mode="clip")
+        self._identities[...] = identities
+        np.put(self._identity_indices, self._identities, workspace.arange(num_molecules))
+        self._num_sorts += 1
 
     def do_step(self) -> None:
         """Perform one step of the simulation."""
-        self._calc_positions()
-        self._calc_velocities()
-        self._accelerations = np.zeros_like(self._positions)
-        self._field.clear_cells()
-        self._field.place_into_cells(self._positions)
-        self._calc_forces()
-        self._calc_velocities()
-        self._norm_velocities()
+        timers = self.timers
+        with timers.phase("integration"):
+            self._integrator.step(self._positions, self._velocities, self._h)
+        if self._thermostat:
+            with timers.phase("thermostat"):
+                self._norm_velocities()
+        self._num_steps += 1
+        if self._sort_interval > 0 and self._num_steps % self._sort_interval == 0:
+            with timers.phase("sorting"):
+                self.sort_molecules()
+        self._on_step_done()
 
 
 @dataclass
@@ -166,3 +305,7 @@ class MoleculeParameters(SimulationParameters):
     distribution: str = "uniform"
     time_step: float = 0.001
     init_vel_range: tuple[int, int] = -300, 300
+    seed: Optional[int] = None
+    integrator: str = "velocity_verlet"
+    potential: str = "lennard_jones"
+    dtype: str = "float64"
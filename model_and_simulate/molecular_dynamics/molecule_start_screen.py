@@ -1,6 +1,8 @@
 """Module for the molecule simulation menu."""
 
+from .integrators import integrators
 from .molecule_simulation import distributions, MoleculeParameters
+from .pair_potentials import pair_potentials
 from model_and_simulate.utilities.pygame_button import SwitchButton, TextButton, Button
 from model_and_simulate.utilities.pygame_simple import Color, get_window_resolution
 from model_and_simulate.utilities.start_screen import SimulationStartScreen
@@ -55,6 +57,46 @@ class MoleculeStartScreen(SimulationStartScreen):
             buttons_distributions.keys(), menu_items, on_click_listener_distribution
         )
 
+        buttons_integrators: dict[SwitchButton, str] = {
+            SwitchButton(
+                (col_w, row_h),
+                (2 * col_w, y * row_h),
+                text=v,
+                in_and_active_color=(Color.BLUE, Color.SILVER),
+            ): v
+            for y, v in zip((4, 5, 6), integrators.keys())
+        }
+        self.default_button_on(buttons_integrators, simulation_parameters.integrator)
+
+        def on_click_listener_integrator(clicked_button: SwitchButton):
+            """The callback function for integrator buttons."""
+            simulation_parameters.integrator = buttons_integrators[clicked_button]
+            self.simple_pygame.play_effect("hit_low")
+            self.disable_other_buttons(clicked_button, list(buttons_integrators.keys()))
+
+        self.add_switch_buttons(
+            buttons_integrators.keys(), menu_items, on_click_listener_integrator
+        )
+
+        buttons_potentials: dict[SwitchButton, str] = {
+            SwitchButton(
+                (col_w, row_h),
+                (3 * col_w, y * row_h),
+                text=v,
+                in_and_active_color=(Color.GOLD, Color.SILVER),
+            ): v
+            for y, v in zip((3, 4, 5, 6, 7), pair_potentials.keys())
+        }
+        self.default_button_on(buttons_potentials, simulation_parameters.potential)
+
+        def on_click_listener_potential(clicked_button: SwitchButton):
+            """The callback function for pair potential buttons."""
+            simulation_parameters.potential = buttons_potentials[clicked_button]
+            self.simple_pygame.play_effect("hit_low")
+            self.disable_other_buttons(clicked_button, list(buttons_potentials.keys()))
+
+        self.add_switch_buttons(buttons_potentials.keys(), menu_items, on_click_listener_potential)
+
         buttons_text_input: dict[TextButton, str] = {
             TextButton(
                 (col_w * 2, row_h),
@@ -110,6 +152,8 @@ class MoleculeStartScreen(SimulationStartScreen):
         buttons += (
             list(buttons_h.keys())
             + list(buttons_distributions.keys())
+            + list(buttons_integrators.keys())
+            + list(buttons_potentials.keys())
             + list(buttons_text_input.keys())
         )
         return col_w, row_h, simulation_parameters, buttons
@@ -122,6 +166,8 @@ class MoleculeStartScreen(SimulationStartScreen):
         menu_texts += [
             ("step size dt", (0, row_h, 20, Color.HGREEN)),
             ("position distribution", (0, 2.5 * row_h, bigger_text, Color.RED)),
+            ("integrator", (2 * col_w, 3.5 * row_h, 20, Color.BLUE)),
+            ("potential", (3 * col_w, 2.5 * row_h, 20, Color.GOLD)),
         ]
         y = 3
         for text, limit in zip(
@@ -14,9 +14,18 @@ from .molecule_start_screen import MoleculeStartScreen
 class MoleculeVisualization(SimulationVisualization):
     """A visualization of `MoleculeSimulation` in pygame."""
 
+    threaded = True
+
+    def __init__(self, title: str):
+        super(MoleculeVisualization, self).__init__(title)
+        self._molecule_sprites = []  # type: list[Molecule]
+
     def update_visualization(self) -> None:
-        """Nothing to do."""
-        pass
+        """Moves the sprites to the last published positions of their molecules."""
+        with self.simulation.state_buffer.read() as (_, state):
+            rect_positions = self.coord_mapper.map_coordinates(state["positions"])
+        for sprite, (x, y) in zip(self._molecule_sprites, rect_positions.tolist()):
+            sprite.move_to(x, y)
 
     def initialize_simulation(self) -> Simulation:
         """Creates the molecule simulation object."""
@@ -27,9 +36,14 @@ class MoleculeVisualization(SimulationVisualization):
         music = "sim_bass" if self.simulation_parameters.time_step < 0.01 else "sim_psy"
         play_music_loop(music)
         molecule_sprites = self.simple_pygame.all_sprites
-        for molecule in self.simulation.molecules:
-            pos = self.simulation.positions[molecule]
-            molecule_sprites.add(Molecule(self.coord_mapper, self.simulation_parameters.sigma, pos))
+        color_rng = self.simulation.spawn_rngs(1)[0]
+        color_indices = color_rng.integers(len(Molecule.colors), size=len(self.simulation.molecules))
+        self._molecule_sprites = []
+        for color_index in color_indices:
+            sprite = Molecule(self.simulation_parameters.sigma, Molecule.colors[color_index])
+            self._molecule_sprites.append(sprite)
+            molecule_sprites.add(sprite)
+        self.update_visualization()
 
     def show_start_screen(self) -> tuple[SimulationParameters, bool, bool, bool]:
         """Calls the implementation of molecule start screen."""
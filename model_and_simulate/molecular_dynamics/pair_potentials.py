@@ -0,0 +1,272 @@
+"""Module with pair potentials and their lookup tables in the squared distance."""
+from __future__ import annotations
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from model_and_simulate.utilities.workspace import Workspace
+
+
+class PairPotential(ABC):
+    """A radially symmetric pair potential V(r).
+    The force on the second molecule of a pair is `force_factor(r)` times the distance vector
+    from the first to the second molecule, so `force_factor` is -V'(r) / r."""
+
+    @abstractmethod
+    def energy(self, r: np.ndarray) -> np.ndarray:
+        """The potential energy at the distances `r`."""
+
+    @abstractmethod
+    def force_factor(self, r: np.ndarray) -> np.ndarray:
+        """The factor -V'(r) / r at the distances `r`."""
+
+    @property
+    def split_distance(self) -> float:
+        """The distance which splits the forces into a short and a long-range part for multiple
+        time stepping. Defaults to infinity, where every force is short-range."""
+        return math.inf
+
+
+@dataclass(frozen=True)
+class LennardJones(PairPotential):
+    """V(r) = 4 epsilon ((sigma / r)^12 - (sigma / r)^6)."""
+
+    epsilon: float = 1.0
+    sigma: float = 1.0
+
+    def energy(self, r: np.ndarray) -> np.ndarray:
+        """The potential energy at the distances `r`."""
+        x6 = (self.sigma / r) ** 6
+        return 4 * self.epsilon * (x6 * x6 - x6)
+
+    def force_factor(self, r: np.ndarray) -> np.ndarray:
+        """The factor -V'(r) / r at the distances `r`."""
+        x6 = (self.sigma / r) ** 6
+        return 24 * self.epsilon * (2 * x6 * x6 - x6) / r ** 2
+
+    @property
+    def split_distance(self) -> float:
+        """The minimum of the potential, where the force changes sign."""
+        return 2 ** (1 / 6) * self.sigma
+
+
+@dataclass(frozen=True)
+class ShiftedLennardJones(LennardJones):
+    """The Lennard-Jones potential shifted to zero energy at the cut-off radius `r_c`.
+    The forces are unchanged, but the energy has no jump at the cut-off. The default `r_c` is
+    the cut-off of `MoleculeSimulation` with sigma 1."""
+
+    r_c: float = 8.0
+
+    def energy(self, r: np.ndarray) -> np.ndarray:
+        """The potential energy at the distances `r`."""
+        return super().energy(r) - super().energy(np.asarray(self.r_c))
+
+
+@dataclass(frozen=True)
+class WeeksChandlerAndersen(LennardJones):
+    """The repulsive part of the Lennard-Jones potential. It is cut at its minimum and shifted
+    up by epsilon, so molecules only repel each other."""
+
+    def energy(self, r: np.ndarray) -> np.ndarray:
+        """The potential energy at the distances `r`."""
+        return np.where(r < self.split_distance, super().energy(r) + self.epsilon, 0.0)
+
+    def force_factor(self, r: np.ndarray) -> np.ndarray:
+        """The factor -V'(r) / r at the distances `r`."""
+        return np.where(r < self.split_distance, super().force_factor(r), 0.0)
+
+
+@dataclass(frozen=True)
+class Morse(PairPotential):
+    """V(r) = depth ((1 - exp(-width (r - r_0)))^2 - 1) with its minimum -depth at r_0."""
+
+    depth: float = 1.0
+    width: float = 2.0
+    r_0: float = 2 ** (1 / 6)
+
+    def energy(self, r: np.ndarray) -> np.ndarray:
+        """The potential energy at the distances `r`."""
+        decay = np.exp(-self.width * (r - self.r_0))
+        return self.depth * ((1 - decay) ** 2 - 1)
+
+    def force_factor(self, r: np.ndarray) -> np.ndarray:
+        """The factor -V'(r) / r at the distances `r`."""
+        decay = np.exp(-self.width * (r - self.r_0))
+        return 2 * self.depth * self.width * (decay - 1) * decay / r
+
+    @property
+    def split_distance(self) -> float:
+        """The minimum of the potential, where the force changes sign."""
+        return self.r_0
+
+
+@dataclass(frozen=True)
+class SoftSphere(PairPotential):
+    """V(r) = epsilon (sigma / r)^n, a purely repulsive potential."""
+
+    epsilon: float = 1.0
+    sigma: float = 1.0
+    n: int = 12
+
+    def energy(self, r: np.ndarray) -> np.ndarray:
+        """The potential energy at the distances `r`."""
+        return self.epsilon * (self.sigma / r) ** self.n
+
+    def force_factor(self, r: np.ndarray) -> np.ndarray:
+        """The factor -V'(r) / r at the distances `r`."""
+        return self.n * self.epsilon * (self.sigma / r) ** self.n / r ** 2
+
+
+class PotentialTable:
+    """The force factors and energies of a `PairPotential` tabulated on a uniform grid of the
+    squared distance s = r^2 between the minimum distance and the cut-off radius.
+    Lookups interpolate linearly or with cubic Hermite polynomials and need neither square
+    roots nor powers. Below the minimum distance the force factor stays constant, so the force
+    grows linearly with the distance vector, and the energy continues quadratically."""
+
+    parts = ("all", "short", "long")  # force parts for multiple time stepping
+
+    def __init__(
+        self,
+        potential: PairPotential,
+        r_min: float,
+        r_c: float,
+        num_entries: int = 4096,
+        interpolation: str = "cubic",
+        dtype: np.dtype = np.float64,
+    ):
+        """
+        Args:
+            potential (PairPotential): The tabulated potential.
+            r_min (float): The minimum distance of the table.
+            r_c (float): The cut-off radius, forces and energies vanish beyond.
+            num_entries (int): The number of grid points.
+            interpolation (str): "linear" or "cubic".
+            dtype (np.dtype): The floating point type of the tabulated values. The table is
+                computed in float64 and rounded once. Defaults to float64.
+        """
+        if interpolation not in ("linear", "cubic"):
+            raise ValueError(f"Unknown interpolation {interpolation}!")
+        self.potential = potential
+        self.interpolation = interpolation
+        self.s_min, self.s_c = r_min ** 2, r_c ** 2
+        self._step = (self.s_c - self.s_min) / (num_entries - 1)
+        self._inverse_step = 1 / self._step
+        s = np.linspace(self.s_min, self.s_c, num_entries)
+        r = np.sqrt(s)
+        force_factors = potential.force_factor(r)
+        short = r < potential.split_distance
+        self._force_factors = {
+            "all": force_factors,
+            "short": np.where(short, force_factors, 0.0),
+            "long": np.where(short, 0.0, force_factors),
+        }
+        # derivatives with respect to s for the cubic interpolation, d/ds = d/dr / (2 r)
+        delta = 1e-6 * r
+        derivatives = (
+            (potential.force_factor(r + delta) - potential.force_factor(r - delta))
+            / (2 * delta)
+            / (2 * r)
+        )
+        self._derivatives = {
+            "all": derivatives,
+            "short": np.where(short, derivatives, 0.0),
+            "long": np.where(short, 0.0, derivatives),
+        }
+        self._energies = potential.energy(r)
+        self._energy_derivatives = -force_factors / 2  # dV/ds = V'(r) / (2 r)
+        for table in (self._force_factors, self._derivatives):
+            for part in self.parts:
+                table[part] = table[part].astype(dtype)
+        self._energies = self._energies.astype(dtype)
+        self._energy_derivatives = self._energy_derivatives.astype(dtype)
+        self._workspace = Workspace()
+
+    def force_factors(
+        self, s: np.ndarray, part: str = "all", out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """The force factors of `part` at the squared distances `s`, zero beyond the cut-off.
+        Without `out`, the result is a scratch array, which the next lookup overwrites."""
+        return self._lookup(s, self._force_factors[part], self._derivatives[part], out)
+
+    def energies(self, s: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """The energies at the squared distances `s`, zero beyond the cut-off.
+        Without `out`, the result is a scratch array, which the next lookup overwrites."""
+        energies = self._lookup(s, self._energies, self._energy_derivatives, out)
+        below = self._workspace.get("below", len(s), np.bool_)
+        np.less(s, self.s_min, out=below)
+        if below.any():
+            continuation = self._workspace.get("continuation", len(s), self._energies.dtype)
+            np.subtract(self.s_min, s, out=continuation)
+            np.multiply(continuation, self._force_factors["all"][0] / 2, out=continuation)
+            np.add(continuation, self._energies[0], out=continuation)
+            np.copyto(energies, continuation, where=below)
+        return energies
+
+    def _lookup(
+        self,
+        s: np.ndarray,
+        values: np.ndarray,
+        derivatives: np.ndarray,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        workspace = self._workspace
+        length, dtype = len(s), values.dtype
+        result = workspace.get("result", length, dtype) if out is None else out
+        t = workspace.get("t", length, dtype)
+        np.clip(s, self.s_min, self.s_c, out=t)
+        np.subtract(t, self.s_min, out=t)
+        np.multiply(t, self._inverse_step, out=t)
+        left_index = workspace.get("left_index", length, dtype)
+        np.floor(t, out=left_index)
+        np.minimum(left_index, len(values) - 2, out=left_index)
+        np.subtract(t, left_index, out=t)
+        index = workspace.get("index", length, np.intp)
+        np.copyto(index, left_index, casting="unsafe")
+        left = workspace.get("left", length, dtype)
+        right = workspace.get("right", length, dtype)
+        np.take(values, index, out=left, mode="clip")
+        np.add(index, 1, out=index)
+        np.take(values, index, out=right, mode="clip")
+        # result = left + w_right * (right - left) with w_right = t or 3 t^2 - 2 t^3
+        np.subtract(right, left, out=right)
+        if self.interpolation == "linear":
+            np.multiply(right, t, out=right)
+        else:
+            t2 = workspace.get("t2", length, dtype)
+            t3 = workspace.get("t3", length, dtype)
+            weight = workspace.get("weight", length, dtype)
+            np.multiply(t, t, out=t2)
+            np.multiply(t2, t, out=t3)
+            np.multiply(t2, 3, out=weight)
+            np.subtract(weight, t3, out=weight)
+            np.subtract(weight, t3, out=weight)
+            np.multiply(right, weight, out=right)
+            # the derivative terms step * ((t^3 - t^2) d_right + (t^3 - 2 t^2 + t) d_left)
+            np.take(derivatives, index, out=left_index, mode="clip")
+            np.subtract(t3, t2, out=weight)
+            np.multiply(left_index, weight, out=left_index)
+            np.subtract(weight, t2, out=weight)
+            np.add(weight, t, out=weight)
+            np.subtract(index, 1, out=index)
+            np.take(derivatives, index, out=t2, mode="clip")
+            np.multiply(t2, weight, out=t2)
+            np.add(left_index, t2, out=left_index)
+            np.multiply(left_index, self._step, out=left_index)
+            np.add(right, left_index, out=right)
+        np.add(left, right, out=result)
+        beyond = workspace.get("beyond", length, np.bool_)
+        np.greater(s, self.s_c, out=beyond)
+        np.copyto(result, 0, where=beyond)
+        return result
+
+
+pair_potentials = {
+    "lennard_jones": LennardJones(),
+    "shifted_lj": ShiftedLennardJones(),
+    "wca": WeeksChandlerAndersen(),
+    "morse": Morse(),
+    "soft_sphere": SoftSphere(),
+}  # type: dict[str, PairPotential]
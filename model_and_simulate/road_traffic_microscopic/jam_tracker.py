@@ -0,0 +1,282 @@
+"""Module with `JamTracker` to detect jams and follow them over time."""
+from __future__ import annotations
+import numpy as np
+
+from .traffic_simulation import TrafficSimulation
+from .vehicle import Vehicles
+
+JAM_STARTED = 0
+JAM_ENDED = 1
+
+# one record per started or ended jam
+jam_event_dtype = np.dtype(
+    [
+        ("kind", np.uint8),  # JAM_STARTED or JAM_ENDED
+        ("jam", np.int32),  # identification number of the jam
+        ("step", np.int32),  # step of the event
+        ("position", np.int32),  # cell of the jam's rear
+        ("vehicles", np.int32),  # number of vehicles, maximum number for ended jams
+        ("lifetime", np.int32),  # number of steps the jam existed, 0 for started jams
+        ("velocity", np.float32),  # mean velocity of the jam's rear in cells per step
+    ]
+)
+
+
+def _successors(array: np.ndarray) -> np.ndarray:
+    """The values of the successors in road order. It is cheaper than `np.roll`."""
+    return np.concatenate((array[1:], array[:1]))
+
+
+def _predecessors(array: np.ndarray) -> np.ndarray:
+    """The values of the predecessors in road order."""
+    return np.concatenate((array[-1:], array[:-1]))
+
+
+class JamTracker:
+    """Finds clusters of slow vehicles every `interval` steps and links them with the clusters
+    of the previous update. A cluster is a run of consecutive slow vehicles in road order with
+    small distances between them. Clusters overlapping a cluster of the previous update
+    continue its jam; the largest cluster keeps the jam if it split.
+    An update costs a few dozen small numpy calls, about three times a step of a short road,
+    so the default interval adds about a third to the step time. Jams which live shorter than
+    the interval may be missed and the steps of events are multiples of it."""
+
+    def __init__(
+        self,
+        number_of_cells: int,
+        velocity_threshold: int = 0,
+        max_gap: int = 1,
+        min_vehicles: int = 2,
+        link_tolerance: int = 1,
+        interval: int = 10,
+    ):
+        """
+        Args:
+            number_of_cells (int): The number of cells of the circular road.
+            velocity_threshold (int): Vehicles with at most this velocity are slow. Defaults to 0.
+            max_gap (int): The maximum number of free cells between vehicles of one jam.
+                Defaults to 1.
+            min_vehicles (int): The minimum number of vehicles of a jam. Defaults to 2.
+            link_tolerance (int): Number of cells a jam may move per step without
+                overlapping itself. Defaults to 1.
+            interval (int): The number of steps between two updates as step listener.
+                Defaults to 10, 1 tracks every step.
+        """
+        self._number_of_cells = number_of_cells
+        self._velocity_threshold = velocity_threshold
+        self._max_gap = max_gap
+        self._min_vehicles = min_vehicles
+        self._link_tolerance = link_tolerance
+        self._interval = interval
+        self._num_calls = 0
+        self._step = 0
+        self._next_jam = 0
+        self._events = []  # type: list[np.ndarray]  # chunks of `jam_event_dtype`
+        self._last_events = []  # type: list[np.ndarray]
+        # the active jams as parallel arrays
+        self._jams = np.zeros(0, dtype=np.int32)
+        self._births = np.zeros(0, dtype=np.int32)
+        self._rears = np.zeros(0, dtype=np.int64)
+        self._cells = np.zeros(0, dtype=np.int64)
+        self._vehicles = np.zeros(0, dtype=np.int64)
+        self._max_vehicles = np.zeros(0, dtype=np.int64)
+        self._displacements = np.zeros(0, dtype=np.int64)
+
+    @property
+    def step(self) -> int:
+        """The number of steps up to the last update."""
+        return self._step
+
+    @property
+    def number_of_active_jams(self) -> int:
+        """The number of jams of the last update."""
+        return len(self._jams)
+
+    @property
+    def events(self) -> np.ndarray:
+        """All events so far as structured array of `jam_event_dtype`."""
+        return _concatenate_events(self._events)
+
+    @property
+    def last_events(self) -> np.ndarray:
+        """The events of the last update as structured array of `jam_event_dtype`."""
+        return _concatenate_events(self._last_events)
+
+    @property
+    def active_jams(self) -> dict[str, np.ndarray]:
+        """The identification number, rear cell, number of cells and vehicles of active jams."""
+        return {
+            "jam": self._jams.copy(),
+            "position": self._rears.copy(),
+            "cells": self._cells.copy(),
+            "vehicles": self._vehicles.copy(),
+        }
+
+    def track_simulation(self, simulation: TrafficSimulation) -> None:
+        """Tracks every `interval`-th step of `simulation`. Use it as on step listener."""
+        self._num_calls += 1
+        if self._num_calls % self._interval == 0:
+            self.update(simulation.vehicles)
+
+    def update(self, vehicles: Vehicles) -> None:
+        """Finds the clusters of `vehicles`, links them to the jams and records events.
+        Call it every `interval` steps."""
+        rears, cells, sizes = self.find_clusters(
+            vehicles.positions, vehicles.velocities, vehicles.lengths
+        )
+        self._step += self._interval
+        self._last_events = []
+        if len(rears) == 0 and len(self._jams) == 0:
+            return
+        parents = self._link(rears, cells)
+        continued = parents >= 0
+
+        ended = np.ones(len(self._jams), dtype=bool)
+        ended[parents[continued]] = False
+        self._end_jams(np.nonzero(ended)[0])
+
+        jams = np.empty(len(rears), dtype=np.int32)
+        births = np.empty(len(rears), dtype=np.int32)
+        displacements = np.zeros(len(rears), dtype=np.int64)
+        max_vehicles = sizes.copy()
+        old = parents[continued]
+        jams[continued] = self._jams[old]
+        births[continued] = self._births[old]
+        half = self._number_of_cells // 2
+        moved = (rears[continued] - self._rears[old] + half) % self._number_of_cells - half
+        displacements[continued] = self._displacements[old] + moved
+        np.maximum(max_vehicles[continued], self._max_vehicles[old], out=max_vehicles[continued])
+
+        new = np.nonzero(~continued)[0]
+        jams[new] = np.arange(self._next_jam, self._next_jam + len(new))
+        births[new] = self._step
+        self._next_jam += len(new)
+        self._emit(JAM_STARTED, jams[new], rears[new], sizes[new], 0, 0.0)
+
+        self._jams = jams
+        self._births = births
+        self._rears = rears
+        self._cells = cells
+        self._vehicles = sizes
+        self._max_vehicles = max_vehicles
+        self._displacements = displacements
+
+    def finish(self) -> np.ndarray:
+        """Ends all active jams and returns all events."""
+        self._last_events = []
+        self._end_jams(np.arange(len(self._jams)))
+        self._jams = self._jams[:0]
+        self._births = self._births[:0]
+        self._rears = self._rears[:0]
+        self._cells = self._cells[:0]
+        self._vehicles = self._vehicles[:0]
+        self._max_vehicles = self._max_vehicles[:0]
+        self._displacements = self._displacements[:0]
+        return self.events
+
+    def find_clusters(
+        self, positions: np.ndarray, velocities: np.ndarray, lengths: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Finds the runs of slow vehicles on the circular road.
+
+        Args:
+            positions (np.ndarray): The front cells of the vehicles in road order.
+            velocities (np.ndarray): The velocities of the vehicles.
+            lengths (np.ndarray): The lengths of the vehicles in cells.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The rear cell, the number of covered cells
+                and the number of vehicles of every cluster.
+        """
+        number_of_vehicles = len(positions)
+        empty = np.zeros(0, dtype=np.int64)
+        if number_of_vehicles == 0:
+            return empty, empty, empty
+        positions = positions.astype(np.int64)
+        vehicle_rears = positions - lengths + 1
+        distances = (_successors(vehicle_rears) - positions - 1) % self._number_of_cells
+        slow = velocities <= self._velocity_threshold
+        # vehicle i and its successor belong to the same cluster
+        linked = slow & _successors(slow) & (distances <= self._max_gap)
+        if linked.all():
+            starts = np.zeros(1, dtype=np.int64)
+            ends = np.full(1, number_of_vehicles - 1, dtype=np.int64)
+        else:
+            starts = np.nonzero(slow & ~_predecessors(linked))[0]
+            ends = np.nonzero(slow & ~linked)[0]
+            if len(ends) > 0 and ends[0] < starts[0]:
+                ends = _successors(ends)  # the first cluster wraps around the end of the road
+        sizes = (ends - starts) % number_of_vehicles + 1
+        keep = sizes >= self._min_vehicles
+        starts, ends, sizes = starts[keep], ends[keep], sizes[keep]
+        rears = vehicle_rears[starts] % self._number_of_cells
+        cells = (positions[ends] - rears) % self._number_of_cells + 1
+        return rears, cells, sizes
+
+    def _link(self, rears: np.ndarray, cells: np.ndarray) -> np.ndarray:
+        """The index of the continued active jam for every cluster or -1 for new jams."""
+        parents = np.full(len(rears), -1, dtype=np.int64)
+        if len(self._jams) == 0 or len(rears) == 0:
+            return parents
+        n = self._number_of_cells
+        tolerance = self._link_tolerance * self._interval  # the cells a jam may move per update
+        old_rears = (self._rears - tolerance)[:, np.newaxis]
+        old_cells = (self._cells + 2 * tolerance)[:, np.newaxis]
+        # cyclic distance from every widened jam's rear to every cluster's rear
+        distances = (rears - old_rears) % n
+        overlaps = (distances < old_cells) | (distances > n - cells)
+        candidates = np.nonzero(overlaps.any(axis=0))[0]
+        if len(candidates) == 0:
+            return parents
+        # each cluster continues the largest overlapping jam
+        weights = overlaps[:, candidates] * (self._vehicles[:, np.newaxis] + 1)
+        candidate_parents = np.argmax(weights, axis=0)
+        # if a jam split, the cluster with the most cells continues it
+        order = np.lexsort((-cells[candidates], candidate_parents))
+        sorted_parents = candidate_parents[order]
+        first = order[np.concatenate(([True], sorted_parents[1:] != sorted_parents[:-1]))]
+        parents[candidates[first]] = candidate_parents[first]
+        return parents
+
+    def _end_jams(self, indices: np.ndarray) -> None:
+        if len(indices) == 0:
+            return
+        lifetimes = self._step - self._births[indices]
+        velocities = self._displacements[indices] / np.maximum(lifetimes, 1)
+        self._emit(
+            JAM_ENDED,
+            self._jams[indices],
+            self._rears[indices],
+            self._max_vehicles[indices],
+            lifetimes,
+            velocities,
+        )
+
+    def _emit(
+        self,
+        kind: int,
+        jams: np.ndarray,
+        positions: np.ndarray,
+        vehicles: np.ndarray,
+        lifetimes: np.ndarray | int,
+        velocities: np.ndarray | float,
+    ) -> None:
+        """Records one event per jam of `jams`, all of one kind at the current step."""
+        if len(jams) == 0:
+            return
+        events = np.empty(len(jams), dtype=jam_event_dtype)
+        events["kind"] = kind
+        events["jam"] = jams
+        events["step"] = self._step
+        events["position"] = positions
+        events["vehicles"] = vehicles
+        events["lifetime"] = lifetimes
+        events["velocity"] = velocities
+        self._events.append(events)
+        self._last_events.append(events)
+
+
+def _concatenate_events(chunks: list[np.ndarray]) -> np.ndarray:
+    if len(chunks) == 0:
+        return np.zeros(0, dtype=jam_event_dtype)
+    return np.concatenate(chunks)
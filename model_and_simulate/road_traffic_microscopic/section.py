@@ -1,6 +1,8 @@
 """Module for classes `Section` and `Cell`."""
 from __future__ import annotations
+from typing import Optional
 import math
+import numpy as np
 
 
 class Section:
@@ -17,23 +19,40 @@ class Section:
         self._length = length
         self._velocity_max = velocity_max
         self._density_max = density_max
+        self._number_of_cells = int(math.ceil(self._density_max * self._length))
+        self._cell_size = self._length / self._number_of_cells
+        # one byte per cell, shared by the `Cell` views and the numpy view `occupancy`
+        self._occupancy_buffer = bytearray(self._number_of_cells)
+        self._occupancy = np.frombuffer(self._occupancy_buffer, dtype=np.bool_)
+        self._cell_positions = np.arange(self._number_of_cells) * self._cell_size
         self._cells = self._init_cells()
 
     def _init_cells(self) -> list[Cell]:
-        number_of_cells = int(math.ceil(self._density_max * self._length))
-        cell_size = self._length / number_of_cells
-        cells = [Cell(i, cell_size) for i in range(number_of_cells)]
-        return cells
+        return [
+            Cell(i, self._cell_size, self._occupancy_buffer)
+            for i in range(self._number_of_cells)
+        ]
 
     @property
     def cells(self) -> list[Cell]:
         """The list of equidistant cells all of same size with ascending numbering."""
         return self._cells
 
+    @property
+    def occupancy(self) -> np.ndarray:
+        """Boolean array with one entry per cell, which is True for occupied cells.
+        It is a view on the cells' state and changes with them."""
+        return self._occupancy
+
+    @property
+    def cell_positions(self) -> np.ndarray:
+        """The positions of all cells in ascending order."""
+        return self._cell_positions
+
     @property
     def cell_size(self) -> float:
         """Length of each cell. It is the same for all cells and equals width and height."""
-        return self._cells[0].size
+        return self._cell_size
 
     @property
     def length(self) -> float:
@@ -43,28 +62,33 @@ class Section:
     @property
     def max_cell_number(self) -> int:
         """The number of the last cell in this road section."""
-        return len(self._cells) - 1
+        return self._number_of_cells - 1
 
     def get_cell(self, number: int) -> Cell:
         """Returns the cell with position `number` mod `self.max_cell_number`+1 in `self.cells`."""
-        if number > self.max_cell_number:
-            number = number % (self.max_cell_number + 1)
+        if number >= self._number_of_cells:
+            number %= self._number_of_cells
         return self._cells[number]
 
 
 class Cell:
     """A line item to use as a discretization of an instance of `Section`."""
 
-    def __init__(self, number: int, size: float):
+    def __init__(self, number: int, size: float, occupancy: Optional[bytearray] = None):
         """
 
         Args:
             number (int): The number of positioning this cell.
             size (float): The size of in meters. It equals width and height.
+            occupancy (Optional[bytearray]): The occupancy buffer of the section, which holds
+                the state of this cell at index `number`. Defaults to a buffer of its own.
         """
         self._number = number
         self._size = size
-        self._empty = True  # type: bool
+        self._position = size * number
+        if occupancy is None:
+            occupancy = bytearray(number + 1)
+        self._occupancy = occupancy
 
     @property
     def size(self) -> float:
@@ -79,16 +103,16 @@ class Cell:
     @property
     def position(self) -> float:
         """The position of this line item."""
-        return self._size * self._number
+        return self._position
 
     def is_empty(self) -> bool:
         """Returns true if this cell is free."""
-        return self._empty
+        return not self._occupancy[self._number]
 
     def make_empty(self) -> None:
         """Makes the cell free."""
-        self._empty = True
+        self._occupancy[self._number] = 0
 
     def make_occupied(self) -> None:
         """Places something on this cell."""
-        self._empty = False
+        self._occupancy[self._number] = 1
@@ -1,4 +1,5 @@
 """Module with `CellSprite` class as visualization of `Section` in pygame."""
+import numpy as np
 import pygame
 from .section import Section
 from model_and_simulate.utilities.coordinate_mapper import CoordinateMapper2D
@@ -48,6 +49,7 @@ class SectionSprite(pygame.sprite.Sprite):
         )
         self._cell_surface.fill(self._filled_color)
         self._offset = cell_offset
+        self._cell_offsets = mapper.scale_sizes_x(section.cell_positions) + cell_offset
         self._one_time_drawing = one_time_drawing
         if one_time_drawing:
             self._draw_cells()
@@ -64,10 +66,8 @@ class SectionSprite(pygame.sprite.Sprite):
             Color.BROWN.value,
             (0, self._rect.height - self._bottom_offset, self._rect.width, self._bottom_offset),
         )
-        for cell in self._section.cells:
-            if not cell.is_empty():
-                offset = self.mapper.scale_size_x(cell.position) + self._offset, 0
-                self._image.blit(self._cell_surface, offset)
+        offsets = self._cell_offsets[np.flatnonzero(self._section.occupancy)].tolist()
+        self._image.blits([(self._cell_surface, (x, 0)) for x in offsets], doreturn=False)
 
     @property
     def rect(self) -> pygame.Rect:
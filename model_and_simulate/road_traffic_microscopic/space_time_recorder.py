@@ -0,0 +1,251 @@
+"""Module with `SpaceTimeRecorder` to store and replay the history of a road."""
+from __future__ import annotations
+import json
+from typing import Iterator, Optional
+import numpy as np
+from matplotlib import image
+
+from .traffic_simulation import TrafficSimulation
+
+
+class SpaceTimeRecorder:
+    """Records the occupancy and optionally the velocity of every cell per step.
+    Occupancy is bit-packed to one bit per cell and velocities take one byte per cell.
+    The steps are kept in a ring buffer in memory or appended to files on disk."""
+
+    empty_velocity: int = 255  # velocity value of free cells
+
+    def __init__(
+        self,
+        number_of_cells: int,
+        capacity: int = 10000,
+        record_velocities: bool = False,
+        filename: Optional[str] = None,
+    ):
+        """
+        Args:
+            number_of_cells (int): The number of cells of the recorded road.
+            capacity (int): The number of most recent steps kept in memory. It is ignored if
+                `filename` is set. Defaults to 10000.
+            record_velocities (bool): Store the velocity of every cell too. Defaults to False.
+            filename (Optional[str]): Base name of the files to append all steps to. The files
+                are `filename`.occupancy, `filename`.velocities and `filename`.json.
+                Defaults to None, which keeps steps in memory.
+        """
+        self._number_of_cells = number_of_cells
+        self._row_size = (number_of_cells + 7) // 8
+        self._record_velocities = record_velocities
+        self._filename = filename
+        self._number_of_steps = 0
+        if filename is None:
+            self._capacity = capacity
+            self._occupancy = np.zeros((capacity, self._row_size), dtype=np.uint8)
+            self._velocities = (
+                np.zeros((capacity, number_of_cells), dtype=np.uint8)
+                if record_velocities
+                else None
+            )
+        else:
+            self._capacity = None
+            self._occupancy_file = open(f"{filename}.occupancy", "wb")
+            self._velocities_file = (
+                open(f"{filename}.velocities", "wb") if record_velocities else None
+            )
+            self._occupancy = None  # memory maps are created on demand
+            self._velocities = None
+            self._write_metadata()
+
+    @classmethod
+    def load(cls, filename: str) -> SpaceTimeRecorder:
+        """Opens the files of a finished recording for read-only replay."""
+        with open(f"{filename}.json") as json_file:
+            metadata = json.load(json_file)
+        recorder = cls.__new__(cls)
+        recorder._number_of_cells = metadata["number_of_cells"]
+        recorder._row_size = (recorder._number_of_cells + 7) // 8
+        recorder._record_velocities = metadata["record_velocities"]
+        recorder._filename = filename
+        recorder._number_of_steps = metadata["number_of_steps"]
+        recorder._capacity = None
+        recorder._occupancy_file = None
+        recorder._velocities_file = None
+        recorder._occupancy = None
+        recorder._velocities = None
+        return recorder
+
+    @property
+    def number_of_cells(self) -> int:
+        """The number of cells of the recorded road."""
+        return self._number_of_cells
+
+    @property
+    def number_of_steps(self) -> int:
+        """The total number of recorded steps."""
+        return self._number_of_steps
+
+    @property
+    def first_step(self) -> int:
+        """The oldest step which is still available."""
+        if self._capacity is None:
+            return 0
+        return max(self._number_of_steps - self._capacity, 0)
+
+    def record_simulation(self, simulation: TrafficSimulation) -> None:
+        """Records the current step of `simulation`. Use it as on step listener."""
+        velocities = (
+            simulation.get_cell_velocities(SpaceTimeRecorder.empty_velocity)
+            if self._record_velocities
+            else None
+        )
+        self.record(simulation.section.occupancy, velocities)
+
+    def record(self, occupancy: np.ndarray, velocities: Optional[np.ndarray] = None) -> None:
+        """Records one step.
+
+        Args:
+            occupancy (np.ndarray): Boolean array which is True for occupied cells.
+            velocities (Optional[np.ndarray]): Velocity of every cell. Only needed if velocities
+                are recorded.
+        """
+        packed = np.packbits(occupancy)
+        if self._capacity is None:
+            self._occupancy_file.write(packed.tobytes())
+            if self._record_velocities:
+                self._velocities_file.write(np.asarray(velocities, dtype=np.uint8).tobytes())
+        else:
+            row = self._number_of_steps % self._capacity
+            self._occupancy[row] = packed
+            if self._record_velocities:
+                self._velocities[row] = velocities
+        self._number_of_steps += 1
+
+    def get_occupancy(self, step: int) -> np.ndarray:
+        """The boolean occupancy of all cells at `step`."""
+        row = self._rows(step, step + 1)[0]
+        return np.unpackbits(row, count=self._number_of_cells).view(np.bool_)
+
+    def get_velocities(self, step: int) -> np.ndarray:
+        """The velocity of every cell at `step`. Free cells have `empty_velocity`."""
+        return np.asarray(self._rows(step, step + 1, velocities=True)[0])
+
+    def to_numpy(self, start: Optional[int] = None, stop: Optional[int] = None) -> np.ndarray:
+        """The occupancy of the steps in [`start`, `stop`) as boolean array steps x cells."""
+        start, stop = self._check_range(start, stop)
+        rows = self._rows(start, stop)
+        return np.unpackbits(rows, axis=1, count=self._number_of_cells).view(np.bool_)
+
+    def velocities_to_numpy(
+        self, start: Optional[int] = None, stop: Optional[int] = None
+    ) -> np.ndarray:
+        """The velocities of the steps in [`start`, `stop`) as uint8 array steps x cells."""
+        start, stop = self._check_range(start, stop)
+        return np.array(self._rows(start, stop, velocities=True))
+
+    def save_numpy(
+        self, filename: str, start: Optional[int] = None, stop: Optional[int] = None
+    ) -> None:
+        """Saves occupancy and velocities of the steps in [`start`, `stop`) as npz file."""
+        arrays = {"occupancy": self.to_numpy(start, stop)}
+        if self._record_velocities:
+            arrays["velocities"] = self.velocities_to_numpy(start, stop)
+        np.savez_compressed(filename, **arrays)
+
+    def save_png(
+        self,
+        filename: str,
+        start: Optional[int] = None,
+        stop: Optional[int] = None,
+        velocities: bool = False,
+    ) -> None:
+        """Saves the space-time diagram of the steps in [`start`, `stop`) as png image.
+        Each row is one step. Cells are colored by occupancy or by velocity."""
+        if velocities:
+            data = np.ma.masked_equal(
+                self.velocities_to_numpy(start, stop), SpaceTimeRecorder.empty_velocity
+            )
+            image.imsave(filename, data, cmap="viridis", vmin=0)
+        else:
+            image.imsave(filename, self.to_numpy(start, stop), cmap="gray_r")
+
+    def replay(
+        self, start: Optional[int] = None, stop: Optional[int] = None
+    ) -> Iterator[np.ndarray]:
+        """Yields the occupancy of every step in [`start`, `stop`)."""
+        start, stop = self._check_range(start, stop)
+        for step in range(start, stop):
+            yield self.get_occupancy(step)
+
+    def flush(self) -> None:
+        """Writes buffered steps and the metadata to disk."""
+        if self._occupancy_file is not None:
+            self._occupancy_file.flush()
+            if self._velocities_file is not None:
+                self._velocities_file.flush()
+            self._write_metadata()
+
+    def close(self) -> None:
+        """Flushes and closes the files of a recording on disk."""
+        if self._filename is not None and self._occupancy_file is not None:
+            self.flush()
+            self._occupancy_file.close()
+            self._occupancy_file = None
+            if self._velocities_file is not None:
+                self._velocities_file.close()
+                self._velocities_file = None
+
+    def __enter__(self) -> SpaceTimeRecorder:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _write_metadata(self) -> None:
+        metadata = {
+            "number_of_cells": self._number_of_cells,
+            "record_velocities": self._record_velocities,
+            "number_of_steps": self._number_of_steps,
+        }
+        with open(f"{self._filename}.json", "w") as json_file:
+            json.dump(metadata, json_file)
+
+    def _check_range(self, start: Optional[int], stop: Optional[int]) -> tuple[int, int]:
+        start = self.first_step if start is None else start
+        stop = self._number_of_steps if stop is None else stop
+        if not self.first_step <= start <= stop <= self._number_of_steps:
+            raise IndexError(
+                f"Steps [{start}, {stop}) are not in [{self.first_step}, {self._number_of_steps})."
+            )
+        return start, stop
+
+    def _rows(self, start: int, stop: int, velocities: bool = False) -> np.ndarray:
+        """The stored rows of the steps in [`start`, `stop`)."""
+        self._check_range(start, stop)
+        if velocities and not self._record_velocities:
+            raise ValueError("Velocities are not recorded.")
+        if self._capacity is None:
+            return self._mapped_rows(velocities)[start:stop]
+        data = self._velocities if velocities else self._occupancy
+        rows = np.arange(start, stop) % self._capacity
+        return data[rows]
+
+    def _mapped_rows(self, velocities: bool) -> np.ndarray:
+        """Memory maps the recorded files. The maps are renewed when steps were added."""
+        mapped = self._velocities if velocities else self._occupancy
+        if mapped is None or len(mapped) < self._number_of_steps:
+            suffix, row_size = (
+                ("velocities", self._number_of_cells) if velocities else ("occupancy", self._row_size)
+            )
+            if self._number_of_steps == 0:  # an empty file cannot be memory mapped
+                return np.zeros((0, row_size), dtype=np.uint8)
+            self.flush()
+            mapped = np.memmap(
+                f"{self._filename}.{suffix}",
+                dtype=np.uint8,
+                mode="r",
+                shape=(self._number_of_steps, row_size),
+            )
+            if velocities:
+                self._velocities = mapped
+            else:
+                self._occupancy = mapped
+        return mapped
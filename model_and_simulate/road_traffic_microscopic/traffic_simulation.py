@@ -1,10 +1,10 @@
 """Module with microscopic traffic simulation class and additional features."""
 from dataclasses import dataclass
-from typing import Tuple
-import random
+from typing import Optional, Tuple
 import math
+import numpy as np
 from .section import Section
-from .vehicle import Vehicle
+from .vehicle import CAR, TRUCK, VehicleClass, Vehicles
 from model_and_simulate.utilities.simulation import Simulation, SimulationParameters
 
 
@@ -13,17 +13,39 @@ class TrafficSimulation(Simulation):
 
     density_max: float = 1 / 7.5  # vehicles per meter
     velocity_max: int = 5  # maximum number of cells to move
+    vehicle_classes: tuple[VehicleClass, VehicleClass] = CAR, TRUCK
 
     def __init__(
-        self, length: float, occupation: float, dawdling_factor: float, all_vehicles_at_once: bool
+        self,
+        length: float,
+        occupation: float,
+        dawdling_factor: float,
+        all_vehicles_at_once: bool,
+        truck_share: float = 0.0,
+        seed: Optional[int] = None,
     ):
+        """
+        Args:
+            length (float): The total length of the road section.
+            occupation (float): The fraction of cells to occupy with vehicles.
+            dawdling_factor (float): The probability in [0, 1] for dawdling.
+            all_vehicles_at_once (bool): Place all vehicles initially or one per step.
+            truck_share (float): The fraction of trucks among all vehicles. Defaults to 0.
+            seed (Optional[int]): Seed for the random number generator. Defaults to None.
+        """
+        super().__init__(seed)
         self._section = Section(
             length, TrafficSimulation.velocity_max, TrafficSimulation.density_max
         )
+        self._number_of_cells = self._section.max_cell_number + 1
         self._dawdling_factor = dawdling_factor
-        self._vehicles, self._number_of_vehicles = self._init_vehicles(
-            all_vehicles_at_once, occupation
-        )
+        self._classes = self._draw_vehicle_classes(occupation, truck_share)
+        self._vehicles = Vehicles(len(self._classes))
+        if all_vehicles_at_once:
+            self._place_all_vehicles()
+        else:
+            self._place_first_two_vehicles()
+        self._update_occupancy()
         self._all_vehicles_set = self._check_if_all_vehicles_set()
 
     @property
@@ -36,12 +58,12 @@ class TrafficSimulation(Simulation):
     @property
     def number_of_vehicles(self) -> int:
         """The current number of vehicles placed on `self._section`."""
-        return self._number_of_vehicles
+        return len(self._vehicles)
 
     @property
-    def vehicles(self) -> list[Vehicle]:
-        """The currently set vehicles."""
-        return self._vehicles[: self.number_of_vehicles]
+    def vehicles(self) -> Vehicles:
+        """The currently set vehicles in road order."""
+        return self._vehicles
 
     @property
     def section(self) -> Section:
@@ -49,74 +71,114 @@ class TrafficSimulation(Simulation):
         return self._section
 
     def _check_if_all_vehicles_set(self):
-        return self._number_of_vehicles == len(self._vehicles)
-
-    def _init_vehicles(
-        self, all_vehicles_at_once: bool, occupation: float
-    ) -> tuple[list[Vehicle], int]:
-        number_of_vehicles = int(math.floor(occupation * self._section.max_cell_number))
-        if all_vehicles_at_once:
-            vehicles = self._place_all_vehicles(number_of_vehicles)
-        else:
-            vehicles = [
-                Vehicle(i, self.velocity_max, self.velocity_max, self._dawdling_factor)
-                for i in range(number_of_vehicles)
-            ]
-            self._place_first_two_vehicles(vehicles[0], vehicles[1])
-            number_of_vehicles = 2
-        return vehicles, number_of_vehicles
-
-    def _place_first_two_vehicles(self, left_vehicle: Vehicle, right_vehicle: Vehicle) -> None:
-        left_cell = self._section.get_cell(0)
-        right_cell = self._section.get_cell(round(self._section.max_cell_number / 2))
-        left_vehicle.place_into_cell(left_cell)
-        right_vehicle.place_into_cell(right_cell)
-        left_vehicle.successor = right_vehicle
-        right_vehicle.successor = left_vehicle
-
-    def _place_all_vehicles(self, number_of_vehicles: int) -> list[Vehicle]:
-        vehicles = []
-        cell_sample = random.sample(self._section.cells, number_of_vehicles)
-        cell_sample = sorted(cell_sample, key=lambda elem: elem.number, reverse=True)
-        successor = None
-        for cell, ident in zip(cell_sample, range(number_of_vehicles - 1, -1, -1)):
-            init_velocity = random.randint(0, self.velocity_max)
-            vehicle = Vehicle(ident, init_velocity, self.velocity_max, self._dawdling_factor)
-            vehicle.place_into_cell(cell)
-            vehicle.successor = successor
-            successor = vehicle
-            vehicles.insert(0, vehicle)
-        # set the car on the left as successor of the car on the right
-        rightmost_vehicle = vehicles[-1]
-        rightmost_vehicle.successor = vehicles[0]
-        return vehicles
+        return len(self._vehicles) == self._vehicles.capacity
+
+    def _draw_vehicle_classes(self, occupation: float, truck_share: float) -> np.ndarray:
+        """Draws the class index of every vehicle. The vehicles occupy at most the fraction
+        `occupation` of the cells, but there are at least two vehicles."""
+        shares = np.asarray([1 - truck_share, truck_share])
+        lengths = np.asarray([vehicle_class.length for vehicle_class in self.vehicle_classes])
+        number_of_cells_to_occupy = int(math.floor(occupation * self._section.max_cell_number))
+        classes = self.rng.choice(
+            len(shares), size=number_of_cells_to_occupy // lengths.min(), p=shares
+        )
+        cells_occupied = np.cumsum(lengths[classes])
+        number_of_vehicles = np.searchsorted(cells_occupied, number_of_cells_to_occupy, "right")
+        return classes[: max(number_of_vehicles, 2)]
+
+    def _insert_vehicle(self, index: int, position: int, velocity: int) -> None:
+        identity = len(self._vehicles)
+        vehicle_class = self.vehicle_classes[self._classes[identity]]
+        dawdling_factor = vehicle_class.dawdling_factor
+        if dawdling_factor is None:
+            dawdling_factor = self._dawdling_factor
+        self._vehicles.insert(index, identity, position, velocity, vehicle_class, dawdling_factor)
+
+    def _place_first_two_vehicles(self) -> None:
+        left_class, right_class = (self.vehicle_classes[c] for c in self._classes[:2])
+        right_rear = round(self._section.max_cell_number / 2)
+        self._insert_vehicle(0, left_class.length - 1, left_class.velocity_max)
+        self._insert_vehicle(1, right_rear + right_class.length - 1, right_class.velocity_max)
+
+    def _place_all_vehicles(self) -> None:
+        """Places all vehicles uniformly at random without overlaps.
+        Every vehicle is a token, and tokens and free cells are arranged at random."""
+        lengths = np.asarray([self.vehicle_classes[c].length for c in self._classes])
+        number_of_vehicles = len(lengths)
+        number_of_free_cells = self._number_of_cells - int(lengths.sum())
+        slots = np.sort(
+            self.rng.choice(
+                number_of_free_cells + number_of_vehicles, size=number_of_vehicles, replace=False
+            )
+        )
+        cells_before = np.cumsum(lengths) - lengths
+        fronts = slots - np.arange(number_of_vehicles) + cells_before + lengths - 1
+        velocities_max = [self.vehicle_classes[c].velocity_max for c in self._classes]
+        init_velocities = self.rng.integers(0, velocities_max, endpoint=True)
+        for index, (front, velocity) in enumerate(zip(fronts.tolist(), init_velocities.tolist())):
+            self._insert_vehicle(index, front, velocity)
+
+    def _update_occupancy(self) -> None:
+        occupancy = self._section.occupancy
+        positions = self._vehicles.positions
+        lengths = self._vehicles.lengths
+        occupancy[:] = False
+        occupancy[positions] = True
+        for cell in range(1, int(lengths.max())):
+            occupancy[(positions[lengths > cell] - cell) % self._number_of_cells] = True
+
+    def get_cell_velocities(self, empty_value: int = 255) -> np.ndarray:
+        """The velocity of the vehicle on every cell as uint8 array, `empty_value` for free cells."""
+        cell_velocities = np.full(self._number_of_cells, empty_value, dtype=np.uint8)
+        positions = self._vehicles.positions
+        velocities = self._vehicles.velocities
+        lengths = self._vehicles.lengths
+        cell_velocities[positions] = velocities
+        for cell in range(1, int(lengths.max())):
+            covers = lengths > cell
+            cell_velocities[(positions[covers] - cell) % self._number_of_cells] = velocities[covers]
+        return cell_velocities
 
     def do_step(self) -> None:
         """Place another vehicle if density is not reached and update all vehicles."""
+        timers = self.timers
         if not self._all_vehicles_set:
-            self._place_one_vehicle()
-            self._all_vehicles_set = self._check_if_all_vehicles_set()
-        for vehicle in self.vehicles:
-            vehicle.update_velocity(self._section.max_cell_number)
-        for vehicle in self.vehicles:
-            vehicle.move(self._section)
+            with timers.phase("placement"):
+                self._place_one_vehicle()
+                self._all_vehicles_set = self._check_if_all_vehicles_set()
+        with timers.phase("velocity_update"):
+            self._update_velocities()
+        with timers.phase("move"):
+            positions = self._vehicles.positions
+            positions += self._vehicles.velocities
+            positions %= self._number_of_cells
+            self._update_occupancy()
+        self._on_step_done()
+
+    def _update_velocities(self) -> None:
+        """Perform the rules of the NaSch-Model for all vehicles at once:
+        accelerate, brake to the distance to the successor, and dawdle."""
+        vehicles = self._vehicles
+        velocities = vehicles.velocities
+        distances = vehicles.distances_to_successors(self._number_of_cells)
+        np.minimum(velocities + 1, vehicles.velocities_max, out=velocities)
+        np.minimum(velocities, distances, out=velocities)
+        dawdling = self.rng.random(len(vehicles)) < vehicles.dawdling_factors
+        velocities -= dawdling & (velocities > 0)
 
     def _place_one_vehicle(self) -> None:
-        max_distance = 0
-        vehicle_predecessor = None
-        for vehicle in self.vehicles:
-            distance = vehicle.distance_to_successor(self._section.max_cell_number)
-            if distance > max_distance:
-                max_distance = distance
-                vehicle_predecessor = vehicle
-        distance_to_place = round(max_distance / 2)
-        if distance_to_place > 0:
-            vehicle_to_place = self._vehicles[self._number_of_vehicles]
-            self._number_of_vehicles += 1
-            cell = self._section.get_cell(vehicle_predecessor.position + distance_to_place)
-            vehicle_to_place.place_into_cell(cell)
-            vehicle_to_place.successor = vehicle_predecessor.successor
-            vehicle_predecessor.successor = vehicle_to_place
+        """Places the next vehicle in the middle of the largest gap if it fits."""
+        vehicle_class = self.vehicle_classes[self._classes[len(self._vehicles)]]
+        length = vehicle_class.length
+        distances = self._vehicles.distances_to_successors(self._number_of_cells)
+        index = int(np.argmax(distances))
+        max_distance = int(distances[index])
+        distance_to_place = length - 1 + round((max_distance - length + 1) / 2)
+        if distance_to_place >= length:
+            position = (int(self._vehicles.positions[index]) + distance_to_place) % (
+                self._number_of_cells
+            )
+            self._insert_vehicle(index + 1, position, vehicle_class.velocity_max)
 
 
 @dataclass
@@ -127,3 +189,5 @@ class TrafficParameters(SimulationParameters):
     occupation: float = 0.2  # 0.2 default 0.99 max 0.10 min
     dawdling_factor: float = 0.2  # 0.2 default 0.99 max and 0.00 min
     all_vehicles_at_once: bool = True  # True default
+    truck_share: float = 0.0  # 0.0 default 0.99 max 0.00 min
+    seed: Optional[int] = None
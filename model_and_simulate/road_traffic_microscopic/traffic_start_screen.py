@@ -52,6 +52,12 @@ class TrafficStartScreen(SimulationStartScreen):
             text_color=Color.GREEN,
         )
         buttons_text_input[button_length] = "length"
+        button_truck_share = TextButton(
+            (col_w * 2, row_h),
+            (5 * col_w, 6 * row_h),
+            f"{round(simulation_parameters.truck_share * 100):02d}",
+        )
+        buttons_text_input[button_truck_share] = "truck_share"
 
         def on_start_input_listener(text_button: TextButton):
             """The callback function for start input event."""
@@ -67,7 +73,7 @@ class TrafficStartScreen(SimulationStartScreen):
                 if simulation_par == "length":
                     text_button.text = str(old_value)
                 else:
-                    text_button.text = str(old_value*100)[:2]
+                    text_button.text = f"{round(old_value * 100):02d}"
             else:
                 user_value = int(text_button.text)
                 if simulation_par == "length":
@@ -110,5 +116,7 @@ class TrafficStartScreen(SimulationStartScreen):
         menu_texts += [
             ("increment density one by one", (0, 3.5 * row_h, 25, Color.RED)),
             (f"{300} <= length <= {3500}", (4 * col_w, y * row_h + row_h / 2, 20, Color.HGREEN)),
+            ("truck share", (3.4 * col_w, 6.5 * row_h)),
+            (f">= {0:0>2d} %", (7 * col_w, 6.5 * row_h)),
         ]
         return menu_texts
@@ -1,109 +1,200 @@
-"""Module with `Vehicle` class."""
+"""Module with vehicle classes and the `Vehicles` container in struct-of-arrays layout."""
 from __future__ import annotations
+from dataclasses import dataclass
 from typing import Optional
-from numpy.random import default_rng
-from .section import Cell, Section
+import numpy as np
 
-SEED = 1234
-rng = default_rng(seed=SEED)  # keyword seed=SEED
 
+@dataclass(frozen=True)
+class VehicleClass:
+    """Characteristics shared by all vehicles of one kind."""
 
-class Vehicle:
-    """This describes a stochastic cellular automata."""
+    name: str
+    velocity_max: int  # maximum number of cells to move
+    length: int  # number of cells
+    dawdling_factor: Optional[float] = None  # None uses the dawdling factor of the simulation
+
+
+CAR = VehicleClass("car", velocity_max=5, length=1)
+TRUCK = VehicleClass("truck", velocity_max=3, length=2)
+
+
+class Vehicles:
+    """The stochastic cellular automata of a road as parallel arrays (struct-of-arrays).
+    Vehicles are ordered along the circular road: the successor of vehicle `i` is vehicle
+    `i + 1` and the successor of the last vehicle is the first one."""
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity (int): The maximum number of vehicles.
+        """
+        self._count = 0
+        self._identities = np.zeros(capacity, dtype=np.int32)
+        self._positions = np.zeros(capacity, dtype=np.int32)  # cell of the vehicle's front
+        self._velocities = np.zeros(capacity, dtype=np.int32)
+        self._velocities_max = np.zeros(capacity, dtype=np.uint8)
+        self._lengths = np.zeros(capacity, dtype=np.uint8)
+        self._dawdling_factors = np.zeros(capacity, dtype=np.float32)
+        self._arrays = (
+            self._identities,
+            self._positions,
+            self._velocities,
+            self._velocities_max,
+            self._lengths,
+            self._dawdling_factors,
+        )
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> Vehicle:
+        if not -self._count <= index < self._count:
+            raise IndexError("vehicle index out of range")
+        return Vehicle(self, index % self._count)
+
+    @property
+    def capacity(self) -> int:
+        """The maximum number of vehicles."""
+        return len(self._identities)
+
+    @property
+    def nbytes_per_vehicle(self) -> int:
+        """The number of bytes which are stored per vehicle."""
+        return sum(array.itemsize for array in self._arrays)
+
+    @property
+    def identities(self) -> np.ndarray:
+        """The non changeable identification numbers."""
+        return self._identities[: self._count]
+
+    @property
+    def positions(self) -> np.ndarray:
+        """The positions of the vehicles' fronts in units of cell lengths."""
+        return self._positions[: self._count]
+
+    @property
+    def velocities(self) -> np.ndarray:
+        """The current velocities."""
+        return self._velocities[: self._count]
+
+    @property
+    def velocities_max(self) -> np.ndarray:
+        """The maximum allowed velocities."""
+        return self._velocities_max[: self._count]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """The lengths in number of cells."""
+        return self._lengths[: self._count]
 
-    def __init__(
+    @property
+    def dawdling_factors(self) -> np.ndarray:
+        """The probabilities in [0, 1] for dawdling."""
+        return self._dawdling_factors[: self._count]
+
+    def insert(
         self,
+        index: int,
         identity: int,
+        position: int,
         velocity: int,
-        velocity_max: int,
+        vehicle_class: VehicleClass,
         dawdling_factor: float,
-    ):
-        """
+    ) -> None:
+        """Inserts a vehicle at `index`, which moves the following vehicles one index up.
 
         Args:
+            index (int): The index of the new vehicle in road order.
             identity (int): Non changeable identification number.
+            position (int): The cell of the vehicle's front.
             velocity (int): The initial velocity along the x-Axis.
-            velocity_max (int): The maximum allowed velocity of this vehicle.
+            vehicle_class (VehicleClass): The class with maximum velocity and length.
             dawdling_factor (float): The probability in [0, 1] for dawdling.
         """
-        self._identity = identity
-        self._velocity = velocity
-        self._velocity_max = velocity_max
-        self._cell = None  # type: Optional[Cell]
-        self._successor = None  # type: Optional[Vehicle]
-        self._dawdling_factor = dawdling_factor
+        if self._count == self.capacity:
+            raise ValueError("No capacity left to insert another vehicle.")
+        values = (
+            identity,
+            position,
+            velocity,
+            vehicle_class.velocity_max,
+            vehicle_class.length,
+            dawdling_factor,
+        )
+        for array, value in zip(self._arrays, values):
+            array[index + 1 : self._count + 1] = array[index : self._count]
+            array[index] = value
+        self._count += 1
+
+    def append(
+        self,
+        identity: int,
+        position: int,
+        velocity: int,
+        vehicle_class: VehicleClass,
+        dawdling_factor: float,
+    ) -> None:
+        """Adds a vehicle after the last vehicle in road order."""
+        self.insert(self._count, identity, position, velocity, vehicle_class, dawdling_factor)
+
+    def distances_to_successors(self, number_of_cells: int) -> np.ndarray:
+        """The number of free cells in front of each vehicle on a circular road."""
+        positions = self.positions
+        rears = positions - self.lengths + 1
+        return (np.roll(rears, -1) - positions - 1) % number_of_cells
+
+
+class Vehicle:
+    """A view on one vehicle in `Vehicles`. It stays valid until vehicles get inserted."""
+
+    __slots__ = ("_vehicles", "_index")
+
+    def __init__(self, vehicles: Vehicles, index: int):
+        """
+        Args:
+            vehicles (Vehicles): The container of the vehicle's data.
+            index (int): The index of the vehicle in road order.
+        """
+        self._vehicles = vehicles
+        self._index = index
 
     @property
-    def successor(self) -> Optional[Vehicle]:
+    def successor(self) -> Vehicle:
         """The vehicle on the right side of this vehicle."""
-        return self._successor
-
-    @successor.setter
-    def successor(self, successor: Vehicle) -> None:
-        """Setter of successor."""
-        self._successor = successor
+        return Vehicle(self._vehicles, (self._index + 1) % len(self._vehicles))
 
     @property
     def identity(self) -> int:
         """The identification number."""
-        return self._identity
+        return int(self._vehicles.identities[self._index])
 
     @property
     def position(self) -> int:
-        """The position in units of cell lengths."""
-        return self._cell.number
+        """The position of the front in units of cell lengths."""
+        return int(self._vehicles.positions[self._index])
 
     @property
     def velocity(self) -> int:
         """The current velocity."""
-        return self._velocity
+        return int(self._vehicles.velocities[self._index])
 
     @velocity.setter
     def velocity(self, vel: int) -> None:
         """Setter for velocity."""
-        self._velocity = vel
-
-    def distance_to_successor(self, right_border: int) -> int:
-        """Get the distance to the cell of the vehicle on the right side."""
-        distance = (
-            self._velocity_max
-            if self.successor is None
-            else self.successor.position - self.position - 1
-        )
-        if distance < 0:
-            distance = right_border + distance
-        return distance
-
-    def _accelerate(self) -> None:
-        self.velocity = min(self.velocity + 1, self._velocity_max)
-
-    def _brake(self, distance: int) -> None:
-        if self.velocity > distance:
-            self.velocity = distance
-
-    def _is_dawdling(self) -> bool:
-        return rng.binomial(1, self._dawdling_factor) == 1
-
-    def _dawdle(self) -> None:
-        self.velocity = max(self.velocity - 1, 0)
-
-    def update_velocity(self, right_border: int) -> None:
-        """Perform rules of NaSch-Model to calculate velocity.
-        The right border is used to check for the distance."""
-        self._accelerate()
-        distance = self.distance_to_successor(right_border)
-        self._brake(distance)
-        if self._is_dawdling():
-            self._dawdle()
-
-    def move(self, section: Section) -> None:
-        """Empty the current cell and move to the next cell on `section`."""
-        if self.velocity > 0:
-            self._cell.make_empty()
-            self._cell = section.get_cell(self.position + self.velocity)
-            self._cell.make_occupied()
-
-    def place_into_cell(self, cell: Cell):
-        """Puts this vehicle into `cell`."""
-        self._cell = cell
-        cell.make_occupied()
+        self._vehicles.velocities[self._index] = vel
+
+    @property
+    def velocity_max(self) -> int:
+        """The maximum allowed velocity of this vehicle."""
+        return int(self._vehicles.velocities_max[self._index])
+
+    @property
+    def length(self) -> int:
+        """The length in number of cells."""
+        return int(self._vehicles.lengths[self._index])
+
+    @property
+    def dawdling_factor(self) -> float:
+        """The probability in [0, 1] for dawdling."""
+        return float(self._vehicles.dawdling_factors[self._index])
@@ -13,9 +13,11 @@ class CoordinateMapper2D:
         src_dim_y: Tuple[int, int],
         dst_dim_x: Tuple[int, int],
         dst_dim_y: Tuple[int, int],
+        dtype: np.dtype = np.float64,
     ) -> None:
         self._src_dim = src_dim_x, src_dim_y
         self._dst_dim = dst_dim_x, dst_dim_y
+        self._dtype = dtype  # of the scale matrix, so float32 coordinates stay float32
         self._scale_matrix = self._calc_scale_matrix()
 
     @property
@@ -49,6 +51,10 @@ class CoordinateMapper2D:
         length_sim = np.asarray([size_sim, 0])
         return self.map_coordinates(length_sim)[0]
 
+    def scale_sizes_x(self, sizes_sim: np.ndarray) -> np.ndarray:
+        """Scales all given sizes to the visualization."""
+        return np.asarray(sizes_sim) * self._scale_matrix[0, 0]
+
     def _calc_scale_matrix(self) -> np.ndarray:
         src_dim_x, src_dim_y = self._src_dim
         dst_dim_x, dst_dim_y = self._dst_dim
@@ -58,4 +64,4 @@ class CoordinateMapper2D:
         dst_range_y = abs(dst_dim_y[0] - dst_dim_y[1])
         factor_width = dst_range_x / src_range_x
         factor_height = dst_range_y / src_range_y
-        return np.asarray([[factor_width, 0], [0, factor_height]])
+        return np.asarray([[factor_width, 0], [0, factor_height]], dtype=self._dtype)
@@ -0,0 +1,138 @@
+"""Module with lightweight phase timers to profile simulation steps."""
+from __future__ import annotations
+import json
+import math
+from contextlib import nullcontext
+from time import perf_counter
+from typing import ContextManager
+
+_disabled_phase = nullcontext()
+
+
+class PhaseStatistics:
+    """Aggregated durations of a single named phase."""
+
+    num_buckets: int = 24  # bucket b holds durations in [2**(b-1), 2**b) microseconds
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+        self.last = 0.0
+        self.histogram = [0] * PhaseStatistics.num_buckets
+
+    @property
+    def mean(self) -> float:
+        """The mean duration in seconds."""
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def add(self, duration: float) -> None:
+        """Adds one measured duration in seconds."""
+        self.count += 1
+        self.total += duration
+        self.last = duration
+        if duration < self.minimum:
+            self.minimum = duration
+        if duration > self.maximum:
+            self.maximum = duration
+        bucket = min(int(duration * 1e6).bit_length(), PhaseStatistics.num_buckets - 1)
+        self.histogram[bucket] += 1
+
+    def to_dict(self) -> dict:
+        """The statistics in milliseconds and the histogram as plain dict."""
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1e3,
+            "mean_ms": self.mean * 1e3,
+            "min_ms": self.minimum * 1e3 if self.count > 0 else 0.0,
+            "max_ms": self.maximum * 1e3,
+            "histogram_us_log2": self.histogram,
+        }
+
+
+class _Phase:
+    """Context manager that measures one execution of a phase."""
+
+    __slots__ = ("_statistics", "_start")
+
+    def __init__(self, statistics: PhaseStatistics) -> None:
+        self._statistics = statistics
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self._statistics.add(perf_counter() - self._start)
+
+
+class PhaseTimers:
+    """Named timers for the phases of a simulation step.
+    While disabled, `phase` returns a shared no-op context manager."""
+
+    def __init__(self, enabled: bool = False) -> None:
+        """
+        Args:
+            enabled (bool): Whether the phases get measured. Defaults to False.
+        """
+        self._enabled = enabled
+        self._phases = {}  # type: dict[str, _Phase]
+        self._statistics = {}  # type: dict[str, PhaseStatistics]
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the phases get measured."""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        """Setter for enabled."""
+        self._enabled = enabled
+
+    @property
+    def statistics(self) -> dict[str, PhaseStatistics]:
+        """The aggregated statistics per phase name in order of first use."""
+        return self._statistics
+
+    def phase(self, name: str) -> ContextManager:
+        """Gives a context manager that measures the enclosed code as phase `name`."""
+        if not self._enabled:
+            return _disabled_phase
+        timer = self._phases.get(name)
+        if timer is None:
+            self._statistics[name] = PhaseStatistics()
+            timer = self._phases[name] = _Phase(self._statistics[name])
+        return timer
+
+    def reset(self) -> None:
+        """Removes all measurements."""
+        self._phases.clear()
+        self._statistics.clear()
+
+    def to_dict(self) -> dict[str, dict]:
+        """All statistics as plain dict per phase name."""
+        return {name: statistics.to_dict() for name, statistics in self._statistics.items()}
+
+    def to_json(self, filename: str) -> None:
+        """Writes all statistics to the json file `filename`."""
+        with open(filename, "w") as json_file:
+            json.dump(self.to_dict(), json_file, indent=2)
+
+    def to_table(self) -> str:
+        """All statistics as text table with durations in milliseconds."""
+        lines = [f"{'phase':<16}{'count':>8}{'mean':>10}{'min':>10}{'max':>10}{'total':>12}"]
+        for name, statistics in self._statistics.items():
+            values = statistics.to_dict()
+            lines.append(
+                f"{name:<16}{values['count']:>8d}{values['mean_ms']:>10.3f}"
+                f"{values['min_ms']:>10.3f}{values['max_ms']:>10.3f}{values['total_ms']:>12.1f}"
+            )
+        return "\n".join(lines)
+
+    def hud_lines(self) -> list[str]:
+        """Short lines with the mean milliseconds per phase to show on screen."""
+        return [
+            f"{name}: {statistics.mean * 1e3:.2f} ms"
+            for name, statistics in list(self._statistics.items())  # may grow in a runner thread
+        ]
@@ -1,6 +1,8 @@
 """Contains utility classes and functions for handling pygame."""
+from __future__ import annotations
 from enum import Enum
 from os import path
+from typing import Optional
 
 import pygame as pg
 import pygame.display
@@ -44,6 +46,8 @@ sound_dir = path.join(path.dirname(__file__), "sound")
 sound_dir_music = path.join(sound_dir, "music")
 sound_dir_effects = path.join(sound_dir, "effects")
 
+_simple_pygame = None  # type: Optional[SimplePygame]
+
 
 def play_music_loop(sound: str) -> None:
     """Play a sound with key in `sound_loops`."""
@@ -54,6 +58,8 @@ def play_music_loop(sound: str) -> None:
 
 def quit_pygame() -> None:
     """End the pygame engine."""
+    global _simple_pygame
+    _simple_pygame = None
     pg.mixer.music.fadeout(500)
     pg.quit()
 
@@ -77,14 +83,36 @@ def check_for_reset(event: pg.event.Event) -> bool:
     return False
 
 
+def check_for_profiling(event: pg.event.Event) -> bool:
+    """Check if the user wants to switch the profiling of the simulation on or off."""
+    if event.type == pg.KEYDOWN:
+        if event.key == pg.K_p:
+            return True
+    return False
+
+
 def get_window_resolution() -> [int, int]:
     """Returns the current width and height of the pygame display."""
     return pygame.display.get_window_size()
 
 
+def get_simple_pygame(caption: str) -> SimplePygame:
+    """Returns the long-lived `SimplePygame` instance, which menus and simulations borrow.
+    The engine, display and sound effects are only initialized on the first call.
+    Later calls reset the instance with the new `caption`."""
+    global _simple_pygame
+    if _simple_pygame is None:
+        _simple_pygame = SimplePygame(caption)
+    else:
+        _simple_pygame.reset(caption)
+    return _simple_pygame
+
+
 class SimplePygame:
     """Performs basic pygame steps."""
 
+    default_frames_per_second: int = 30
+
     def __init__(self, caption: str, width: int = 800, height: int = 600) -> None:
         pg.init()
         pg.mixer.init()
@@ -94,12 +122,23 @@ class SimplePygame:
         self._clock = pg.time.Clock()
         self._all_sprites = pg.sprite.Group()
         self._font = pg.font.match_font(FONT_NAME)
+        self._fonts = {}  # type: dict[int, pg.font.Font]
         self._sound_effects = {
             key: pg.mixer.Sound(path.join(sound_dir_effects, value))
             for key, value in sound_effects.items()
         }
         self._all_texts = []
-        self._frames_per_second = 30
+        self._hud = []  # type: list[str]
+        self._frames_per_second = SimplePygame.default_frames_per_second
+
+    def reset(self, caption: str) -> None:
+        """Prepare this instance for the next menu or simulation without
+        reinitializing pygame. Removes all sprites and texts and restores the frame rate."""
+        pg.display.set_caption(caption)
+        self._all_sprites.empty()
+        self._all_texts.clear()
+        self._hud.clear()
+        self._frames_per_second = SimplePygame.default_frames_per_second
 
     @property
     def frames_per_second(self) -> int:
@@ -140,16 +179,35 @@ class SimplePygame:
         """All sprites to consider in every loop. Add sprites to this group."""
         return self._all_sprites
 
+    @property
+    def hud(self) -> list[str]:
+        """Lines of a head-up display, which is drawn in the upper right in every loop."""
+        return self._hud
+
     def loop(self, **update_kwargs) -> None:
         """Perform one loop of pygame. This updates and draws all sprites and texts."""
+        self.draw(**update_kwargs)
+        self.tick()
+
+    def draw(self, **update_kwargs) -> None:
+        """Update and draw all sprites, texts and the head-up display and flip the display."""
         self._screen.fill(Color.BLACK.value)
         self._all_sprites.update(**update_kwargs)
         self._all_sprites.draw(self._screen)
         for text_args in self._all_texts:
             self.draw_text(*text_args)
+        self._draw_hud()
         pg.display.flip()
+
+    def tick(self) -> None:
+        """Wait to keep the frames per second."""
         self._clock.tick(self.frames_per_second)
 
+    def _draw_hud(self, size: int = 16) -> None:
+        x = self._screen.get_width() - 12 * size
+        for n, line in enumerate(self._hud):
+            self.draw_text(line, (x, 5 + n * size), size, Color.HGREEN.value)
+
     def play_effect(self, effect: str) -> None:
         """Play a sound effect with key in `sound_effects`."""
         self._sound_effects[effect].play()
@@ -171,7 +229,9 @@ class SimplePygame:
             color (tuple[int, int, int]): RGB color values.
                 Defaults to white.
         """
-        font = pg.font.Font(self._font, size)
+        font = self._fonts.get(size)
+        if font is None:
+            font = self._fonts[size] = pg.font.Font(self._font, size)
         text_surface = font.render(text, True, color)
         text_rect = text_surface.get_rect()
         text_rect.topleft = pos
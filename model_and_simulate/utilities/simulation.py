@@ -2,13 +2,22 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Optional, Tuple
+import cProfile
+import pstats
+import threading
+from time import perf_counter
+import numpy as np
 import pygame
+from numpy.random import Generator, SeedSequence, default_rng
 from model_and_simulate.utilities.coordinate_mapper import CoordinateMapper2D
+from model_and_simulate.utilities.profiling import PhaseTimers
+from model_and_simulate.utilities.state_buffer import StateBuffer
 from model_and_simulate.utilities.pygame_simple import (
-    SimplePygame,
+    check_for_profiling,
     check_for_quit,
     check_for_reset,
+    get_simple_pygame,
     get_window_resolution,
 )
 
@@ -16,6 +25,77 @@ from model_and_simulate.utilities.pygame_simple import (
 class Simulation(ABC):
     """Abstract base class for doing a simulation on a 2D area."""
 
+    def __init__(self, seed: Optional[int] = None) -> None:
+        """
+        Args:
+            seed (Optional[int]): Seed for the random number generator of this simulation.
+                Defaults to None, which draws fresh entropy from the operating system.
+        """
+        self._seed_sequence = SeedSequence(seed)
+        self._rng = default_rng(self._seed_sequence)
+        self._timers = PhaseTimers()
+        self._on_step_listeners = []  # type: list[callable]
+        self._state_buffer = None  # type: Optional[StateBuffer]
+
+    @property
+    def rng(self) -> Generator:
+        """The random number generator owned by this simulation."""
+        return self._rng
+
+    def spawn_rngs(self, number: int) -> list[Generator]:
+        """Creates `number` independent random number generators, e.g. for worker processes.
+        Each call gives new streams, which do not overlap with `rng` or earlier streams."""
+        return [default_rng(child) for child in self._seed_sequence.spawn(number)]
+
+    @property
+    def timers(self) -> PhaseTimers:
+        """Timers for the phases of `do_step`. They are disabled by default."""
+        return self._timers
+
+    def profile_steps(self, num_steps: int) -> pstats.Stats:
+        """Performs `num_steps` steps with `cProfile` and returns the collected statistics."""
+        profiler = cProfile.Profile()
+        profiler.enable()
+        for _ in range(num_steps):
+            self.do_step()
+        profiler.disable()
+        return pstats.Stats(profiler)
+
+    def add_on_step_listener(self, listener: callable) -> None:
+        """Listener to call with this simulation at the end of every step."""
+        self._on_step_listeners.append(listener)
+
+    def clear_on_step_listeners(self) -> None:
+        """Removes all added on step listeners."""
+        self._on_step_listeners.clear()
+
+    def _on_step_done(self) -> None:
+        """Implementations call this at the end of `do_step`."""
+        for listener in self._on_step_listeners:
+            listener(self)
+
+    @property
+    def state_buffer(self) -> StateBuffer:
+        """The double buffer with the last published state, created with the current state."""
+        if self._state_buffer is None:
+            self._state_buffer = StateBuffer(self._state_arrays())
+        return self._state_buffer
+
+    def publish_state(self) -> None:
+        """Writes the current state into the back buffer and swaps it to the front."""
+        state_buffer = self.state_buffer
+        self._write_state(state_buffer.back)
+        state_buffer.swap()
+
+    def _state_arrays(self) -> dict[str, np.ndarray]:
+        """The named arrays, which `publish_state` hands to readers. Defaults to none."""
+        return {}
+
+    def _write_state(self, state: dict[str, np.ndarray]) -> None:
+        """Copies the current state into the arrays of a buffer."""
+        for name, array in self._state_arrays().items():
+            np.copyto(state[name], array)
+
     @property
     @abstractmethod
     def dim(self) -> Tuple[Tuple[int, int], Tuple[int, int]]:
@@ -26,14 +106,73 @@ class Simulation(ABC):
         """Perform one step of the simulation logic."""
 
 
+class SimulationRunner:
+    """Steps a simulation in a background thread and publishes every step to its state buffer.
+    numpy releases the global interpreter lock in its array loops, so the steps overlap with
+    the rendering of the published states."""
+
+    def __init__(self, simulation: Simulation, steps_per_second: Optional[float] = None):
+        """
+        Args:
+            simulation (Simulation): The simulation, which only this runner steps while running.
+            steps_per_second (Optional[float]): The maximum step rate. Defaults to None,
+                which steps as fast as possible.
+        """
+        self.simulation = simulation
+        self.steps_per_second = steps_per_second
+        self.num_steps = 0
+        self.error = None  # type: Optional[BaseException]
+        self._stop = threading.Event()
+        self._thread = None  # type: Optional[threading.Thread]
+
+    @property
+    def running(self) -> bool:
+        """Whether the stepping thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Starts the stepping thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the stepping thread after the current step and waits for it."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self) -> None:
+        """Raises the error which stopped the stepping thread, if any."""
+        if self.error is not None:
+            raise RuntimeError("The simulation thread failed.") from self.error
+
+    def _run(self) -> None:
+        interval = 0.0 if self.steps_per_second is None else 1 / self.steps_per_second
+        next_step = perf_counter()
+        try:
+            while not self._stop.is_set():
+                self.simulation.do_step()
+                self.simulation.publish_state()
+                self.num_steps += 1
+                next_step += interval
+                self._stop.wait(max(0.0, next_step - perf_counter()))
+        except BaseException as error:  # handed to the main thread by `check`
+            self.error = error
+
+
 class SimulationVisualization(ABC):
     """Abstract base class to visualize a `Simulation` with pygame."""
 
+    threaded = False  # whether a `SimulationRunner` steps the simulation beside the rendering
+
     def __init__(self, title: str):
-        self.simple_pygame = SimplePygame(title)
+        self.simple_pygame = get_simple_pygame(title)
         self.simulation = None
         self.simulation_parameters = None
         self.coord_mapper = None
+        self._runner = None  # type: Optional[SimulationRunner]
 
     @abstractmethod
     def initialize_simulation(self) -> Simulation:
@@ -63,18 +202,34 @@ class SimulationVisualization(ABC):
             return reset, True
         if running:
             self.initialize()
-        while running:
-            running, reset = self.do_simulation_loop()
+        try:
+            while running:
+                running, reset = self.do_simulation_loop()
+        finally:
+            self.stop_runner()
+        if self.simulation is not None and self.simulation.timers.enabled:
+            print(self.simulation.timers.to_table())
         return reset, False
 
     def initialize(self) -> None:
-        """Init the simulation and pygame visualization."""
+        """Init the simulation and pygame visualization. A threaded visualization starts
+        stepping the simulation in the background at the frame rate."""
+        self.stop_runner()
         self.simulation = self.initialize_simulation()
         width, height = get_window_resolution()
         display_dim = ((0, width), (0, height))
         self.coord_mapper = CoordinateMapper2D(*self.simulation.dim, *display_dim)
         self.simple_pygame.all_sprites.empty()
         self.initialize_visualization()
+        if self.threaded:
+            self._runner = SimulationRunner(self.simulation, self.simple_pygame.frames_per_second)
+            self._runner.start()
+
+    def stop_runner(self) -> None:
+        """Stops the background stepping of a threaded visualization."""
+        if self._runner is not None:
+            self._runner.stop()
+            self._runner = None
 
     def do_simulation_loop(self) -> tuple[bool, bool]:
         """Performs one loop of event checking, simulation calculation, and pygame drawing."""
@@ -85,11 +240,31 @@ class SimulationVisualization(ABC):
             elif check_for_reset(event):
                 running = False
                 reset = True
-        self.simulation.do_step()
-        self.update_visualization()
-        self.simple_pygame.loop()
+            elif check_for_profiling(event):
+                self.switch_profiling()
+        timers = self.simulation.timers
+        if self._runner is None:
+            self.simulation.do_step()
+            self.simulation.publish_state()
+        else:
+            self._runner.check()
+        with timers.phase("render"):
+            self.update_visualization()
+            if timers.enabled:
+                self.simple_pygame.hud[:] = timers.hud_lines()
+            self.simple_pygame.draw()
+        self.simple_pygame.tick()
         return running, reset
 
+    def switch_profiling(self) -> None:
+        """Switches the phase timers of the simulation and the head-up display on or off."""
+        timers = self.simulation.timers
+        timers.enabled = not timers.enabled
+        if timers.enabled:
+            timers.reset()
+        else:
+            self.simple_pygame.hud.clear()
+
 
 @dataclass
 class SimulationParameters(ABC):
@@ -87,7 +87,7 @@ class SimulationStartScreen(StartScreen, ABC):
     def create_menu_texts(col_w: int, row_h: int) -> list:
         """Create the raw texts for the start menu. This texts are just drawn, with no logic."""
         menu_texts = [
-            ("Press ESC to quit or SPACE to reset simulation", (5, 5)),
+            ("Press ESC to quit, SPACE to reset or P to profile simulation", (5, 5)),
         ]
         return menu_texts
 
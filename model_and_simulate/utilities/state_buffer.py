@@ -0,0 +1,50 @@
+"""Module with a double buffer to hand simulation states from a stepping thread to a renderer."""
+from __future__ import annotations
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+import numpy as np
+
+
+class StateBuffer:
+    """Two copies of named state arrays. The writer fills the back buffer and publishes it with
+    `swap`, readers see the front buffer within `read`. A swap waits for a running read, so
+    the writer never writes into the arrays a reader holds and a reader never sees a state
+    which is half written."""
+
+    def __init__(self, arrays: dict[str, np.ndarray]):
+        """
+        Args:
+            arrays (dict[str, np.ndarray]): The initial state, which is copied into both buffers.
+        """
+        self._front = {name: np.array(array) for name, array in arrays.items()}
+        self._back = {name: np.array(array) for name, array in arrays.items()}
+        self._lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def back(self) -> dict[str, np.ndarray]:
+        """The arrays to write the next state into. Only the writer may use them."""
+        return self._back
+
+    @property
+    def version(self) -> int:
+        """The number of published states."""
+        return self._version
+
+    def swap(self) -> None:
+        """Publishes the back buffer as the new front buffer."""
+        with self._lock:
+            self._front, self._back = self._back, self._front
+            self._version += 1
+
+    @contextmanager
+    def read(self) -> Iterator[tuple[int, dict[str, np.ndarray]]]:
+        """Holds the front buffer for reading. Keep the block short, because the writer waits
+        for it before the next swap.
+
+        Yields:
+            tuple[int, dict[str, np.ndarray]]: The version and the arrays of the front buffer.
+        """
+        with self._lock:
+            yield self._version, self._front
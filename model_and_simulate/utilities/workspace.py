@@ -0,0 +1,72 @@
+"""Module with reusable scratch arrays for allocation-free simulation steps."""
+import numpy as np
+
+
+class Workspace:
+    """Named scratch arrays for the temporaries of a simulation step.
+    An array is allocated on its first use and again only if a longer one is requested.
+    It then grows with headroom, so lengths which fluctuate from step to step, like the
+    number of pairs, stop allocating after a few steps."""
+
+    growth_factor = 1.25
+
+    def __init__(self) -> None:
+        self._arrays = {}  # type: dict[str, np.ndarray]
+
+    def get(self, name: str, length: int, dtype: np.dtype = np.float64, columns: int = 0):
+        """The first `length` entries of the scratch array `name`.
+        The content is undefined and the array is shared by all users of `name`.
+
+        Args:
+            name (str): The key of the scratch array.
+            length (int): The number of entries or rows.
+            dtype (np.dtype): The type of the entries. Defaults to float64.
+            columns (int): The number of columns of a 2D array. Defaults to 0 for 1D.
+
+        Returns:
+            np.ndarray: A view with shape (`length`,) or (`length`, `columns`).
+        """
+        array = self._arrays.get(name)
+        if array is None or len(array) < length or array.dtype != dtype:
+            shape = (self._capacity(array, length),) + ((columns,) if columns > 0 else ())
+            array = np.empty(shape, dtype=dtype)
+            self._arrays[name] = array
+        return array[:length]
+
+    def arange(self, length: int) -> np.ndarray:
+        """The integers 0 to `length` - 1, which must not be written."""
+        array = self._arrays.get("arange")
+        if array is None or len(array) < length:
+            array = np.arange(self._capacity(array, length))
+            self._arrays["arange"] = array
+        return array[:length]
+
+    def nonzero(self, name: str, mask: np.ndarray) -> np.ndarray:
+        """The indices of the true entries of `mask` like `np.flatnonzero`, but written into
+        the scratch array `name`. The scratch arrays "<name>_count" and "<name>_target"
+        hold the intermediate results."""
+        length = len(mask)
+        count = int(np.count_nonzero(mask))
+        counts = self.get(f"{name}_count", length, np.intp)
+        np.copyto(counts, mask)
+        # the target of every true entry is its rank, false entries target the spare end
+        targets = self.get(f"{name}_target", length, np.intp)
+        np.cumsum(counts, out=targets)
+        np.subtract(targets, 1, out=targets)
+        np.subtract(1, counts, out=counts)
+        np.multiply(counts, length, out=counts)
+        np.maximum(targets, counts, out=targets)
+        indices = self.get(name, length + 1, np.intp)
+        np.put(indices, targets, self.arange(length), mode="clip")
+        return indices[:count]
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes of all scratch arrays."""
+        return sum(array.nbytes for array in self._arrays.values())
+
+    @staticmethod
+    def _capacity(array: np.ndarray, length: int) -> int:
+        if array is None:
+            return length
+        return max(length, int(len(array) * Workspace.growth_factor))